@@ -1,46 +1,25 @@
 import numpy as np
-import pandas as pd
-import tensorflow as tf
 import matplotlib.pyplot as plt
-from sklearn.preprocessing import MinMaxScaler
+import os
+import sys
 
-# ✅ Load trained LSTM model
-model = tf.keras.models.load_model("models/lstm_model.h5", custom_objects={"mse": tf.keras.losses.MeanSquaredError()})
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
 
-# ✅ Load historical stock data
-df = pd.read_csv("data/TSLA_data_with_indicators.csv", index_col="Date", parse_dates=True)
-
-# ✅ Select features and target
-features = ["Close", "SMA_50", "SMA_200", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"]
-target = "Close"
-
-# ✅ Normalize data
-scaler = MinMaxScaler()
-df_scaled = scaler.fit_transform(df[features])
+from models.dataset import backtest_predictions
+from models.registry import ModelRegistry
+from utils.feature_store import load_features
 
-# ✅ Convert data into sequences for LSTM
-def create_sequences(data, seq_length=50):
-    X, y = [], []
-    for i in range(len(data) - seq_length):
-        X.append(data[i:i+seq_length])
-        y.append(data[i+seq_length, 0])  # Predicting 'Close' price
-    return np.array(X), np.array(y)
+# ✅ Load the latest registered model (weights, training scaler and feature list)
+artifact = ModelRegistry().load("lstm_model")
 
-seq_length = 50
-X_test, y_test = create_sequences(df_scaled, seq_length)
-
-# ✅ Make predictions
-y_pred_scaled = model.predict(X_test)
-
-# ✅ Convert predictions back to original scale
-y_pred = scaler.inverse_transform(
-    np.hstack([y_pred_scaled, np.zeros((len(y_pred_scaled), len(features) - 1))])
-)[:, 0]
+# ✅ Load historical stock data
+df = load_features("TSLA")
 
-# ✅ Convert y_test back to original scale
-y_test = scaler.inverse_transform(
-    np.hstack([y_test.reshape(-1, 1), np.zeros((len(y_test), len(features) - 1))])
-)[:, 0]
+# ✅ Predict every bar from the preceding window, scaled with the training scaler
+seq_length = artifact.seq_length
+y_test, y_pred = backtest_predictions(artifact.model.predict_on_batch, artifact.scaler, df, artifact.features, seq_length)
 
 # ✅ Plot actual vs. predicted prices
 plt.figure(figsize=(12, 6))
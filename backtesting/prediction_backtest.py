@@ -0,0 +1,276 @@
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import predict_in_batches, sliding_windows
+from models.registry import ModelRegistry
+from utils.feature_store import read_source
+from utils.config import (
+    BACKTEST_STOP_LOSS, BACKTEST_TAKE_PROFIT, PREDICTION_CACHE_DIR
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes of the per-window key (BLAKE2b digest size)
+WINDOW_KEY_BYTES = 16
+
+
+def window_keys(windows, symbol_ids=None):
+    """
+    Content hash of every scaled input window
+
+    Args:
+        windows (np.ndarray): (n, seq_length, n_features) float32 windows (strided views work)
+        symbol_ids (np.ndarray): (n,) symbol ids for multi-symbol models (part of the key)
+
+    Returns:
+        np.ndarray: (n,) fixed-width bytes keys
+    """
+    keys = np.empty(len(windows), dtype=f"S{WINDOW_KEY_BYTES}")
+    for i, window in enumerate(windows):
+        digest = hashlib.blake2b(np.ascontiguousarray(window, dtype=np.float32).tobytes(),
+                                 digest_size=WINDOW_KEY_BYTES)
+        if symbol_ids is not None:
+            digest.update(int(symbol_ids[i]).to_bytes(4, "little"))
+        keys[i] = digest.digest()
+    return keys
+
+
+class PredictionCache:
+    """
+    On-disk cache of raw model outputs keyed by model version and input window
+
+    One file per model version holds parallel arrays of window hashes and
+    scaled outputs. A window's prediction depends only on the weights and
+    the window content, so a cached value stays valid for any history that
+    contains the same window (extended data, other date ranges, other trade
+    rules); only windows never seen before go through the network.
+    """
+
+    def __init__(self, root=PREDICTION_CACHE_DIR):
+        """
+        Args:
+            root (str): Cache directory (relative paths are resolved from the project root)
+        """
+        self.root = root if os.path.isabs(root) else os.path.join(project_root, root)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, artifact):
+        return os.path.join(self.root, artifact.name, f"{artifact.version}.npz")
+
+    def _load(self, artifact):
+        path = self._path(artifact)
+        if not os.path.exists(path):
+            return {}
+        with np.load(path) as data:
+            return dict(zip(data['keys'].tolist(), data['outputs'].tolist()))
+
+    def _save(self, artifact, entries):
+        path = self._path(artifact)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, keys=np.array(list(entries), dtype=f"S{WINDOW_KEY_BYTES}"),
+                 outputs=np.array(list(entries.values()), dtype=np.float32))
+        os.replace(tmp_path, path)
+
+    def predict(self, artifact, windows, symbol_ids=None, batch_size=1024):
+        """
+        Raw (scaled) model outputs for every window, running the network only on cache misses
+
+        Args:
+            artifact (ModelArtifact): Registered model version
+            windows (np.ndarray): (n, seq_length, n_features) scaled windows
+            symbol_ids (np.ndarray): (n,) symbol ids for multi-symbol models
+            batch_size (int): Windows per forward pass
+
+        Returns:
+            np.ndarray: (n,) float32 outputs
+        """
+        keys = window_keys(windows, symbol_ids)
+        with self._lock:
+            entries = self._load(artifact)
+            outputs = np.array([entries.get(key, np.nan) for key in keys.tolist()], dtype=np.float32)
+            missing = np.flatnonzero(np.isnan(outputs))
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            if len(missing):
+                X = windows[missing]
+                if symbol_ids is not None:
+                    ids = np.asarray(symbol_ids)[missing]
+                    predicted = np.concatenate([
+                        artifact.model.predict_on_batch(X[i:i + batch_size], ids[i:i + batch_size])
+                        for i in range(0, len(X), batch_size)
+                    ])[:, 0]
+                else:
+                    predicted = predict_in_batches(artifact.model.predict_on_batch, X, batch_size)[:, 0]
+                outputs[missing] = predicted
+                entries.update(zip(keys[missing].tolist(), predicted.tolist()))
+                self._save(artifact, entries)
+        return outputs
+
+    def predict_history(self, artifact, df, symbol=None):
+        """
+        Predicted next-bar target price after every bar with a full window behind it
+
+        Args:
+            artifact (ModelArtifact): Registered model version
+            df (pd.DataFrame): History with the model's feature columns
+            symbol (str): Symbol of the data (needed by multi-symbol models)
+
+        Returns:
+            pd.Series: Prediction made at the close of each bar (first seq_length - 1 bars are NaN)
+        """
+        scaler = artifact.scaler_for(symbol)
+        scaled = scaler.transform(df[artifact.features]).astype(np.float32)
+        windows = sliding_windows(scaled, artifact.seq_length)
+        symbol_ids = np.full(len(windows), artifact.symbols.index(symbol)) if artifact.symbols else None
+
+        outputs = self.predict(artifact, windows, symbol_ids)
+        target_column = artifact.features.index(artifact.target)
+        predictions = np.full(len(df), np.nan)
+        predictions[artifact.seq_length - 1:] = scaler.inverse_transform_column(outputs, target_column)
+        return pd.Series(predictions, index=df.index, name="Predicted")
+
+
+def _column(df, name):
+    # Price columns are "Close" in the yfinance data and "close" in the Alpaca data
+    for candidate in (name, name.lower(), name.capitalize()):
+        if candidate in df.columns:
+            return df[candidate].to_numpy(dtype=np.float64)
+    return None
+
+
+def backtest_prediction_strategy(df, predictions, stop_loss=BACKTEST_STOP_LOSS, take_profit=BACKTEST_TAKE_PROFIT,
+                                 min_edge=0.0, initial_capital=10000):
+    """
+    Replay the live_trading.py decision rule over history
+
+    At each bar's close: BUY when the predicted next close is above the
+    current price, SELL when it is below (long only, one position at a time,
+    all capital invested as in AssignmentTradingStrategy.backtest_strategy).
+    An open position is also closed intrabar when the low reaches the
+    stop-loss or the high reaches the take-profit (stop first when both do
+    in the same bar; gaps fill at the open).
+
+    Args:
+        df (pd.DataFrame): History with Close (and ideally Open/High/Low) columns
+        predictions (pd.Series): Next-close prediction made at each bar's close
+        stop_loss (float): Fraction below the entry price, e.g. 0.03 (None = no stop)
+        take_profit (float): Fraction above the entry price, e.g. 0.05 (None = no target)
+        min_edge (float): Minimum relative gap between prediction and price to act on
+        initial_capital (float): Starting capital
+
+    Returns:
+        dict: Backtest results (same keys as AssignmentTradingStrategy.backtest_strategy, plus
+            exit reasons, buy-and-hold return and maximum drawdown)
+    """
+    close = _column(df, "Close")
+    high = _column(df, "High")
+    low = _column(df, "Low")
+    open_ = _column(df, "Open")
+    high = close if high is None else high
+    low = close if low is None else low
+    open_ = close if open_ is None else open_
+    predicted = np.asarray(predictions, dtype=np.float64)
+
+    capital = float(initial_capital)
+    shares = 0.0
+    entry_price = 0.0
+    trades = []
+    values = np.empty(len(df))
+    held = np.zeros(len(df))
+
+    def sell(i, price, reason):
+        nonlocal capital, shares, entry_price
+        value = shares * price
+        trades.append({
+            'Date': df.index[i], 'Action': 'SELL', 'Price': price, 'Shares': shares,
+            'Value': value, 'P&L': value - shares * entry_price, 'Reason': reason,
+        })
+        capital, shares, entry_price = value, 0.0, 0.0
+
+    for i in range(len(df)):
+        # Protective exits happen during the bar, before the close-time decision
+        if shares > 0:
+            stop = entry_price * (1 - stop_loss) if stop_loss is not None else None
+            target = entry_price * (1 + take_profit) if take_profit is not None else None
+            if stop is not None and low[i] <= stop:
+                sell(i, min(open_[i], stop), "stop_loss")
+            elif target is not None and high[i] >= target:
+                sell(i, max(open_[i], target), "take_profit")
+
+        price = close[i]
+        if not np.isnan(predicted[i]):
+            if predicted[i] > price * (1 + min_edge) and shares == 0:
+                shares = capital / price
+                entry_price = price
+                capital = 0.0
+                trades.append({'Date': df.index[i], 'Action': 'BUY', 'Price': price, 'Shares': shares,
+                               'Value': shares * price})
+            elif predicted[i] < price * (1 - min_edge) and shares > 0:
+                sell(i, price, "signal")
+
+        values[i] = capital + shares * price
+        held[i] = shares
+
+    portfolio = pd.DataFrame({'Close': close, 'Predicted': predicted, 'Portfolio_Value': values,
+                              'Shares_Held': held}, index=df.index)
+    closed = [t for t in trades if 'P&L' in t]
+    winning = [t for t in closed if t['P&L'] > 0]
+    final_value = values[-1] if len(values) else initial_capital
+    start = np.flatnonzero(~np.isnan(predicted))
+    start = start[0] if len(start) else 0
+    peak = np.maximum.accumulate(values) if len(values) else values
+
+    return {
+        'initial_capital': initial_capital,
+        'final_value': final_value,
+        'total_return': (final_value - initial_capital) / initial_capital * 100,
+        'total_pnl': sum(t['P&L'] for t in closed),
+        'win_rate': len(winning) / len(closed) * 100 if closed else 0,
+        'total_trades': len(closed),
+        'winning_trades': len(winning),
+        'exits': {reason: sum(t['Reason'] == reason for t in closed) for reason in ("signal", "stop_loss", "take_profit")},
+        'buy_and_hold_return': (close[-1] / close[start] - 1) * 100 if len(close) else 0,
+        'max_drawdown': float(((values - peak) / peak).min() * 100) if len(values) else 0,
+        'trades': trades,
+        'portfolio_data': portfolio,
+    }
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m backtesting.prediction_backtest [model_name] [csv_path]
+    name = sys.argv[1] if len(sys.argv) > 1 else "lstm_model"
+    artifact = ModelRegistry().load(name)
+    csv_path = sys.argv[2] if len(sys.argv) > 2 else artifact.manifest.get('source')
+    df = read_source(csv_path)
+
+    cache = PredictionCache()
+    start = time.perf_counter()
+    predictions = cache.predict_history(artifact, df)
+    print(f"🧠 {artifact.name}@{artifact.version}: {predictions.notna().sum()} predictions in "
+          f"{(time.perf_counter() - start) * 1000:.0f} ms ({cache.hits} cached, {cache.misses} computed)")
+
+    # Trade rules vary freely; the network never runs again for this model version and data
+    print(f"\n📊 Prediction strategy on {csv_path}")
+    for stop_loss, take_profit in ((BACKTEST_STOP_LOSS, BACKTEST_TAKE_PROFIT), (None, None), (0.05, 0.10)):
+        results = backtest_prediction_strategy(df, predictions, stop_loss, take_profit)
+        rule = f"SL {stop_loss:.0%} / TP {take_profit:.0%}" if stop_loss is not None else "signals only"
+        print(f"  {rule:>14}: return {results['total_return']:7.2f}% (buy & hold {results['buy_and_hold_return']:.2f}%), "
+              f"{results['total_trades']} trades, win rate {results['win_rate']:.1f}%, "
+              f"max drawdown {results['max_drawdown']:.1f}%, exits {results['exits']}")
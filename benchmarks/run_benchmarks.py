@@ -0,0 +1,344 @@
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import create_sequences, predict_in_batches
+from models.registry import ModelRegistry
+from strategies.assignment_strategy import AssignmentTradingStrategy
+from utils.feature_store import compute_features, normalize_bars
+from utils.google_sheets import GoogleSheetsLogger
+from utils.standins import FakeSpreadsheet, TelegramStandInServer
+from utils.synthetic_data import SyntheticDataFetcher, generate_universe
+from utils.telegram_alerts import RateLimiter, TelegramAlertDispatcher
+from utils.config import (
+    BENCHMARK_BASELINE_FILE, BENCHMARK_MAX_SECONDS, BENCHMARK_MEMORY_CALLS, BENCHMARK_REGRESSION_TOLERANCE,
+    BENCHMARK_RESULTS_DIR, BENCHMARK_ROUNDS, BENCHMARK_SCALES
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BenchmarkCase:
+    """
+    One hot path prepared on one synthetic universe
+
+    `calls` are zero-argument callables (usually one per symbol) and
+    `units[i]` is the work call i does (bars, windows, rows, alerts), so
+    throughput is comparable across universe sizes.
+    """
+
+    def __init__(self, name, unit, calls, units, close=None, details=None):
+        self.name = name
+        self.unit = unit
+        self.calls = calls
+        self.units = units
+        self.close = close
+        self.details = details
+
+
+def _strategy_cases(universe, period):
+    strategy = AssignmentTradingStrategy()
+    with_indicators = {s: strategy.calculate_indicators(df.copy()) for s, df in universe.items()}
+    with_signals = {s: strategy.generate_signals(df) for s, df in with_indicators.items()}
+    bars = [len(df) for df in universe.values()]
+
+    pipeline = AssignmentTradingStrategy(data_fetcher=SyntheticDataFetcher(universe))
+    symbols = list(universe)
+    return [
+        BenchmarkCase("calculate_indicators", "bars",
+                      [lambda df=df: strategy.calculate_indicators(df.copy()) for df in universe.values()], bars),
+        BenchmarkCase("generate_signals", "bars",
+                      [lambda df=df: strategy.generate_signals(df) for df in with_indicators.values()], bars),
+        BenchmarkCase("backtest_strategy", "bars",
+                      [lambda df=df: strategy.backtest_strategy(df) for df in with_signals.values()], bars),
+        BenchmarkCase("run_strategy_for_symbols", "bars",
+                      [lambda: pipeline.run_strategy_for_symbols(symbols, period)], [sum(bars)]),
+    ], with_signals
+
+
+def _model_cases(universe, artifact):
+    # The registered LSTM's features (SMA_200 included) come from the feature-store definitions
+    scaled = []
+    for df in universe.values():
+        features = compute_features(normalize_bars(df))[artifact.features].dropna()
+        if len(features) > artifact.seq_length:
+            scaled.append(artifact.scaler.transform(features).astype(np.float32))
+    if not scaled:
+        return []
+    artifact.model  # Load the weights outside the timed calls
+    windows = [create_sequences(values, artifact.seq_length)[0] for values in scaled]
+    counts = [len(w) for w in windows]
+    return [
+        BenchmarkCase("create_sequences", "windows",
+                      [lambda values=values: create_sequences(values, artifact.seq_length) for values in scaled], counts),
+        BenchmarkCase(f"predict[{artifact.name}]", "windows",
+                      [lambda X=X: predict_in_batches(artifact.model.predict_on_batch, X) for X in windows], counts),
+    ]
+
+
+def _sink_cases(with_signals):
+    spreadsheet = FakeSpreadsheet()
+    sheets_logger = GoogleSheetsLogger(None, None, spreadsheet=spreadsheet)
+
+    def log_signals(symbol, df):
+        for timestamp, row in zip(df.index, df[['Signal', 'Close', 'Signal_Strength', 'RSI']].itertuples(index=False)):
+            sheets_logger.log_signal(symbol, row.Signal, row.Close, row.Signal_Strength, {'RSI': row.RSI}, timestamp)
+        sheets_logger.flush()
+
+    # Alerts go out for BUY/SELL bars only, one message each (no digest merging, no rate limit)
+    alerts = {s: df.loc[df['Signal'] != 'HOLD', ['Signal', 'Close']] for s, df in with_signals.items()}
+    server = TelegramStandInServer().start()
+    dispatcher = TelegramAlertDispatcher("BENCH_TOKEN", "1", api_url=server.url,
+                                         max_queue_size=max(len(df) for df in alerts.values()) + 1,
+                                         digest_window=0.0, backoff_base=0.01,
+                                         rate_limiters=[RateLimiter(rate=1e6, capacity=1000)])
+
+    def send_alerts(symbol, df):
+        for row in df.itertuples(index=False):
+            dispatcher.send(f"📊 {row.Signal} {symbol} at ₹{row.Close:.2f}")
+        dispatcher.flush()
+
+    def stop_telegram():
+        dispatcher.stop()
+        server.stop()
+
+    rows = [len(df) for df in with_signals.values()]
+    return [
+        BenchmarkCase("sheets_log_signal", "rows",
+                      [lambda s=s, df=df: log_signals(s, df) for s, df in with_signals.items()], rows,
+                      close=sheets_logger.close, details=lambda: {'api_calls': spreadsheet.api_calls}),
+        BenchmarkCase("telegram_send", "alerts",
+                      [lambda s=s, df=df: send_alerts(s, df) for s, df in alerts.items()],
+                      [len(df) for df in alerts.values()],
+                      close=stop_telegram, details=lambda: {'messages': dispatcher.stats['sent_messages']}),
+    ]
+
+
+def run_case(case, rounds=BENCHMARK_ROUNDS, max_seconds=BENCHMARK_MAX_SECONDS, memory_calls=BENCHMARK_MEMORY_CALLS):
+    """
+    Time a case's calls over several rounds (until the time budget runs out), then measure peak memory
+
+    Throughput is taken from the fastest round, the least disturbed by
+    whatever else the machine was doing. Timing runs without tracemalloc;
+    peak memory is the largest traced peak over the first `memory_calls`
+    calls, in a separate pass.
+
+    Returns:
+        dict: calls, rounds, seconds, throughput (units/s), latency p50/p95/max (ms per call), peak_mb
+    """
+    latencies = []
+    round_rates = []
+    start = time.perf_counter()
+    for _ in range(rounds):
+        units = seconds = 0
+        for call, call_units in zip(case.calls, case.units):
+            call_start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - call_start)
+            units += call_units
+            seconds += latencies[-1]
+            if time.perf_counter() - start >= max_seconds:
+                break
+        round_rates.append(units / seconds if seconds > 0 else float('inf'))
+        if time.perf_counter() - start >= max_seconds:
+            break
+
+    peak = 0
+    tracemalloc.start()
+    try:
+        for call in case.calls[:memory_calls]:
+            tracemalloc.reset_peak()
+            call()
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    result = {
+        'unit': case.unit,
+        'calls': len(latencies),
+        'rounds': len(round_rates),
+        'seconds': float(sum(latencies)),
+        'throughput': max(round_rates),
+        'latency_ms_p50': float(np.percentile(latencies_ms, 50)),
+        'latency_ms_p95': float(np.percentile(latencies_ms, 95)),
+        'latency_ms_max': float(latencies_ms.max()),
+        'peak_mb': peak / 1e6,
+    }
+    if case.details is not None:
+        result.update(case.details())
+    return result
+
+
+def run_benchmarks(scales, seed=0, model_name="lstm_model"):
+    """
+    Run every case on every (n_symbols, period) synthetic universe
+
+    Args:
+        scales (list): (n_symbols, period) pairs, e.g. [(1, "6mo"), (500, "10y")]
+        seed (int): Universe seed
+        model_name (str): Registered model for the sequence/prediction cases
+
+    Returns:
+        dict: "<case>@<n_symbols>x<period>" -> metrics (see run_case)
+    """
+    artifact = ModelRegistry().load(model_name)
+    results = {}
+    for n_symbols, period in scales:
+        scale = f"{n_symbols}x{period}"
+        universe = generate_universe(n_symbols, period, seed)
+        strategy_cases, with_signals = _strategy_cases(universe, period)
+        cases = strategy_cases + _model_cases(universe, artifact) + _sink_cases(with_signals)
+        for case in cases:
+            try:
+                metrics = run_case(case)
+            finally:
+                if case.close is not None:
+                    case.close()
+            results[f"{case.name}@{scale}"] = dict(metrics, case=case.name, n_symbols=n_symbols, period=period)
+            print(f"  {case.name:>26} @ {scale:<9} {metrics['throughput']:>14,.0f} {case.unit}/s   "
+                  f"p50 {metrics['latency_ms_p50']:9.2f} ms   p95 {metrics['latency_ms_p95']:9.2f} ms   "
+                  f"peak {metrics['peak_mb']:8.2f} MB")
+    return results
+
+
+def compare_with_baseline(results, baseline, tolerance=BENCHMARK_REGRESSION_TOLERANCE):
+    """
+    Flag benchmarks that got slower or hungrier than the baseline
+
+    A benchmark regresses when its throughput drops by more than `tolerance`
+    or its peak memory grows by more than `tolerance` (and at least 1 MB, so
+    tiny allocations do not flap).
+
+    Returns:
+        list: (key, throughput change, peak memory change, regressed) for keys present in both
+    """
+    rows = []
+    for key, metrics in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        throughput_change = metrics['throughput'] / reference['throughput'] - 1
+        memory_change = metrics['peak_mb'] / reference['peak_mb'] - 1 if reference['peak_mb'] > 0 else 0.0
+        regressed = (throughput_change < -tolerance or
+                     (memory_change > tolerance and metrics['peak_mb'] - reference['peak_mb'] > 1.0))
+        rows.append((key, throughput_change, memory_change, regressed))
+    return rows
+
+
+def _resolve(path):
+    return path if os.path.isabs(path) else os.path.join(project_root, path)
+
+
+def _run_record(results, scale_name):
+    return {
+        'created': datetime.now().isoformat(timespec="seconds"),
+        'scale': scale_name,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'results': results,
+    }
+
+
+def save_results(results, scale_name, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(_run_record(results, scale_name), f, indent=2)
+
+
+def load_baselines(path):
+    """
+    Read the baseline file
+
+    Returns:
+        dict: Scale name ("quick", "full") -> run record with that scale's results
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        data = json.load(f)
+    if 'results' in data:
+        # Single-scale file written before baselines were kept per scale
+        return {data['scale']: data}
+    return data['scales']
+
+
+def save_baseline(results, scale_name, path):
+    """
+    Store `results` as the baseline for `scale_name`, keeping other scales' baselines
+    """
+    baselines = load_baselines(path)
+    baselines[scale_name] = _run_record(results, scale_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({'scales': baselines}, f, indent=2)
+
+
+def baseline_mismatch(baseline):
+    """
+    Why a baseline's timings are not comparable with this machine's
+
+    Returns:
+        str: Description of the differing CPU count / architecture, or None if they match
+    """
+    differences = [
+        f"{name} {baseline.get(name)} vs. {current}"
+        for name, current in (('cpus', os.cpu_count()), ('machine', platform.machine()))
+        if baseline.get(name) != current
+    ]
+    return ", ".join(differences) or None
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m benchmarks.run_benchmarks [quick|full] [save-baseline]
+    scale_name = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in BENCHMARK_SCALES else "quick"
+    # Per-bar and per-signal log lines would swamp the timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"⏱️ Benchmarks ({scale_name}): {BENCHMARK_SCALES[scale_name]}")
+    results = run_benchmarks(BENCHMARK_SCALES[scale_name])
+
+    results_dir = _resolve(BENCHMARK_RESULTS_DIR)
+    results_path = os.path.join(results_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{scale_name}.json")
+    save_results(results, scale_name, results_path)
+    save_results(results, scale_name, os.path.join(results_dir, "latest.json"))
+    print(f"\n💾 Results written to {os.path.relpath(results_path, project_root)}")
+
+    baseline_path = _resolve(BENCHMARK_BASELINE_FILE)
+    baseline = load_baselines(baseline_path).get(scale_name)
+    if "save-baseline" in sys.argv[1:]:
+        save_baseline(results, scale_name, baseline_path)
+        print(f"💾 {scale_name} baseline saved to {os.path.relpath(baseline_path, project_root)}")
+    elif baseline is None:
+        print(f"⚠️ No {scale_name} baseline yet: save one with "
+              f"`python -m benchmarks.run_benchmarks {scale_name} save-baseline`")
+    elif baseline_mismatch(baseline):
+        # Throughput on a different CPU count or architecture says nothing about regressions
+        print(f"\n⚠️ Skipping the comparison: the {scale_name} baseline was recorded on different hardware "
+              f"({baseline_mismatch(baseline)}); save a baseline on this machine first")
+    else:
+        comparison = compare_with_baseline(results, baseline['results'])
+        print(f"\n📊 Compared with the {scale_name} baseline from {baseline['created']} ({baseline['cpus']} CPUs):")
+        for key, throughput_change, memory_change, regressed in comparison:
+            status = "❌ REGRESSION" if regressed else "✅"
+            print(f"  {key:>40}: throughput {throughput_change:+7.1%}, peak memory {memory_change:+7.1%}  {status}")
+        missing = [key for key in results if key not in baseline['results']]
+        if missing:
+            print(f"⚠️ Not in the baseline (not compared): {', '.join(missing)}")
+        if any(row[3] for row in comparison):
+            sys.exit(1)
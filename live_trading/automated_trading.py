@@ -1,9 +1,8 @@
-import schedule
 import time
 import logging
 import sys
 import os
-from datetime import datetime
+from datetime import timedelta
 import pandas as pd
 import numpy as np
 
@@ -14,17 +13,25 @@ sys.path.insert(0, project_root)
 from utils.config import NIFTY_50_STOCKS, RSI_BUY_THRESHOLD, SMA_SHORT, SMA_LONG
 from utils.google_sheets import GoogleSheetsLogger
 from strategies.assignment_strategy import AssignmentTradingStrategy
+from strategies.screener import Screener
+from strategies.sharded_scan import ShardedScanner
+from utils.telegram_alerts import get_default_dispatcher
+from utils.journal import TradeJournal, JournalTailer, SheetsJournalSink, TelegramJournalSink
+from utils.clock import SystemClock
+from utils.compact import signal_label
+from utils.metrics import METRICS, scan_summary_record
+from utils.profiling import PROFILER
+
 # Telegram alert function
-def send_telegram_alert(message):
-    """Send Telegram alert (placeholder - configure in config.py)"""
+def send_telegram_alert(message, dispatcher=None):
+    """Queue a Telegram alert on the background dispatcher (configure in config.py)"""
     try:
-        from utils.config import TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_ID
-        import requests
+        if dispatcher is None:
+            dispatcher = get_default_dispatcher()
         
-        if TELEGRAM_BOT_TOKEN != "YOUR_TELEGRAM_BOT_TOKEN":
-            url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage?chat_id={TELEGRAM_CHAT_ID}&text={message}"
-            requests.get(url)
-            print(f"📱 Telegram alert sent: {message[:50]}...")
+        if dispatcher is not None:
+            dispatcher.send(message)
+            print(f"📱 Telegram alert queued: {message[:50]}...")
         else:
             print(f"📱 Telegram alert (not configured): {message[:50]}...")
     except Exception as e:
@@ -41,6 +48,53 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def summarize_results(results):
+    """
+    Aggregate backtest performance across symbols
+    
+    Args:
+        results (dict): Strategy results for all symbols
+        
+    Returns:
+        tuple: (total_pnl, winning_trades, total_trades, win_rate)
+    """
+    total_pnl = sum([r['backtest']['total_pnl'] for r in results.values()])
+    total_trades = sum([r['backtest']['total_trades'] for r in results.values()])
+    winning_trades = sum([r['backtest']['winning_trades'] for r in results.values()])
+    
+    win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+    return total_pnl, winning_trades, total_trades, win_rate
+
+def format_signal_alert(signal):
+    """
+    Build the Telegram alert text for a signal
+    
+    Args:
+        signal (dict): Signal info (as built by process_results or read back from the journal)
+        
+    Returns:
+        str: Alert message
+    """
+    return f"""
+📊 Trading Signal Alert
+
+Symbol: {signal['symbol']}
+Signal: {signal['signal']}
+Price: ${signal['price']:.2f}
+Confidence: {signal['confidence']:.2f}
+
+Technical Indicators:
+• RSI: {signal['indicators']['RSI']:.2f}
+• SMA 20: ${signal['indicators']['SMA_20']:.2f}
+• SMA 50: ${signal['indicators']['SMA_50']:.2f}
+• MACD: {signal['indicators']['MACD']:.4f}
+
+Backtest Performance:
+• Total Return: {signal['backtest_performance']['total_return']:.2f}%
+• Win Rate: {signal['backtest_performance']['win_rate']:.2f}%
+• Total P&L: ${signal['backtest_performance']['total_pnl']:.2f}
+    """
+
 class AutomatedTradingSystem:
     """
     Automated Trading System for Assignment Requirements
@@ -50,37 +104,106 @@ class AutomatedTradingSystem:
     - Sends Telegram alerts
     """
     
-    def __init__(self, google_sheets_enabled=True, telegram_enabled=True):
+    def __init__(self, google_sheets_enabled=True, telegram_enabled=True, alert_dispatcher=None,
+                 sheets_logger=None, journal=None, journal_enabled=True, symbols=None,
+                 clock=None, data_fetcher=None, metrics_file=None, scan_summary_file=None):
         """
         Initialize the automated trading system
         
         Args:
             google_sheets_enabled (bool): Enable Google Sheets logging
             telegram_enabled (bool): Enable Telegram alerts
+            alert_dispatcher (TelegramAlertDispatcher): Alert dispatcher (defaults to the one in config.py)
+            sheets_logger (GoogleSheetsLogger): Sheets logger (defaults to one built from config.py)
+            journal (TradeJournal): Local journal (defaults to JOURNAL_PATH from config.py)
+            journal_enabled (bool): Record to the journal and feed Sheets/Telegram from it
+            symbols (list): Symbols scanned (defaults to the top 3 NIFTY 50 stocks)
+            clock: Time source with now()/sleep() (defaults to the system clock; see utils.clock)
+            data_fetcher (callable): fetcher(symbol, period) used instead of yfinance
+            metrics_file (str): Prometheus file (defaults to METRICS_FILE from config.py)
+            scan_summary_file (str): Per-scan JSON lines (defaults to SCAN_SUMMARY_FILE from config.py)
         """
+        from utils.config import METRICS_FILE, SCAN_SUMMARY_FILE
         self.google_sheets_enabled = google_sheets_enabled
         self.telegram_enabled = telegram_enabled
+        self.alert_dispatcher = alert_dispatcher
+        if self.telegram_enabled and self.alert_dispatcher is None:
+            self.alert_dispatcher = get_default_dispatcher()
+        # Select top 3 NIFTY 50 stocks for demonstration
+        self.symbols = symbols or NIFTY_50_STOCKS[:3]
+        self.clock = clock or SystemClock()
+        self.metrics_file = metrics_file or METRICS_FILE
+        self.scan_summary_file = scan_summary_file or SCAN_SUMMARY_FILE
+        # Callbacks receiving every scan's summary record
+        self.scan_listeners = []
+        # Cross-sectional ranking of each scan (SCREENER_* in config.py)
+        self.screener = Screener()
+        self.last_screen = {}
+        # Worker pool of the sharded results mode, kept across scans (SHARDED_SCAN_* in config.py)
+        self.scanner = ShardedScanner()
         
         # Initialize components
         self.strategy = AssignmentTradingStrategy(
             rsi_buy_threshold=RSI_BUY_THRESHOLD,
             sma_short=SMA_SHORT,
-            sma_long=SMA_LONG
+            sma_long=SMA_LONG,
+            data_fetcher=data_fetcher
         )
         
         # Initialize Google Sheets logger
-        if self.google_sheets_enabled:
+        self.sheets_logger = sheets_logger
+        if self.google_sheets_enabled and self.sheets_logger is None:
             try:
-                from utils.config import GOOGLE_SHEETS_CREDENTIALS_FILE, SPREADSHEET_ID
+                from utils.config import (GOOGLE_SHEETS_CREDENTIALS_FILE, SPREADSHEET_ID,
+                                          SHEETS_FLUSH_ROWS, SHEETS_FLUSH_INTERVAL_SECONDS)
                 self.sheets_logger = GoogleSheetsLogger(
                     GOOGLE_SHEETS_CREDENTIALS_FILE, 
-                    SPREADSHEET_ID
+                    SPREADSHEET_ID,
+                    flush_rows=SHEETS_FLUSH_ROWS,
+                    flush_interval=SHEETS_FLUSH_INTERVAL_SECONDS
                 )
                 logger.info("✅ Google Sheets integration initialized")
             except Exception as e:
                 logger.error(f"❌ Failed to initialize Google Sheets: {e}")
                 self.google_sheets_enabled = False
         
+        # Initialize the local journal (system of record) and its sinks
+        self.journal = journal
+        self.journal_tailers = []
+        if journal_enabled:
+            from utils.config import JOURNAL_PATH, JOURNAL_COMMIT_INTERVAL_SECONDS, JOURNAL_SINK_POLL_SECONDS
+            if self.journal is None:
+                self.journal = TradeJournal(JOURNAL_PATH, commit_interval=JOURNAL_COMMIT_INTERVAL_SECONDS)
+            
+            if self.google_sheets_enabled and self.sheets_logger is not None:
+                self.journal_tailers.append(JournalTailer(
+                    self.journal, "google_sheets", SheetsJournalSink(self.sheets_logger),
+                    kinds=['signal', 'order', 'fill', 'summary'],
+                    poll_interval=JOURNAL_SINK_POLL_SECONDS
+                ))
+            if self.telegram_enabled and self.alert_dispatcher is not None:
+                self.journal_tailers.append(JournalTailer(
+                    self.journal, "telegram", TelegramJournalSink(self.alert_dispatcher, format_signal_alert),
+                    kinds=['signal'],
+                    poll_interval=JOURNAL_SINK_POLL_SECONDS
+                ))
+            for tailer in self.journal_tailers:
+                tailer.start()
+            logger.info(f"✅ Trade journal initialized with {len(self.journal_tailers)} sink(s)")
+        
+        # Instrumentation (timers, counters, Prometheus export)
+        from utils.config import METRICS_ENABLED, METRICS_HTTP_PORT
+        METRICS.enabled = METRICS_ENABLED
+        if METRICS_ENABLED and METRICS_HTTP_PORT:
+            try:
+                METRICS.start_http_server(METRICS_HTTP_PORT)
+            except OSError as e:
+                logger.error(f"❌ Failed to start metrics endpoint: {e}")
+        
+        # On-demand profiling: SIGUSR1 profiles the next scan(s)
+        if PROFILER.install_signal_handler():
+            logger.info(f"🔬 Send SIGUSR1 to pid {os.getpid()} to profile the next scan")
+        
         # Track performance metrics
         self.total_pnl = 0.0
         self.total_trades = 0
@@ -88,37 +211,91 @@ class AutomatedTradingSystem:
         
         logger.info("🚀 Automated Trading System initialized")
     
+    @PROFILER.profiled("scan")
     def scan_market(self):
         """
-        Scan the market for trading opportunities
+        Scan the market for trading opportunities (profiled when the profiler is armed)
         """
         logger.info("🔍 Starting market scan...")
+        started_at = self.clock.now()
+        scan_start = time.perf_counter()
+        scope = METRICS.scan_scope()
+        summary = {'symbols': 0, 'signals': 0, 'status': 'ok'}
         
         try:
-            # Select top 3 NIFTY 50 stocks for demonstration
-            selected_symbols = NIFTY_50_STOCKS[:3]
+            selected_symbols = self.symbols
             logger.info(f"📊 Scanning {len(selected_symbols)} symbols: {selected_symbols}")
             
             # Run strategy analysis
-            results = self.strategy.run_strategy_for_symbols(selected_symbols, period="6mo")
+            with METRICS.timer("strategy"):
+                results = self.strategy.run_strategy_for_symbols(selected_symbols, period="6mo", scanner=self.scanner)
             
             # Process results and generate signals
-            signals = self.process_results(results)
+            with METRICS.timer("process_results"):
+                signals = self.process_results(results)
+            summary.update(symbols=len(results), signals=len(signals))
             
-            # Log results to Google Sheets
-            if self.google_sheets_enabled:
-                self.log_results_to_sheets(results, signals)
+            # Rank the scanned universe
+            with METRICS.timer("screen"):
+                self.last_screen = self.screener.screen(results)
+            for score, ranked in self.last_screen.items():
+                logger.info(f"🏆 Top {score}: {', '.join(ranked.index[:3])}")
+            METRICS.increment("signals", len(signals))
             
-            # Send alerts
-            if self.telegram_enabled:
-                self.send_alerts(signals)
+            if self.journal is not None:
+                # Journal first; Sheets and Telegram tail the journal asynchronously
+                with METRICS.timer("journal"):
+                    self.record_results(results, signals)
+            else:
+                # Log results to Google Sheets
+                if self.google_sheets_enabled:
+                    with METRICS.timer("sheets"):
+                        self.log_results_to_sheets(results, signals)
+                
+                # Send alerts
+                if self.telegram_enabled:
+                    with METRICS.timer("telegram"):
+                        self.send_alerts(signals)
             
             logger.info("✅ Market scan completed")
             
         except Exception as e:
+            summary.update(status='error', error=str(e))
             logger.error(f"❌ Error during market scan: {e}")
             if self.telegram_enabled:
-                send_telegram_alert(f"❌ Market scan error: {e}")
+                send_telegram_alert(f"❌ Market scan error: {e}", self.alert_dispatcher)
+        finally:
+            duration = time.perf_counter() - scan_start
+            METRICS.end_scan_scope()
+            METRICS.observe("scan", duration)
+            METRICS.increment("scans", status=summary['status'])
+            record = self.export_metrics(scope, started_at, duration, summary)
+            if record is not None:
+                for listener in self.scan_listeners:
+                    listener(record)
+    
+    def export_metrics(self, scope, started_at, duration, summary):
+        """
+        Write the per-scan summary record and refresh the Prometheus metrics file
+        
+        Args:
+            scope (dict): Stage totals for the scan
+            started_at (datetime): Scan start time
+            duration (float): Scan wall time in seconds
+            summary (dict): Scan counts and status
+            
+        Returns:
+            dict: The summary record (None if it could not be built)
+        """
+        try:
+            record = scan_summary_record(scope, started_at, duration, **summary)
+            METRICS.write_scan_summary(self.scan_summary_file, record)
+            METRICS.write_prometheus(self.metrics_file)
+            logger.info(f"⏱️ Scan took {duration:.2f}s - stages: {record['stages']}")
+            return record
+        except Exception as e:
+            logger.error(f"❌ Failed to export metrics: {e}")
+            return None
     
     def process_results(self, results):
         """
@@ -133,14 +310,13 @@ class AutomatedTradingSystem:
         signals = []
         
         for symbol, result in results.items():
-            df = result['data']
             backtest = result['backtest']
             
-            # Get latest data point
-            latest = df.iloc[-1]
+            # Get latest data point (summary-mode results only keep that bar)
+            latest = result['latest'] if 'latest' in result else result['data'].iloc[-1]
             
             # Check for current signals
-            current_signal = latest['Signal']
+            current_signal = signal_label(latest['Signal'])
             current_price = latest['Close']
             current_rsi = latest['RSI']
             current_sma_20 = latest['SMA_20']
@@ -173,9 +349,37 @@ class AutomatedTradingSystem:
         
         return signals
     
+    def record_results(self, results, signals):
+        """
+        Record signals and the P&L summary in the local journal
+        
+        Args:
+            results (dict): Strategy results
+            signals (list): Current signals
+        """
+        for signal in signals:
+            self.journal.record_signal(
+                signal['symbol'],
+                signal['signal'],
+                signal['price'],
+                signal['confidence'],
+                signal['indicators'],
+                signal['backtest_performance']
+            )
+        
+        total_pnl, winning_trades, total_trades, win_rate = summarize_results(results)
+        self.journal.record_summary(total_pnl, winning_trades, total_trades, win_rate)
+        
+        # Make the scan durable, then let the sinks pick it up straight away
+        self.journal.flush(timeout=5)
+        for tailer in self.journal_tailers:
+            tailer.poke()
+        
+        logger.info(f"✅ Results journaled - {len(signals)} signal(s), Total P&L: ${total_pnl:.2f}")
+    
     def log_results_to_sheets(self, results, signals):
         """
-        Log results to Google Sheets
+        Log results to Google Sheets (rows are buffered and flushed in the background)
         
         Args:
             results (dict): Strategy results
@@ -193,25 +397,21 @@ class AutomatedTradingSystem:
                 )
             
             # Calculate overall performance
-            total_pnl = sum([r['backtest']['total_pnl'] for r in results.values()])
-            total_trades = sum([r['backtest']['total_trades'] for r in results.values()])
-            winning_trades = sum([r['backtest']['winning_trades'] for r in results.values()])
-            
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+            total_pnl, winning_trades, total_trades, win_rate = summarize_results(results)
             
             # Update P&L summary
             self.sheets_logger.update_pnl_summary(
                 total_pnl, winning_trades, total_trades, win_rate
             )
             
-            logger.info(f"✅ Results logged to Google Sheets - Total P&L: ${total_pnl:.2f}")
+            logger.info(f"✅ Results queued for Google Sheets - Total P&L: ${total_pnl:.2f}")
             
         except Exception as e:
             logger.error(f"❌ Error logging to Google Sheets: {e}")
     
     def send_alerts(self, signals):
         """
-        Send Telegram alerts for signals
+        Queue Telegram alerts for signals (sent by the background dispatcher)
         
         Args:
             signals (list): List of trading signals
@@ -220,32 +420,27 @@ class AutomatedTradingSystem:
             return
         
         for signal in signals:
-            message = f"""
-📊 Trading Signal Alert
-
-Symbol: {signal['symbol']}
-Signal: {signal['signal']}
-Price: ${signal['price']:.2f}
-Confidence: {signal['confidence']:.2f}
-
-Technical Indicators:
-• RSI: {signal['indicators']['RSI']:.2f}
-• SMA 20: ${signal['indicators']['SMA_20']:.2f}
-• SMA 50: ${signal['indicators']['SMA_50']:.2f}
-• MACD: {signal['indicators']['MACD']:.4f}
-
-Backtest Performance:
-• Total Return: {signal['backtest_performance']['total_return']:.2f}%
-• Win Rate: {signal['backtest_performance']['win_rate']:.2f}%
-• Total P&L: ${signal['backtest_performance']['total_pnl']:.2f}
-            """
+            message = format_signal_alert(signal)
             
             try:
-                send_telegram_alert(message)
-                logger.info(f"✅ Alert sent for {signal['symbol']}")
+                send_telegram_alert(message, self.alert_dispatcher)
+                logger.info(f"✅ Alert queued for {signal['symbol']}")
             except Exception as e:
                 logger.error(f"❌ Failed to send alert: {e}")
     
+    def shutdown(self):
+        """
+        Deliver outstanding journal events to the sinks and close the journal
+        """
+        for tailer in self.journal_tailers:
+            tailer.stop()
+        if self.journal is not None:
+            self.journal.close()
+        if self.sheets_logger is not None:
+            self.sheets_logger.close()
+        self.scanner.close()
+        logger.info("🛑 Automated Trading System shut down")
+    
     def run_scheduled_scan(self):
         """
         Run scheduled market scan
@@ -253,32 +448,45 @@ Backtest Performance:
         logger.info("⏰ Running scheduled market scan...")
         self.scan_market()
     
-    def start_automation(self, scan_interval_minutes=30):
+    def start_automation(self, scan_interval_minutes=30, until=None, poll_seconds=60):
         """
         Start the automated trading system
         
+        Like schedule.every(n).minutes, the first scheduled scan is due n
+        minutes after start-up and each later one n minutes after the
+        previous scan finished. All waiting goes through the clock, so a
+        SimulatedClock replays the schedule without real sleeps.
+        
         Args:
             scan_interval_minutes (int): Minutes between market scans
+            until (datetime): Stop when the clock reaches this time (None runs until interrupted)
+            poll_seconds (float): Longest sleep between schedule checks
         """
         logger.info(f"🚀 Starting automated trading system (scan every {scan_interval_minutes} minutes)")
-        
-        # Schedule market scans
-        schedule.every(scan_interval_minutes).minutes.do(self.run_scheduled_scan)
+        interval = timedelta(minutes=scan_interval_minutes)
+        next_scan = self.clock.now() + interval
         
         # Run initial scan
         self.run_scheduled_scan()
         
         # Keep running
-        while True:
+        while until is None or self.clock.now() < until:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                now = self.clock.now()
+                if now >= next_scan:
+                    self.run_scheduled_scan()
+                    next_scan = self.clock.now() + interval
+                    continue
+                wait = min(poll_seconds, (next_scan - now).total_seconds())
+                if until is not None:
+                    wait = min(wait, (until - now).total_seconds())
+                self.clock.sleep(wait)
             except KeyboardInterrupt:
                 logger.info("🛑 Automated trading system stopped by user")
                 break
             except Exception as e:
                 logger.error(f"❌ Error in automation loop: {e}")
-                time.sleep(60)  # Wait before retrying
+                self.clock.sleep(poll_seconds)  # Wait before retrying
 
 def main():
     """
@@ -300,6 +508,8 @@ def main():
         print("\n🛑 System stopped by user")
     except Exception as e:
         print(f"❌ System error: {e}")
+    finally:
+        trading_system.shutdown()
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,7 @@
-import numpy as np
 import pandas as pd
-import tensorflow as tf
 import alpaca_trade_api as tradeapi
-from sklearn.preprocessing import MinMaxScaler
-import ta  # Ensure you installed this with `pip install ta`
 import sys
 import os
-import requests
 from datetime import datetime
 
 # ✅ Get the absolute path of the project root
@@ -15,12 +10,14 @@ sys.path.insert(0, project_root)
 
 # ✅ Import API keys from config
 from utils.config import ALPACA_API_KEY, ALPACA_SECRET_KEY, BASE_URL
+from utils.telegram_alerts import get_default_dispatcher
+from models.registry import ModelRegistry
+from utils.config import JOURNAL_PATH, ORDER_FILL_TIMEOUT_SECONDS
+from utils.journal import TradeJournal, record_broker_fill
+from utils.feature_store import FeatureStore, load_features
 
-# ✅ Load the trained LSTM model
-model = tf.keras.models.load_model(
-    "C:/Users/91882/Desktop/College Projects/Ai driven Algorithm trading projext and paper/project/models/lstm_trained_model.h5",
-    custom_objects={"mse": tf.keras.losses.MeanSquaredError()}
-)
+# ✅ Load the latest registered model (weights, training scaler and feature list)
+artifact = ModelRegistry().load("lstm_trained_model")
 
 # ✅ Initialize Alpaca API
 api = tradeapi.REST(ALPACA_API_KEY, ALPACA_SECRET_KEY, base_url=BASE_URL)
@@ -33,54 +30,41 @@ if not clock.is_open:
 
 # ✅ Define stock symbol and sequence length
 symbol = "TSLA"
-seq_length = 50  # Last 50 days of data needed for prediction
+seq_length = artifact.seq_length  # Last 50 days of features needed for prediction
 
-# ✅ Fetch the last 50 days of stock data from Alpaca
-bars = api.get_bars(symbol, "1Day", limit=seq_length, feed="iex").df
+# ✅ Bring the feature store up to date with the daily bars Alpaca has since the last stored one
+# (Alpaca IEX bars have their own series, seeded from data/tsla_90_days.csv like the model's training data)
+store = FeatureStore()
+store_key = f"{symbol}_IEX"
+load_features(store_key, store=store)
+last_stored = store.last_timestamp(store_key)
+bars = api.get_bars(symbol, "1Day", start=(last_stored + pd.Timedelta(days=1)).strftime("%Y-%m-%d"), feed="iex").df
 
-# ✅ Check if DataFrame is empty BEFORE processing
-if bars.empty:
-    print("❌ ERROR: No stock data returned from Alpaca. API may not be providing recent data.")
-    exit()
+# ✅ Only completed sessions go into the store (today's bar is still forming)
+today = pd.Timestamp(clock.timestamp).tz_convert("America/New_York").date()
+if not bars.empty:
+    bars = bars[pd.to_datetime(bars.index, utc=True).tz_convert("America/New_York").date < today]
 
 # ✅ Print first 5 rows of data for debugging
-print("📊 Sample Data from Alpaca API:\n", bars.head())
+print("📊 New Data from Alpaca API:\n", bars.head())
 
-# ✅ Verify required columns exist before processing
-required_columns = ["close", "volume"]
-if not all(col in bars.columns for col in required_columns):
-    print(f"❌ ERROR: Missing required columns. Available columns: {list(bars.columns)}")
-    exit()
+# ✅ Indicators are computed only for the new bars (with enough stored history for exact values)
+if not bars.empty:
+    store.append(store_key, bars)
 
-# ✅ Compute technical indicators manually (Handle NaN values)
-bars["SMA_50"] = ta.trend.sma_indicator(bars["close"], window=50).fillna(0)
-bars["RSI"] = ta.momentum.rsi(bars["close"], window=14).fillna(0)
-bars["MACD"] = ta.trend.macd(bars["close"]).fillna(0)
-bars["MACD_Signal"] = ta.trend.macd_signal(bars["close"]).fillna(0)
-bars["OBV"] = ta.volume.on_balance_volume(bars["close"], bars["volume"]).fillna(0)
+# ✅ Read the model's features from the store (warm-up rows dropped)
+features = store.read(store_key, artifact.features, dropna=True)
 
 # ✅ Print DataFrame with Indicators for Debugging
-print("📊 Data with Indicators:\n", bars.tail())
-
-# ✅ Select relevant features
-features = ["close", "SMA_50", "RSI", "MACD", "MACD_Signal", "OBV"]
+print("📊 Data with Indicators:\n", features.tail())
 
-# ✅ Normalize data
-scaler = MinMaxScaler()
-if bars.shape[0] > 0:  # ✅ Ensure DataFrame has rows before scaling
-    bars_scaled = scaler.fit_transform(bars[features])
-else:
-    print("⚠️ ERROR: No valid stock data to process. Exiting.")
+# ✅ Ensure there is enough data for one input window
+if features.shape[0] < seq_length:
+    print(f"⚠️ ERROR: Need {seq_length} bars for prediction, got {features.shape[0]}. Exiting.")
     exit()
 
-# ✅ Prepare input sequence for prediction
-X_input = np.array([bars_scaled[-seq_length:]])  # Use last 50 days
-
-# ✅ Predict next day's closing price
-predicted_price = model.predict(X_input)
-predicted_price = scaler.inverse_transform(
-    np.hstack([predicted_price, np.zeros((1, len(features) - 1))])
-)[0][0]
+# ✅ Predict next day's closing price (features and scaling come from the registered model)
+predicted_price = artifact.predict_prices({symbol: features})[symbol]
 
 # ✅ Get current market price
 current_price = float(api.get_latest_quote(symbol).ask_price)
@@ -93,12 +77,16 @@ take_profit_percentage = 0.05  # 5% above buy price
 print(f"📈 Predicted Next Closing Price: ${predicted_price:.2f}")
 print(f"💹 Current TSLA Price: ${current_price:.2f}")
 
-# ✅ Function to send Telegram Alert
+# ✅ Function to send Telegram Alert (queued; flushed automatically before exit)
 def send_telegram_alert(message):
-    TELEGRAM_BOT_TOKEN = "YOUR_TELEGRAM_BOT_TOKEN"  # Replace with your Bot Token
-    TELEGRAM_CHAT_ID = "YOUR_TELEGRAM_CHAT_ID"  # Replace with your Chat ID
-    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage?chat_id={TELEGRAM_CHAT_ID}&text={message}"
-    requests.get(url)
+    dispatcher = get_default_dispatcher()
+    if dispatcher is not None:
+        dispatcher.send(message)
+    else:
+        print(f"📱 Telegram alert (not configured): {message[:50]}...")
+
+# ✅ Open the trade journal (system of record for orders)
+journal = TradeJournal(JOURNAL_PATH)
 
 # ✅ Define trade decision logic
 if predicted_price > current_price:
@@ -108,7 +96,7 @@ if predicted_price > current_price:
     stop_loss = buy_price * (1 - stop_loss_percentage)
     take_profit = buy_price * (1 + take_profit_percentage)
 
-    api.submit_order(
+    order = api.submit_order(
         symbol=symbol,
         qty=1,  # Number of shares
         side="buy",
@@ -117,9 +105,12 @@ if predicted_price > current_price:
     )
     print(f"✅ Order placed! Stop-Loss: ${stop_loss:.2f}, Take-Profit: ${take_profit:.2f}")
 
-    # ✅ Log the trade
-    with open("trade_log.txt", "a") as log:
-        log.write(f"{datetime.now()} - BUY at ${buy_price:.2f}, Stop-Loss: ${stop_loss:.2f}, Take-Profit: ${take_profit:.2f}\n")
+    # ✅ Log the trade to the journal
+    journal.record_order(symbol, "buy", 1, buy_price, stop_loss=stop_loss, take_profit=take_profit,
+                         order_id=getattr(order, "id", None), status=getattr(order, "status", None))
+
+    # ✅ Log the fill once Alpaca reports it
+    record_broker_fill(journal, api, order, timeout=ORDER_FILL_TIMEOUT_SECONDS)
 
     # ✅ Send Telegram Alert
     send_telegram_alert(f"📢 AI Trading Alert: TSLA BUY at ${buy_price:.2f}\nStop-Loss: ${stop_loss:.2f}\nTake-Profit: ${take_profit:.2f}")
@@ -129,7 +120,7 @@ elif predicted_price < current_price:
 
     sell_price = current_price
 
-    api.submit_order(
+    order = api.submit_order(
         symbol=symbol,
         qty=1,
         side="sell",
@@ -138,12 +129,18 @@ elif predicted_price < current_price:
     )
     print("✅ Order placed successfully!")
 
-    # ✅ Log the trade
-    with open("trade_log.txt", "a") as log:
-        log.write(f"{datetime.now()} - SELL at ${sell_price:.2f}\n")
+    # ✅ Log the trade to the journal
+    journal.record_order(symbol, "sell", 1, sell_price,
+                         order_id=getattr(order, "id", None), status=getattr(order, "status", None))
+
+    # ✅ Log the fill once Alpaca reports it
+    record_broker_fill(journal, api, order, timeout=ORDER_FILL_TIMEOUT_SECONDS)
 
     # ✅ Send Telegram Alert
     send_telegram_alert(f"📢 AI Trading Alert: TSLA SELL at ${sell_price:.2f}")
 
 else:
     print("⏳ AI suggests **HOLD** strategy. No trade executed.")
+
+# ✅ Make sure the journal is committed before exiting
+journal.close()
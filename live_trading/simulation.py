@@ -0,0 +1,246 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from utils.config import (NIFTY_50_STOCKS, SIMULATION_BAR_FREQ, SIMULATION_HISTORY_PERIOD,
+                          SIMULATION_OUTPUT_DIR, SIMULATION_POLL_SECONDS, SIMULATION_SCAN_INTERVAL_MINUTES,
+                          SYNTHETIC_SESSION)
+from utils.clock import SimulatedClock
+from utils.google_sheets import GoogleSheetsLogger
+from utils.journal import TradeJournal
+from utils.standins import FakeSpreadsheet, TelegramStandInServer
+from utils.synthetic_data import freq_minutes, generate_universe, period_to_bars, synthetic_symbols
+from utils.telegram_alerts import RateLimiter, TelegramAlertDispatcher
+from live_trading.automated_trading import AutomatedTradingSystem
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class ReplayDataFetcher:
+    """
+    Serves stored intraday bars as the daily history a live fetch would see at the clock's time
+
+    Sessions before today come back as complete daily bars; today's bar is
+    built from the intraday bars that have closed by clock.now(), so each
+    scan only sees data that existed at its (simulated) start time.
+    """
+
+    def __init__(self, universe, clock, freq=SIMULATION_BAR_FREQ):
+        """
+        Args:
+            universe (dict): Symbol -> intraday OHLCV DataFrame (tz-aware index of bar start times)
+            clock: Time source whose now() returns naive exchange-local time
+            freq (str): Bar size of the stored bars
+        """
+        self.clock = clock
+        self._symbols = {symbol: self._prepare(df, freq) for symbol, df in universe.items()}
+
+    @staticmethod
+    def _prepare(df, freq):
+        index = df.index
+        bar_ends = (index.tz_localize(None) + pd.Timedelta(minutes=freq_minutes(freq))).to_numpy()
+        session = index.normalize()
+        groups = df.groupby(session)
+        # Running session aggregates: row i is the daily bar as of bar i's close
+        running = pd.DataFrame({
+            'Open': groups['Open'].transform('first'),
+            'High': groups['High'].cummax(),
+            'Low': groups['Low'].cummin(),
+            'Close': df['Close'],
+            'Volume': groups['Volume'].cumsum(),
+        })
+        days = session.unique()
+        return {
+            'bar_ends': bar_ends,
+            'bar_session': days.get_indexer(session),
+            'running': {column: running[column].to_numpy() for column in running.columns},
+            'daily': {column: running[column].groupby(session).last().to_numpy() for column in running.columns},
+            'days': days,
+        }
+
+    def __call__(self, symbol, period):
+        data = self._symbols[symbol]
+        now = np.datetime64(self.clock.now())
+        closed = int(np.searchsorted(data['bar_ends'], now, side='right'))
+        if closed == 0:
+            raise ValueError(f"No bars for {symbol} before {now}")
+        bar = closed - 1
+        session = data['bar_session'][bar]
+        start = max(0, session + 1 - period_to_bars(period))
+        columns = {}
+        for column, values in data['daily'].items():
+            values = values[start:session + 1].copy()
+            values[-1] = data['running'][column][bar]
+            columns[column] = values
+        df = pd.DataFrame(columns, index=data['days'][start:session + 1])
+        df['Dividends'] = 0.0
+        df['Stock Splits'] = 0.0
+        df.index.name = "Date"
+        return df
+
+
+def _percentile(values, q):
+    return float(np.percentile(values, q)) if len(values) else 0.0
+
+
+def timing_report(records, sessions, interval_minutes, session_hours=SYNTHETIC_SESSION):
+    """
+    Summarize replayed scans: schedule adherence, overlaps and latency
+
+    Args:
+        records (list): Scan summary records in order (see utils.metrics.scan_summary_record)
+        sessions (list): Replayed session dates
+        interval_minutes (int): Scan interval
+        session_hours (tuple): Local session open/close ("HH:MM")
+
+    Returns:
+        dict: Report (scans, expected/missed scans, overlaps, schedule lag, latency percentiles, stage totals)
+    """
+    interval = interval_minutes * 60
+    session_minutes = (pd.Timedelta(f"{session_hours[1]}:00") - pd.Timedelta(f"{session_hours[0]}:00")).seconds / 60
+    # Scans due from the open until the close if scans took no time
+    expected = len(sessions) * int(np.ceil(session_minutes / interval_minutes))
+    durations = np.array([record['duration_seconds'] for record in records])
+    starts = [pd.Timestamp(record['timestamp']) for record in records]
+    # Lag: how late each scan started after it became due (previous scan end + interval)
+    lags = [
+        (start - (previous + pd.Timedelta(seconds=duration + interval))).total_seconds()
+        for previous, duration, start in zip(starts, durations, starts[1:])
+        if start.normalize() == previous.normalize()
+    ]
+    stages = {}
+    for record in records:
+        for stage, seconds in record['stages'].items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    return {
+        'sessions': len(sessions),
+        'interval_minutes': interval_minutes,
+        'scans': len(records),
+        'expected_scans': expected,
+        'missed_scans': max(0, expected - len(records)),
+        'errors': sum(record.get('status') != 'ok' for record in records),
+        'overlaps': int((durations > interval).sum()),
+        'schedule_lag_seconds_max': max(lags, default=0.0),
+        'scan_seconds_p50': _percentile(durations, 50),
+        'scan_seconds_p95': _percentile(durations, 95),
+        'scan_seconds_max': float(durations.max()) if len(durations) else 0.0,
+        'scan_seconds_total': float(durations.sum()),
+        'stage_seconds': stages,
+        'symbols_scanned': sum(record.get('symbols', 0) for record in records),
+        'signals': sum(record.get('signals', 0) for record in records),
+    }
+
+
+def run_simulation(days=1, n_symbols=3, interval_minutes=SIMULATION_SCAN_INTERVAL_MINUTES, seed=0,
+                   output_dir=SIMULATION_OUTPUT_DIR, freq=SIMULATION_BAR_FREQ, poll_seconds=SIMULATION_POLL_SECONDS):
+    """
+    Replay trading sessions through AutomatedTradingSystem on a simulated clock
+
+    Synthetic intraday bars are served as they would have looked at each
+    scan's simulated time. The scan, signal, journal, Sheets and Telegram
+    paths are the production ones; Sheets and Telegram talk to in-process
+    stand-ins. Idle time between scans costs nothing, scan time is real.
+
+    Args:
+        days (int): Sessions replayed (the last `days` sessions of the synthetic history)
+        n_symbols (int): Symbols scanned (named after NIFTY 50 stocks while there are enough)
+        interval_minutes (int): Scan interval
+        seed (int): Synthetic universe seed
+        output_dir (str): Directory for report.json and the metrics files
+        freq (str): Intraday bar size replayed
+        poll_seconds (float): Longest simulated sleep of the automation loop
+
+    Returns:
+        dict: Timing report plus wall time, simulated time, speedup and sink counts
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    history = period_to_bars(SIMULATION_HISTORY_PERIOD)
+    generated = generate_universe(n_symbols, f"{days + history}d", seed, freq)
+    names = NIFTY_50_STOCKS[:n_symbols] if n_symbols <= len(NIFTY_50_STOCKS) else synthetic_symbols(n_symbols)
+    universe = dict(zip(names, generated.values()))
+    sessions = list(next(iter(universe.values())).index.normalize().unique().tz_localize(None)[-days:])
+
+    opening, closing = (pd.Timedelta(f"{t}:00") for t in SYNTHETIC_SESSION)
+    clock = SimulatedClock(sessions[0] + opening)
+    spreadsheet = FakeSpreadsheet()
+    server = TelegramStandInServer().start()
+    # No digest window or rate limit: they pace in wall time, which the replay compresses
+    dispatcher = TelegramAlertDispatcher("SIMULATION_TOKEN", "1", api_url=server.url, digest_window=0.0,
+                                         backoff_base=0.01, rate_limiters=[RateLimiter(rate=1e6, capacity=1000)])
+    records = []
+    with tempfile.TemporaryDirectory() as journal_dir:
+        system = AutomatedTradingSystem(
+            alert_dispatcher=dispatcher,
+            sheets_logger=GoogleSheetsLogger(None, None, spreadsheet=spreadsheet),
+            journal=TradeJournal(os.path.join(journal_dir, "journal.db")),
+            symbols=names,
+            clock=clock,
+            data_fetcher=ReplayDataFetcher(universe, clock, freq),
+            metrics_file=os.path.join(output_dir, "trading.prom"),
+            scan_summary_file=os.path.join(output_dir, "scan_summaries.jsonl"),
+        )
+        system.scan_listeners.append(records.append)
+        wall_start = time.perf_counter()
+        try:
+            for session in sessions:
+                clock.set(session + opening)
+                system.start_automation(interval_minutes, until=session + closing, poll_seconds=poll_seconds)
+            wall_seconds = time.perf_counter() - wall_start
+        finally:
+            system.shutdown()
+            dispatcher.stop()
+            server.stop()
+
+    report = timing_report(records, sessions, interval_minutes)
+    simulated_seconds = len(sessions) * (closing - opening).total_seconds()
+    report.update(
+        symbols=n_symbols,
+        freq=freq,
+        first_session=str(sessions[0].date()),
+        last_session=str(sessions[-1].date()),
+        wall_seconds=wall_seconds,
+        simulated_seconds=simulated_seconds,
+        speedup=simulated_seconds / wall_seconds,
+        symbols_per_second=report['symbols_scanned'] / report['scan_seconds_total'] if records else 0.0,
+        sheets_api_calls=spreadsheet.api_calls,
+        sheets_rows=sum(len(worksheet.values) for worksheet in spreadsheet.worksheets.values()),
+        telegram_messages=len(server.messages),
+    )
+    with open(os.path.join(output_dir, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m live_trading.simulation [days] [symbols] [interval_minutes]
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    n_symbols = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    interval = int(sys.argv[3]) if len(sys.argv) > 3 else SIMULATION_SCAN_INTERVAL_MINUTES
+    # Per-scan INFO logs would dominate a replay; keep warnings and errors
+    logging.getLogger().setLevel(logging.WARNING)
+
+    print(f"⏩ Replaying {days} session(s) of {n_symbols} symbol(s), scanning every {interval} minutes")
+    report = run_simulation(days, n_symbols, interval)
+    print(f"📅 {report['first_session']} .. {report['last_session']}: {report['scans']}/{report['expected_scans']} scans, "
+          f"{report['signals']} signals, {report['errors']} errors")
+    print(f"⏱️ Scan latency p50 {report['scan_seconds_p50'] * 1000:.0f} ms, p95 {report['scan_seconds_p95'] * 1000:.0f} ms, "
+          f"max {report['scan_seconds_max'] * 1000:.0f} ms; schedule lag max {report['schedule_lag_seconds_max']:.2f} s")
+    print(f"📊 Stages: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in report['stage_seconds'].items()))
+    print(f"🚀 {report['simulated_seconds'] / 3600:.1f} h simulated in {report['wall_seconds']:.1f} s "
+          f"({report['speedup']:,.0f}x), {report['symbols_per_second']:,.0f} symbols/s")
+    print(f"📤 Sheets: {report['sheets_api_calls']} API calls, {report['sheets_rows']} rows; "
+          f"Telegram: {report['telegram_messages']} messages")
+    print(f"📁 Report: {os.path.join(SIMULATION_OUTPUT_DIR, 'report.json')}")
+    if report['overlaps'] or report['missed_scans'] or report['errors']:
+        print(f"❌ {report['overlaps']} overlapping scan(s), {report['missed_scans']} missed, {report['errors']} failed")
+        sys.exit(1)
@@ -1,8 +1,4 @@
-import numpy as np
-import pandas as pd
-import tensorflow as tf
 import alpaca_trade_api as tradeapi
-from sklearn.preprocessing import MinMaxScaler
 
 import sys
 import os
@@ -15,29 +11,21 @@ sys.path.insert(0, project_root)
 
 # Now import the config file
 from utils.config import ALPACA_API_KEY, ALPACA_SECRET_KEY, BASE_URL
+from utils.config import JOURNAL_PATH, ORDER_FILL_TIMEOUT_SECONDS
+from models.registry import ModelRegistry
+from utils.feature_store import load_features
+from utils.journal import TradeJournal, record_broker_fill
 
 
 
-# ✅ Load trained LSTM model
-model = tf.keras.models.load_model("models/lstm_model.h5", custom_objects={"mse": tf.keras.losses.MeanSquaredError()})
+# ✅ Load the latest registered model (weights, training scaler and feature list)
+artifact = ModelRegistry().load("lstm_model")
 
 # ✅ Load stock data
-df = pd.read_csv("data/TSLA_data_with_indicators.csv", index_col="Date", parse_dates=True)
+df = load_features("TSLA")
 
-# ✅ Feature selection
-features = ["Close", "SMA_50", "SMA_200", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"]
-scaler = MinMaxScaler()
-df_scaled = scaler.fit_transform(df[features])
-
-# ✅ Prepare last sequence for prediction
-seq_length = 50
-X_input = np.array([df_scaled[-seq_length:]])  # Last 50 days data
-
-# ✅ Predict next day's stock price
-predicted_price = model.predict(X_input)
-predicted_price = scaler.inverse_transform(
-    np.hstack([predicted_price, np.zeros((1, len(features) - 1))])
-)[0][0]
+# ✅ Predict next day's stock price (last 50 days, scaled as in training)
+predicted_price = artifact.predict_prices({"TSLA": df})["TSLA"]
 
 print(f"📈 Predicted Next Closing Price: ${predicted_price:.2f}")
 
@@ -49,10 +37,13 @@ symbol = "TSLA"
 current_price = float(api.get_latest_quote(symbol).ask_price)
 print(f"💹 Current TSLA Price: ${current_price:.2f}")
 
+# ✅ Open the trade journal (system of record for orders and fills)
+journal = TradeJournal(JOURNAL_PATH)
+
 # ✅ Define trade strategy
 if predicted_price > current_price:
     print("📊 AI suggests **BUY** signal! Placing order...")
-    api.submit_order(
+    order = api.submit_order(
         symbol=symbol,
         qty=1,  # Number of shares
         side="buy",
@@ -60,9 +51,11 @@ if predicted_price > current_price:
         time_in_force="gtc"
     )
     print("✅ Order placed successfully!")
+    journal.record_order(symbol, "buy", 1, current_price, order_id=order.id, status=order.status)
+    record_broker_fill(journal, api, order, timeout=ORDER_FILL_TIMEOUT_SECONDS)
 elif predicted_price < current_price:
     print("📊 AI suggests **SELL** signal! Placing order...")
-    api.submit_order(
+    order = api.submit_order(
         symbol=symbol,
         qty=1,
         side="sell",
@@ -70,5 +63,10 @@ elif predicted_price < current_price:
         time_in_force="gtc"
     )
     print("✅ Order placed successfully!")
+    journal.record_order(symbol, "sell", 1, current_price, order_id=order.id, status=order.status)
+    record_broker_fill(journal, api, order, timeout=ORDER_FILL_TIMEOUT_SECONDS)
 else:
     print("⏳ AI suggests **HOLD** strategy. No trade executed.")
+
+# ✅ Make sure the journal is committed before exiting
+journal.close()
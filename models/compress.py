@@ -0,0 +1,264 @@
+import json
+import logging
+import os
+import shutil
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import backtest_predictions, create_sequences
+from models.numpy_lstm import (
+    SCALE_SUFFIX, NumpyLSTMModel, load_weights_dir, measure_latency, save_weights_dir
+)
+from models.registry import WEIGHTS_DIR, ModelRegistry
+from utils.feature_store import read_source
+from utils.config import COMPRESSION_MSE_TOLERANCE, COMPRESSION_PRUNE_FRACTIONS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+COMPRESSION_OUTPUT_DIR = os.path.join(project_root, "models", "compressed")
+
+
+def quantize_layers(layers, keys=('kernel', 'recurrent_kernel')):
+    """
+    Symmetric per-output-column int8 quantization of the weight matrices
+
+    Each column gets its own scale (max |w| / 127), so a gate or unit with
+    small weights keeps its resolution. Biases stay float32.
+
+    Args:
+        layers (list): Layer dicts (see models.numpy_lstm)
+        keys (tuple): Matrices to quantize
+
+    Returns:
+        list: New layer dicts with int8 matrices and float32 `<key>_scale` arrays
+    """
+    quantized = []
+    for layer in layers:
+        layer = dict(layer)
+        for key in keys:
+            if key not in layer:
+                continue
+            weights = np.asarray(layer[key], dtype=np.float32)
+            scale = np.abs(weights).max(axis=0) / 127.0
+            scale[scale == 0] = 1.0
+            layer[key] = np.clip(np.round(weights / scale), -127, 127).astype(np.int8)
+            layer[f"{key}{SCALE_SUFFIX}"] = scale.astype(np.float32)
+        quantized.append(layer)
+    return quantized
+
+
+def _gate_columns(units, keep):
+    # LSTM matrices hold the i, f, c, o gates side by side
+    return np.concatenate([keep + gate * units for gate in range(4)])
+
+
+def _layer_activations(input_shape, layers, X):
+    # Output of every layer on the calibration windows, each as (n, units)
+    model = NumpyLSTMModel(input_shape, layers)
+    activations = []
+    x = np.asarray(X, dtype=np.float32)
+    for layer in model.layers:
+        if layer['type'] == 'lstm':
+            x, _ = model._lstm(layer, x)
+        else:
+            x = layer['activation_fn'](x @ layer['kernel'] + layer['bias'])
+        activations.append(x.reshape(-1, x.shape[-1]))
+    return activations
+
+
+def prune_layers(layers, fraction, input_shape=None, calibration=None):
+    """
+    Structured pruning: drop the least important units of every hidden layer
+
+    Whole units are removed (not individual weights), so the matrices shrink
+    and the forward pass gets cheaper. A unit's importance is the L2 norm of
+    its outgoing weights (next layer's kernel row, plus the recurrent kernel
+    row for LSTM units). With calibration windows the norm is weighted by the
+    unit's mean |activation|, and the mean contribution of every removed unit
+    is folded into the biases it fed. The output layer is never pruned.
+
+    Args:
+        layers (list): Float32 layer dicts (see models.numpy_lstm)
+        fraction (float): Share of units removed per hidden layer
+        input_shape (tuple): (seq_length, n_features), needed with `calibration`
+        calibration (np.ndarray): Representative scaled windows (n, seq_length, n_features)
+
+    Returns:
+        list: New, smaller layer dicts
+    """
+    activations = _layer_activations(input_shape, layers, calibration) if calibration is not None else None
+    layers = [{k: np.array(v) if isinstance(v, np.ndarray) else v for k, v in layer.items()} for layer in layers]
+    for index, (layer, next_layer) in enumerate(zip(layers[:-1], layers[1:])):
+        units = layer['units']
+        n_keep = max(1, int(round(units * (1 - fraction))))
+        if n_keep >= units:
+            continue
+
+        importance = np.linalg.norm(next_layer['kernel'], axis=1) ** 2
+        if layer['type'] == 'lstm':
+            importance += np.linalg.norm(layer['recurrent_kernel'], axis=1) ** 2
+        importance = np.sqrt(importance)
+        if activations is not None:
+            importance *= np.abs(activations[index]).mean(axis=0)
+        keep = np.sort(np.argsort(importance)[-n_keep:])
+        dropped = np.setdiff1d(np.arange(units), keep)
+
+        if activations is not None:
+            mean = activations[index].mean(axis=0)[dropped]
+            next_layer['bias'] = next_layer['bias'] + mean @ next_layer['kernel'][dropped]
+            if layer['type'] == 'lstm':
+                layer['bias'] = layer['bias'] + mean @ layer['recurrent_kernel'][dropped]
+
+        if layer['type'] == 'lstm':
+            columns = _gate_columns(units, keep)
+            layer['kernel'] = layer['kernel'][:, columns]
+            layer['recurrent_kernel'] = layer['recurrent_kernel'][keep][:, columns]
+            layer['bias'] = layer['bias'][columns]
+            if 'symbol_bias' in layer:
+                layer['symbol_bias'] = layer['symbol_bias'][:, columns]
+        else:
+            layer['kernel'] = layer['kernel'][:, keep]
+            layer['bias'] = layer['bias'][keep]
+        layer['units'] = n_keep
+        next_layer['kernel'] = next_layer['kernel'][keep]
+    return layers
+
+
+def _directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+
+
+def compress_artifact(artifact, df, tolerance=COMPRESSION_MSE_TOLERANCE,
+                      prune_fractions=COMPRESSION_PRUNE_FRACTIONS, output_dir=None, latency_repeats=30):
+    """
+    Build int8 and pruned variants of a registered model and gate them on backtest MSE
+
+    Every variant is saved, reloaded the way production loads it and scored
+    with the actual-vs-predicted MSE of backtesting/backtest.py. Variants
+    whose MSE is more than `tolerance` (relative) above the float32 model
+    are rejected and their weights deleted.
+
+    Args:
+        artifact (ModelArtifact): Registered single-symbol model
+        df (pd.DataFrame): History to backtest on
+        tolerance (float): Max relative MSE increase, e.g. 0.05 = 5%
+        prune_fractions (list): Unit shares removed for the pruned variants
+        output_dir (str): Where variant weights and report.json go
+            (default: models/compressed/<name>/<version>)
+        latency_repeats (int): Timed forward passes per batch size
+
+    Returns:
+        pd.DataFrame: One row per variant with size, latency, MSE and acceptance
+    """
+    if artifact.scaler is None:
+        raise ValueError(f"{artifact.name}@{artifact.version} is a multi-symbol model; compression gates single-symbol models")
+    output_dir = output_dir or os.path.join(COMPRESSION_OUTPUT_DIR, artifact.name, artifact.version)
+    shutil.rmtree(output_dir, ignore_errors=True)
+
+    input_shape, layers = load_weights_dir(os.path.join(artifact.path, WEIGHTS_DIR), mmap=False)
+    variants = [("float32", layers), ("int8", quantize_layers(layers))]
+    # Calibrate pruning on (a sample of) the backtest windows
+    scaled = artifact.scaler.transform(df[artifact.features]).astype(np.float32)
+    windows = create_sequences(scaled, artifact.seq_length)[0]
+    calibration = windows[np.linspace(0, len(windows) - 1, min(len(windows), 512)).astype(int)]
+    for fraction in prune_fractions:
+        pruned = prune_layers(layers, fraction, input_shape, calibration)
+        variants.append((f"pruned{int(fraction * 100)}", pruned))
+        variants.append((f"pruned{int(fraction * 100)}_int8", quantize_layers(pruned)))
+
+    rows = []
+    for variant, variant_layers in variants:
+        path = os.path.join(output_dir, variant)
+        save_weights_dir(path, input_shape, variant_layers)
+        model = NumpyLSTMModel.load(path)
+        actual, predicted = backtest_predictions(model.predict_on_batch, artifact.scaler, df,
+                                                 artifact.features, artifact.seq_length)
+        latency = measure_latency(model, (1, 50), latency_repeats)
+        rows.append({
+            'variant': variant,
+            'units': [layer['units'] for layer in variant_layers],
+            'size_kb': _directory_size(path) / 1024,
+            'latency_ms_batch1': latency[1],
+            'latency_ms_batch50': latency[50],
+            'mse': float(np.mean((actual - predicted) ** 2)),
+            'path': path,
+        })
+
+    report = pd.DataFrame(rows)
+    baseline = report.iloc[0]
+    report['size_ratio'] = baseline['size_kb'] / report['size_kb']
+    report['speedup_batch1'] = baseline['latency_ms_batch1'] / report['latency_ms_batch1']
+    report['mse_change'] = report['mse'] / baseline['mse'] - 1
+    report['accepted'] = report['mse_change'] <= tolerance
+
+    for row in report.itertuples():
+        if row.accepted:
+            logger.info(f"✅ {row.variant}: {row.size_kb:.0f} KB ({row.size_ratio:.1f}x smaller), "
+                        f"{row.latency_ms_batch1:.2f} ms, MSE {row.mse:.2f} ({row.mse_change:+.1%})")
+        else:
+            logger.warning(f"❌ {row.variant} rejected: MSE {row.mse:.2f} ({row.mse_change:+.1%} > {tolerance:.0%})")
+            shutil.rmtree(row.path, ignore_errors=True)
+
+    with open(os.path.join(output_dir, "report.json"), "w") as f:
+        json.dump({
+            'model': artifact.name, 'version': artifact.version, 'tolerance': tolerance,
+            'variants': json.loads(report.drop(columns=["path"]).to_json(orient="records")),
+        }, f, indent=2)
+    return report
+
+
+def register_variant(artifact, row, registry=None, set_latest=False):
+    """
+    Register an accepted variant as a new version of the same model
+
+    The version is not promoted by default; use `python -m models.registry promote`
+    once it has been reviewed.
+
+    Returns:
+        ModelArtifact: The registered version
+    """
+    if not row['accepted']:
+        raise ValueError(f"Variant {row['variant']} failed the MSE gate")
+    input_shape, layers = load_weights_dir(row['path'], mmap=False)
+    return (registry or ModelRegistry()).register(
+        artifact.name, (input_shape, layers), artifact.features, artifact.seq_length, artifact.scaler,
+        target=artifact.target,
+        metrics={'backtest_mse': float(row['mse']), 'mse_change': float(row['mse_change']),
+                 'compression': row['variant'], 'compressed_from': artifact.version},
+        source=artifact.manifest.get('source'),
+        set_latest=set_latest
+    )
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m models.compress [model_name] [csv_path] [register]
+    name = sys.argv[1] if len(sys.argv) > 1 else "lstm_model"
+    registry = ModelRegistry()
+    artifact = registry.load(name)
+    csv_path = sys.argv[2] if len(sys.argv) > 2 and sys.argv[2] != "register" else artifact.manifest.get('source')
+    df = read_source(csv_path)
+
+    report = compress_artifact(artifact, df)
+    columns = ["variant", "units", "size_kb", "size_ratio", "latency_ms_batch1", "latency_ms_batch50",
+               "speedup_batch1", "mse", "mse_change", "accepted"]
+    print(f"\n🗜️ {artifact.name}@{artifact.version} on {csv_path}")
+    print(report[columns].to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+
+    if "register" in sys.argv[2:]:
+        candidates = report[report['accepted'] & (report['variant'] != "float32")]
+        if candidates.empty:
+            print("❌ No compressed variant passed the MSE gate")
+        else:
+            best = candidates.sort_values(["latency_ms_batch1", "size_kb"]).iloc[0]
+            registered = register_variant(artifact, best, registry)
+            print(f"✅ Registered {best['variant']} as {registered.name}@{registered.version} "
+                  f"(promote with: python -m models.registry promote {registered.name} {registered.version})")
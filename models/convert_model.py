@@ -2,7 +2,7 @@ import tensorflow as tf
 
 # ✅ Load the original model
 model = tf.keras.models.load_model(
-    "C:/Users/91882/Desktop/College Projects/Ai driven Algorithm trading projext and paper/project/models/lstm_trained_model.h5",
+    "models/lstm_trained_model.h5",
     custom_objects={"mse": tf.keras.losses.MeanSquaredError()}
 )
 
@@ -15,6 +15,6 @@ for layer in model.layers:
 new_model.compile(optimizer="adam", loss="mse")
 
 # ✅ Save the model in a compatible format
-new_model.save("C:/Users/91882/Desktop/College Projects/Ai driven Algorithm trading projext and paper/project/models/lstm_fixed.h5")
+new_model.save("models/lstm_fixed.h5")
 
 print("✅ Model re-saved successfully as lstm_fixed.h5!")
@@ -0,0 +1,416 @@
+import collections
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def sliding_windows(data, seq_length):
+    """
+    All length-`seq_length` windows of a (n_rows, n_features) array, without copying
+
+    Args:
+        data (np.ndarray): Feature matrix (may be a np.memmap)
+        seq_length (int): Window length
+
+    Returns:
+        np.ndarray: Read-only strided view of shape (n_rows - seq_length + 1, seq_length, n_features)
+    """
+    data = np.asarray(data) if not isinstance(data, np.ndarray) else data
+    # sliding_window_view puts the window axis last: (n, n_features, seq_length)
+    return sliding_window_view(data, seq_length, axis=0).transpose(0, 2, 1)
+
+
+def create_sequences(data, seq_length=50, target_col=0):
+    """
+    Build LSTM inputs and next-step targets as views into `data`
+
+    Same windows as the old list-append version (X[i] = data[i:i+seq_length],
+    y[i] = data[i+seq_length, target_col]) but nothing is copied.
+
+    Args:
+        data (np.ndarray): Scaled feature matrix
+        seq_length (int): Window length
+        target_col (int): Column predicted one step ahead
+
+    Returns:
+        tuple: (X view of shape (n, seq_length, n_features), y view of shape (n,))
+    """
+    X = sliding_windows(data, seq_length)[:-1]
+    y = data[seq_length:, target_col]
+    return X, y
+
+
+def scale_per_symbol(frames, features, seq_length, train_fraction):
+    """
+    Min-max scale each symbol on its own training rows only
+
+    The cut matches WindowDataset.split, so no validation row leaks into a scaler.
+
+    Args:
+        frames (dict): Symbol -> DataFrame
+        features (list): Feature columns
+        seq_length (int): Window length
+        train_fraction (float): Chronological train share of each symbol's windows
+
+    Returns:
+        tuple: (dict symbol -> float32 scaled array, dict symbol -> FittedScaler)
+    """
+    from models.registry import FittedScaler
+
+    arrays, scalers = {}, {}
+    for symbol, df in frames.items():
+        values = df[features].to_numpy(dtype=np.float64)
+        n_windows = len(values) - seq_length
+        if n_windows <= 1:
+            logger.warning(f"⚠️ Skipping {symbol}: {len(values)} rows is not enough for {seq_length}-bar windows")
+            continue
+        train_rows = int(n_windows * train_fraction) + seq_length
+        scalers[symbol] = FittedScaler.fit(values[:train_rows])
+        arrays[symbol] = scalers[symbol].transform(values).astype(np.float32)
+    return arrays, scalers
+
+
+def predict_in_batches(predict_fn, X, batch_size=1024):
+    """
+    Run a model over strided windows a batch at a time (only one batch is ever copied)
+
+    Args:
+        predict_fn (callable): e.g. model.predict_on_batch
+        X (np.ndarray): Windows (n, seq_length, n_features)
+        batch_size (int): Windows per call
+
+    Returns:
+        np.ndarray: Predictions of shape (n, 1)
+    """
+    outputs = [
+        np.asarray(predict_fn(np.ascontiguousarray(X[i:i + batch_size], dtype=np.float32)))
+        for i in range(0, len(X), batch_size)
+    ]
+    return np.concatenate(outputs).reshape(len(X), -1) if outputs else np.empty((0, 1), dtype=np.float32)
+
+
+def backtest_predictions(predict_fn, scaler, df, features, seq_length):
+    """
+    Actual vs. predicted prices over a whole history, as in backtesting/backtest.py
+
+    Args:
+        predict_fn (callable): e.g. model.predict_on_batch
+        scaler (FittedScaler): Scaler fitted at training time
+        df (pd.DataFrame): History with the feature columns
+        features (list): Feature columns in model input order (the first is the target)
+        seq_length (int): Window length
+
+    Returns:
+        tuple: (actual prices, predicted prices) for every bar after the first window
+    """
+    scaled = scaler.transform(df[features]).astype(np.float32)
+    X, y = create_sequences(scaled, seq_length)
+    y_pred = predict_in_batches(predict_fn, X)
+    return scaler.inverse_transform_column(y), scaler.inverse_transform_column(y_pred[:, 0])
+
+
+def save_feature_arrays(directory, arrays):
+    """
+    Save per-symbol feature matrices as .npy files so they can be memory-mapped later
+
+    Args:
+        directory (str): Output directory
+        arrays (dict): Symbol -> (n_rows, n_features) array
+    """
+    os.makedirs(directory, exist_ok=True)
+    for symbol, data in arrays.items():
+        np.save(os.path.join(directory, f"{symbol}.npy"), np.ascontiguousarray(data, dtype=np.float32))
+
+
+def load_feature_arrays(directory, symbols=None, mmap=True):
+    """
+    Load per-symbol feature matrices saved by `save_feature_arrays`
+
+    Args:
+        directory (str): Directory of <symbol>.npy files
+        symbols (list): Symbols to load (default: all)
+        mmap (bool): Memory-map instead of reading into RAM
+
+    Returns:
+        dict: Symbol -> array (np.memmap when mmap=True)
+    """
+    if symbols is None:
+        symbols = sorted(f[:-4] for f in os.listdir(directory) if f.endswith(".npy"))
+    return {
+        symbol: np.load(os.path.join(directory, f"{symbol}.npy"), mmap_mode="r" if mmap else None)
+        for symbol in symbols
+    }
+
+
+class WindowDataset:
+    """
+    Streaming, shuffled, prefetched window dataset over one or many symbols
+
+    Windows are never materialised: the dataset keeps one strided view per
+    symbol plus a compact (symbol, start) index, and only copies the windows
+    of the batch being produced. Shuffling is chunked - chunks of consecutive
+    windows are visited in random order and shuffled within a buffer of a
+    few chunks - so memory-mapped inputs are read in large sequential pieces.
+    A background thread prepares the next `prefetch` batches, gathering them
+    with `workers` threads (NumPy copies release the GIL).
+    """
+
+    def __init__(self, arrays, seq_length=50, target_col=0, batch_size=32,
+                 shuffle=True, chunk_size=1024, shuffle_chunks=4, prefetch=4,
+                 seed=None, index=None, return_symbols=False, workers=1):
+        """
+        Args:
+            arrays (dict or list): Symbol -> (n_rows, n_features) arrays (np.memmap works)
+            seq_length (int): Window length
+            target_col (int): Column predicted one step ahead
+            batch_size (int): Windows per batch
+            shuffle (bool): Shuffle window order every epoch
+            chunk_size (int): Consecutive windows per shuffle chunk
+            shuffle_chunks (int): Chunks mixed together in the shuffle buffer
+            prefetch (int): Batches prepared ahead by the background thread
+            seed (int): Random seed
+            index (np.ndarray): Pre-built (symbol_id, start) index (used by `split`)
+            return_symbols (bool): Yield ((X, symbol_ids), y) for models with a symbol input
+            workers (int): Threads gathering batches in parallel
+        """
+        if not isinstance(arrays, dict):
+            arrays = {i: a for i, a in enumerate(arrays)}
+        self.symbols = list(arrays)
+        self.arrays = [arrays[s] for s in self.symbols]
+        self.seq_length = seq_length
+        self.target_col = target_col
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.chunk_size = chunk_size
+        self.shuffle_chunks = shuffle_chunks
+        self.prefetch = prefetch
+        self.return_symbols = return_symbols
+        self.workers = max(1, workers)
+        self.rng = np.random.default_rng(seed)
+
+        self.windows = [sliding_windows(a, seq_length) if len(a) >= seq_length else None
+                        for a in self.arrays]
+        if index is None:
+            index = self._build_index()
+        self.index = index
+
+    def _build_index(self):
+        parts = []
+        for symbol_id, data in enumerate(self.arrays):
+            n = len(data) - self.seq_length
+            if n <= 0:
+                continue
+            part = np.empty((n, 2), dtype=np.int64)
+            part[:, 0] = symbol_id
+            part[:, 1] = np.arange(n)
+            parts.append(part)
+        return np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int64)
+
+    def __len__(self):
+        """
+        Returns:
+            int: Batches per epoch
+        """
+        return -(-len(self.index) // self.batch_size)
+
+    @property
+    def n_windows(self):
+        return len(self.index)
+
+    @property
+    def n_features(self):
+        return self.arrays[0].shape[1]
+
+    def split(self, fraction=0.8, cut_rows=None):
+        """
+        Chronological split per symbol (first `fraction` of each symbol's windows for training)
+
+        Args:
+            fraction (float): Train share of each symbol's windows
+            cut_rows (dict): Optional symbol -> first validation target row; windows
+                predicting an earlier row train, so the validation targets do not
+                depend on `seq_length` (overrides `fraction`)
+
+        Returns:
+            tuple: (train WindowDataset, validation WindowDataset without shuffling)
+        """
+        train_parts, val_parts = [], []
+        for symbol_id, symbol in enumerate(self.symbols):
+            rows = self.index[self.index[:, 0] == symbol_id]
+            if cut_rows is not None:
+                cut = int(np.searchsorted(rows[:, 1] + self.seq_length, cut_rows[symbol]))
+            else:
+                cut = int(len(rows) * fraction)
+            train_parts.append(rows[:cut])
+            val_parts.append(rows[cut:])
+
+        def subset(parts, shuffle):
+            index = np.concatenate(parts) if parts else np.empty((0, 2), dtype=np.int64)
+            return WindowDataset(
+                dict(zip(self.symbols, self.arrays)), self.seq_length, self.target_col,
+                self.batch_size, shuffle, self.chunk_size, self.shuffle_chunks,
+                self.prefetch, int(self.rng.integers(2 ** 31)), index,
+                self.return_symbols, self.workers
+            )
+        return subset(train_parts, self.shuffle), subset(val_parts, False)
+
+    def _epoch_order(self):
+        n = len(self.index)
+        if not self.shuffle:
+            return np.arange(n)
+        chunk_starts = np.arange(0, n, self.chunk_size)
+        self.rng.shuffle(chunk_starts)
+        order = []
+        for i in range(0, len(chunk_starts), self.shuffle_chunks):
+            buffer = np.concatenate([
+                np.arange(start, min(start + self.chunk_size, n))
+                for start in chunk_starts[i:i + self.shuffle_chunks]
+            ])
+            self.rng.shuffle(buffer)
+            order.append(buffer)
+        return np.concatenate(order) if order else np.arange(0)
+
+    def gather(self, rows):
+        """
+        Copy the windows and targets for some index rows
+
+        Args:
+            rows (np.ndarray): (k, 2) array of (symbol_id, start)
+
+        Returns:
+            tuple: (X float32 array (k, seq_length, n_features), y float32 array (k,)),
+                   or ((X, symbol_ids int32 array (k,)), y) with `return_symbols`
+        """
+        X = np.empty((len(rows), self.seq_length, self.n_features), dtype=np.float32)
+        y = np.empty(len(rows), dtype=np.float32)
+        for symbol_id in np.unique(rows[:, 0]):
+            mask = rows[:, 0] == symbol_id
+            starts = rows[mask, 1]
+            X[mask] = self.windows[symbol_id][starts]
+            y[mask] = self.arrays[symbol_id][starts + self.seq_length, self.target_col]
+        if self.return_symbols:
+            return (X, rows[:, 0].astype(np.int32)), y
+        return X, y
+
+    def _generate(self):
+        order = self._epoch_order()
+        batches = (self.index[order[i:i + self.batch_size]] for i in range(0, len(order), self.batch_size))
+        if self.workers == 1:
+            for rows in batches:
+                yield self.gather(rows)
+            return
+        # Keep up to `workers` gathers in flight, yielding in order
+        with ThreadPoolExecutor(self.workers, thread_name_prefix="window-gather") as pool:
+            pending = collections.deque()
+            for rows in batches:
+                pending.append(pool.submit(self.gather, rows))
+                if len(pending) >= self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def __iter__(self):
+        """
+        Iterate over one epoch of (X, y) batches, prepared ahead by a background thread
+        """
+        if self.prefetch <= 0:
+            yield from self._generate()
+            return
+
+        batches = queue.Queue(maxsize=self.prefetch)
+        done = object()
+        stop = threading.Event()
+
+        def producer():
+            try:
+                for batch in self._generate():
+                    while not stop.is_set():
+                        try:
+                            batches.put(batch, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set():
+                        return
+            except Exception as e:
+                batches.put(e)
+                return
+            batches.put(done)
+
+        thread = threading.Thread(target=producer, name="window-prefetch", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = batches.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    def as_tf_dataset(self):
+        """
+        Wrap the dataset for Keras `fit` (each iteration is a freshly shuffled epoch)
+
+        Returns:
+            tf.data.Dataset: Yields (X, y) batches
+        """
+        import tensorflow as tf
+
+        window_spec = tf.TensorSpec(shape=(None, self.seq_length, self.n_features), dtype=tf.float32)
+        target_spec = tf.TensorSpec(shape=(None,), dtype=tf.float32)
+        if self.return_symbols:
+            signature = ((window_spec, tf.TensorSpec(shape=(None,), dtype=tf.int32)), target_spec)
+        else:
+            signature = (window_spec, target_spec)
+        dataset = tf.data.Dataset.from_generator(self.__iter__, output_signature=signature)
+        # A known length lets Keras size epochs without running the generator dry
+        return dataset.apply(tf.data.experimental.assert_cardinality(len(self))).prefetch(tf.data.AUTOTUNE)
+
+
+if __name__ == "__main__":
+    # Memory check: 10 years x 50 symbols, list-append windows vs. strided views
+    import time
+    import tracemalloc
+
+    rng = np.random.default_rng(0)
+    n_symbols, n_rows, n_features, seq_length = 50, 2520, 8, 50
+    arrays = {f"SYM{i}": rng.random((n_rows, n_features), dtype=np.float32) for i in range(n_symbols)}
+    raw_mb = sum(a.nbytes for a in arrays.values()) / 1e6
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    dataset = WindowDataset(arrays, seq_length, batch_size=256)
+    train, val = dataset.split(0.8)
+    build_s = time.perf_counter() - start
+    _, view_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    start = time.perf_counter()
+    n_batches = sum(1 for _ in train)
+    epoch_s = time.perf_counter() - start
+    _, stream_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+
+    X_old = []
+    for data in arrays.values():
+        X_old.extend(data[i:i + seq_length] for i in range(len(data) - seq_length))
+    X_old = np.array(X_old)
+    _, copy_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"📦 Raw features: {raw_mb:.1f} MB, {dataset.n_windows} windows")
+    print(f"✅ Strided dataset build: {view_peak / 1e6:.1f} MB peak in {build_s * 1000:.1f} ms")
+    print(f"✅ Streaming one epoch ({n_batches} batches): {stream_peak / 1e6:.1f} MB peak in {epoch_s:.2f}s")
+    print(f"❌ List-append windows: {copy_peak / 1e6:.1f} MB peak")
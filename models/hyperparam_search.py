@@ -0,0 +1,384 @@
+import json
+import logging
+import math
+import multiprocessing
+import os
+import shutil
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import load_feature_arrays, save_feature_arrays, scale_per_symbol
+from models.registry import FittedScaler, ModelRegistry, hash_training_data
+from utils.feature_store import load_features
+from utils.config import (
+    SEARCH_MAX_EPOCHS, SEARCH_OUTPUT_DIR, SEARCH_PRUNE_MIN_TRIALS, SEARCH_PRUNE_WARMUP_EPOCHS,
+    SEARCH_TRIALS, SEARCH_WORKERS
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Choices are sampled uniformly; (low, high) tuples are sampled log-uniformly
+DEFAULT_SEARCH_SPACE = {
+    'layers': [1, 2, 3],
+    'units': [32, 64, 100, 128],
+    'dense_units': [16, 32, 50],
+    'dropout': [0.0, 0.1, 0.2, 0.3],
+    'learning_rate': (1e-4, 3e-3),
+    'seq_length': [20, 30, 50],
+}
+
+
+def sample_params(rng, space=DEFAULT_SEARCH_SPACE):
+    """
+    Draw one trial configuration from the search space
+
+    Layer widths are drawn per layer and sorted so deeper layers are never wider.
+
+    Returns:
+        dict: Trial hyperparameters
+    """
+    def draw(choice):
+        if isinstance(choice, tuple):
+            low, high = choice
+            return float(math.exp(rng.uniform(math.log(low), math.log(high))))
+        return choice[int(rng.integers(len(choice)))]
+
+    params = {key: draw(choice) for key, choice in space.items() if key != 'units'}
+    params['units'] = sorted((draw(space['units']) for _ in range(params['layers'])), reverse=True)
+    for key, value in params.items():
+        if isinstance(value, np.generic):
+            params[key] = value.item()
+    return params
+
+
+def prepare_dataset_cache(frames, features, seq_length, train_fraction, cache_dir):
+    """
+    Scale the data once per (data, features, longest seq_length) and store it as .npy files
+
+    Every trial shares this cache: the scalers are fit on the rows before the
+    validation cut of the longest window length, and `cut_rows.json` records
+    that cut so every trial validates on the same target rows. Validation MSE
+    is then comparable across sequence lengths. Trials memory-map the cached
+    arrays instead of re-reading and re-scaling the raw data; later searches
+    over the same data reuse the cache.
+
+    Args:
+        frames (dict): Symbol -> DataFrame with the feature columns
+        features (list): Feature columns
+        seq_length (int): Longest window length any trial uses
+        train_fraction (float): Chronological train share of the longest windows
+        cache_dir (str): Cache root
+
+    Returns:
+        str: Cache directory for this dataset
+    """
+    key = f"{hash_training_data(frames, features)[:12]}_L{seq_length}_f{train_fraction}"
+    path = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(path, "cut_rows.json")):
+        logger.info(f"♻️ Dataset cache hit: {key}")
+        return path
+
+    arrays, scalers = scale_per_symbol(frames, features, seq_length, train_fraction)
+    # Same cut as scale_per_symbol: the scalers never see a validation target
+    cut_rows = {symbol: int((len(array) - seq_length) * train_fraction) + seq_length
+                for symbol, array in arrays.items()}
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    save_feature_arrays(tmp_path, arrays)
+    with open(os.path.join(tmp_path, "scalers.json"), "w") as f:
+        json.dump({symbol: scaler.to_dict() for symbol, scaler in scalers.items()}, f)
+    with open(os.path.join(tmp_path, "cut_rows.json"), "w") as f:
+        json.dump(cut_rows, f)
+    os.replace(tmp_path, path)
+    logger.info(f"💾 Cached dataset {key} ({len(arrays)} symbols)")
+    return path
+
+
+def _init_worker(threads):
+    # TensorFlow thread pools must be sized before the first op runs
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _build_model(params, n_features):
+    import tensorflow as tf
+    from tensorflow.keras.layers import LSTM, Dense, Dropout, Input
+
+    model_layers = [Input(shape=(params['seq_length'], n_features))]
+    for i, units in enumerate(params['units']):
+        model_layers.append(LSTM(units, return_sequences=i < len(params['units']) - 1))
+        if params['dropout'] > 0:
+            model_layers.append(Dropout(params['dropout']))
+    model_layers.append(Dense(params['dense_units'], activation="relu"))
+    model_layers.append(Dense(1))
+
+    model = tf.keras.Sequential(model_layers)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=params['learning_rate']), loss="mse")
+    return model
+
+
+def _run_trial(trial_id, params, cache_path, settings, reports, lock):
+    """
+    Train and time one configuration (runs in a worker process)
+
+    Intermediate validation losses go to the shared `reports` dict so every
+    trial can be compared against the median of the others at the same epoch.
+
+    Returns:
+        dict: Leaderboard row
+    """
+    import tensorflow as tf
+
+    from models.dataset import WindowDataset
+    from models.numpy_lstm import NumpyLSTMModel, measure_latency, read_keras_model, save_weights_dir
+
+    tf.keras.utils.set_random_seed(settings['seed'] + trial_id)
+    start = time.perf_counter()
+    arrays = load_feature_arrays(cache_path, mmap=True)
+    with open(os.path.join(cache_path, "cut_rows.json")) as f:
+        cut_rows = json.load(f)
+    dataset = WindowDataset(arrays, params['seq_length'], batch_size=settings['batch_size'],
+                            seed=settings['seed'] + trial_id, prefetch=2)
+    # Same validation targets and scalers for every seq_length, so val_loss is comparable
+    train_data, val_data = dataset.split(cut_rows=cut_rows)
+
+    class MedianPruning(tf.keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self.pruned_at = None
+
+        def on_epoch_end(self, epoch, logs=None):
+            val_loss = (logs or {}).get('val_loss')
+            if val_loss is None or not math.isfinite(val_loss):
+                self.pruned_at = epoch + 1
+                self.model.stop_training = True
+                return
+            with lock:
+                reports[(trial_id, epoch)] = float(val_loss)
+                others = [v for (t, e), v in reports.items() if e == epoch and t != trial_id]
+            if (epoch + 1 >= settings['warmup_epochs'] and len(others) >= settings['min_trials']
+                    and val_loss > statistics.median(others)):
+                self.pruned_at = epoch + 1
+                self.model.stop_training = True
+
+    pruning = MedianPruning()
+    model = _build_model(params, dataset.n_features)
+    history = model.fit(
+        train_data.as_tf_dataset(),
+        validation_data=val_data.as_tf_dataset(),
+        epochs=settings['max_epochs'],
+        callbacks=[
+            tf.keras.callbacks.EarlyStopping(monitor="val_loss", patience=settings['patience'],
+                                             restore_best_weights=True),
+            pruning,
+        ],
+        shuffle=False,
+        verbose=0
+    )
+    train_seconds = time.perf_counter() - start
+    val_losses = [v for v in history.history.get('val_loss', []) if math.isfinite(v)]
+
+    # Latency is measured on the NumPy runtime the live scripts use
+    input_shape, layers = read_keras_model(model)
+    weights_path = os.path.join(settings['output_dir'], f"trial_{trial_id:03d}", "weights")
+    save_weights_dir(weights_path, input_shape, layers)
+    latency = measure_latency(NumpyLSTMModel(input_shape, layers), (1, 50), settings['latency_repeats'])
+
+    return {
+        'trial': trial_id,
+        # Stopping on the last epoch still ran the full budget
+        'status': "pruned" if pruning.pruned_at and pruning.pruned_at < settings['max_epochs'] else "complete",
+        'val_mse': min(val_losses) if val_losses else float("inf"),
+        'latency_ms_batch1': latency[1],
+        'latency_ms_batch50': latency[50],
+        'epochs': len(history.history.get('loss', [])),
+        'params_count': int(model.count_params()),
+        'train_seconds': train_seconds,
+        'weights_path': weights_path,
+        'cache_path': cache_path,
+        **{f"hp_{key}": (json.dumps(value) if isinstance(value, list) else value) for key, value in params.items()},
+    }
+
+
+def run_search(frames, features, n_trials=SEARCH_TRIALS, workers=SEARCH_WORKERS, space=DEFAULT_SEARCH_SPACE,
+               max_epochs=SEARCH_MAX_EPOCHS, batch_size=64, train_fraction=0.8, patience=3,
+               warmup_epochs=SEARCH_PRUNE_WARMUP_EPOCHS, min_trials=SEARCH_PRUNE_MIN_TRIALS,
+               output_dir=SEARCH_OUTPUT_DIR, latency_repeats=30, seed=42):
+    """
+    Random search over LSTM hyperparameters in parallel worker processes
+
+    Each trial trains with early stopping (best weights restored) and is
+    pruned when its validation loss is above the median of the other trials
+    at the same epoch. The data is scaled once and cached under
+    <output_dir>/cache; every trial validates on the same target rows with the
+    same scalers whatever its sequence length, so losses are comparable.
+
+    Args:
+        frames (dict): Symbol -> DataFrame with the feature columns
+        features (list): Feature columns; the first is the target
+        n_trials (int): Number of configurations to try
+        workers (int): Parallel trial processes (0 = one per CPU core)
+        space (dict): Search space (see DEFAULT_SEARCH_SPACE)
+        max_epochs (int): Epoch cap per trial
+        batch_size (int): Windows per batch
+        train_fraction (float): Chronological train share per symbol
+        patience (int): Early-stopping patience in epochs
+        warmup_epochs (int): Epochs before pruning may stop a trial
+        min_trials (int): Other trials' reports needed at an epoch before pruning
+        output_dir (str): Leaderboard, trial weights and cache directory
+        latency_repeats (int): Timed forward passes per batch size
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: Leaderboard sorted by validation MSE
+    """
+    output_dir = output_dir if os.path.isabs(output_dir) else os.path.join(project_root, output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    trials = [sample_params(rng, space) for _ in range(n_trials)]
+
+    cache_path = prepare_dataset_cache(frames, features, max(params['seq_length'] for params in trials),
+                                       train_fraction, os.path.join(output_dir, "cache"))
+
+    cores = os.cpu_count() or 1
+    workers = min(workers or cores, n_trials)
+    settings = {
+        'seed': seed, 'batch_size': batch_size, 'train_fraction': train_fraction,
+        'max_epochs': max_epochs, 'patience': patience, 'warmup_epochs': warmup_epochs,
+        'min_trials': min_trials, 'output_dir': output_dir, 'latency_repeats': latency_repeats,
+    }
+    logger.info(f"🔎 {n_trials} trials on {workers} worker process(es), {max(1, cores // workers)} TF thread(s) each")
+
+    rows = []
+    start = time.perf_counter()
+    # Spawned workers: TensorFlow is not fork-safe
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        reports, lock = manager.dict(), manager.Lock()
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=(max(1, cores // workers),)) as pool:
+            futures = {
+                pool.submit(_run_trial, trial_id, params, cache_path, settings, reports, lock): trial_id
+                for trial_id, params in enumerate(trials)
+            }
+            for future in as_completed(futures):
+                trial_id = futures[future]
+                try:
+                    row = future.result()
+                except Exception as e:
+                    logger.error(f"❌ Trial {trial_id} failed: {e}")
+                    continue
+                rows.append(row)
+                logger.info(f"{'✂️' if row['status'] == 'pruned' else '✅'} Trial {trial_id}: val MSE {row['val_mse']:.6f}, "
+                            f"{row['latency_ms_batch1']:.2f} ms/prediction, {row['epochs']} epochs ({row['status']})")
+
+    leaderboard = build_leaderboard(rows)
+    leaderboard.to_csv(os.path.join(output_dir, "leaderboard.csv"), index=False)
+    leaderboard.to_json(os.path.join(output_dir, "leaderboard.json"), orient="records", indent=2)
+    logger.info(f"🏁 Search finished in {time.perf_counter() - start:.0f}s -> {output_dir}/leaderboard.csv")
+    return leaderboard
+
+
+def build_leaderboard(rows):
+    """
+    Sort trials by validation MSE and flag the MSE/latency Pareto front
+
+    A trial is on the front when no other completed trial is both more
+    accurate and faster for single predictions.
+
+    Returns:
+        pd.DataFrame: One row per trial
+    """
+    leaderboard = pd.DataFrame(rows)
+    if leaderboard.empty:
+        return leaderboard
+    leaderboard = leaderboard.sort_values(["val_mse", "latency_ms_batch1"]).reset_index(drop=True)
+    complete = leaderboard[leaderboard['status'] == "complete"]
+    leaderboard['pareto'] = [
+        row.status == "complete" and not (
+            (complete['val_mse'] < row.val_mse) & (complete['latency_ms_batch1'] < row.latency_ms_batch1)
+        ).any()
+        for row in leaderboard.itertuples()
+    ]
+    return leaderboard
+
+
+def choose_within_budget(leaderboard, latency_budget_ms, latency_column="latency_ms_batch1"):
+    """
+    Most accurate completed trial whose latency fits the budget
+
+    Returns:
+        pd.Series: Leaderboard row, or None if nothing fits
+    """
+    fits = leaderboard[(leaderboard['status'] == "complete") & (leaderboard[latency_column] <= latency_budget_ms)]
+    return fits.iloc[0] if len(fits) else None
+
+
+def register_trial(row, name, features, data=None, registry=None):
+    """
+    Register a trial's weights and scalers in the model registry
+
+    Args:
+        row (pd.Series): Leaderboard row
+        name (str): Registry model name
+        features (list): Feature columns used for the search
+        data (dict): Raw symbol -> DataFrame the search ran on (hashed into the manifest)
+        registry (ModelRegistry): Target registry (default: MODEL_REGISTRY_DIR)
+
+    Returns:
+        ModelArtifact: Registered version
+    """
+    from models.numpy_lstm import load_weights_dir
+
+    with open(os.path.join(row['cache_path'], "scalers.json")) as f:
+        scalers = {symbol: FittedScaler.from_dict(params) for symbol, params in json.load(f).items()}
+    input_shape, layers = load_weights_dir(row['weights_path'], mmap=False)
+    single = len(scalers) == 1
+    return (registry or ModelRegistry()).register(
+        name, (input_shape, layers), features, int(row['hp_seq_length']),
+        next(iter(scalers.values())) if single else None,
+        data=next(iter(data.values())) if single and data else data,
+        symbol_scalers=None if single else scalers,
+        metrics={'val_mse': float(row['val_mse']), 'latency_ms_batch1': float(row['latency_ms_batch1']),
+                 'search_trial': int(row['trial'])},
+        source="hyperparam_search"
+    )
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m models.hyperparam_search [n_trials] [workers] [latency_budget_ms]
+    n_trials = int(sys.argv[1]) if len(sys.argv) > 1 else SEARCH_TRIALS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else SEARCH_WORKERS
+    budget_ms = float(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    # Same data and features as models/lstm_model.py
+    features = ["Close", "SMA_50", "SMA_200", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"]
+    df = load_features("TSLA", features)
+
+    leaderboard = run_search({"TSLA": df}, features, n_trials=n_trials, workers=workers)
+    columns = ["trial", "status", "val_mse", "latency_ms_batch1", "latency_ms_batch50", "epochs",
+               "params_count", "pareto", "hp_layers", "hp_units", "hp_dropout", "hp_learning_rate", "hp_seq_length"]
+    print("\n🏆 Leaderboard (validation MSE vs. NumPy inference latency)")
+    print(leaderboard[columns].to_string(index=False, float_format=lambda v: f"{v:.5g}"))
+
+    if budget_ms is not None:
+        best = choose_within_budget(leaderboard, budget_ms)
+        if best is None:
+            print(f"\n❌ No completed trial fits a {budget_ms} ms budget")
+        else:
+            print(f"\n✅ Best within {budget_ms} ms: trial {best['trial']} (val MSE {best['val_mse']:.6f}, "
+                  f"{best['latency_ms_batch1']:.2f} ms)")
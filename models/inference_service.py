@@ -0,0 +1,312 @@
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.config import INFERENCE_BACKEND
+from utils.metrics import Histogram, METRICS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Batches are padded up to one of these sizes so the model only ever sees a few shapes
+DEFAULT_BATCH_BUCKETS = (1, 8, 32, 64, 128)
+
+
+class LSTMInferenceService:
+    """
+    Resident LSTM inference service
+    - Loads the model once and keeps it in memory (by default the
+      TensorFlow-free NumPy runtime, see models/numpy_lstm.py)
+    - Requests from any thread are queued and gathered into one batched
+      forward pass (up to `max_batch_size` windows or `max_wait_ms`)
+    - `predict_many` runs a whole universe in a single batched call
+    - `stats` reports throughput, batch sizes and latency percentiles
+    """
+
+    def __init__(self, model_path, max_batch_size=128, max_wait_ms=2.0,
+                 batch_buckets=DEFAULT_BATCH_BUCKETS, model=None, backend=INFERENCE_BACKEND):
+        """
+        Args:
+            model_path (str): Path to the Keras .h5 model (or an exported .npz weight file)
+            max_batch_size (int): Maximum windows per forward pass
+            max_wait_ms (float): How long the batcher waits for more requests
+            batch_buckets (tuple): Padded batch sizes
+            model: Already-loaded model (skips loading from `model_path`)
+            backend (str): "numpy" (TensorFlow-free runtime) or "keras"
+        """
+        self.model_path = model_path
+        self.backend = backend
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_buckets = tuple(b for b in batch_buckets if b <= max_batch_size) or (max_batch_size,)
+        self._model = model
+        self._load_lock = threading.Lock()
+        self._predict_lock = threading.Lock()
+
+        self._requests = queue.Queue()
+        self._worker = None
+        self._stop_event = threading.Event()
+
+        self._latency = Histogram()
+        self._stats_lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._windows = 0
+        self._batches = 0
+        self.load_seconds = 0.0
+
+    # ------------------------------------------------------------------
+    # Model
+    # ------------------------------------------------------------------
+    @property
+    def model(self):
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        if self.backend == "numpy" or self.model_path.endswith(".npz"):
+            return self._load_numpy_model()
+        return self._load_keras_model()
+
+    def _load_numpy_model(self):
+        start = time.perf_counter()
+        from models.numpy_lstm import NumpyLSTMModel
+
+        # Prefer the exported weight file next to the .h5 (python -m models.numpy_lstm export ...)
+        weights_path = os.path.splitext(self.model_path)[0] + ".npz"
+        if not os.path.exists(weights_path):
+            weights_path = self.model_path
+        try:
+            model = NumpyLSTMModel.load(weights_path)
+        except ImportError:
+            logger.warning("⚠️ No exported .npz weights and h5py is missing, falling back to Keras")
+            return self._load_keras_model()
+        self.load_seconds = time.perf_counter() - start
+        logger.info(f"✅ NumPy LSTM loaded once from {weights_path} in {self.load_seconds * 1000:.1f} ms")
+        return model
+
+    def _load_keras_model(self):
+        start = time.perf_counter()
+        import tensorflow as tf
+
+        model = tf.keras.models.load_model(
+            self.model_path,
+            custom_objects={"mse": tf.keras.losses.MeanSquaredError()},
+            compile=False
+        )
+        self.load_seconds = time.perf_counter() - start
+        logger.info(f"✅ Model loaded once from {self.model_path} in {self.load_seconds:.2f}s")
+        return model
+
+    @property
+    def input_shape(self):
+        """
+        Returns:
+            tuple: (seq_length, n_features) expected by the model
+        """
+        return tuple(self.model.input_shape[1:])
+
+    def warmup(self):
+        """
+        Run one forward pass per batch bucket so later calls don't pay for graph tracing
+        """
+        seq_length, n_features = self.input_shape
+        for bucket in self.batch_buckets:
+            self._forward(np.zeros((bucket, seq_length, n_features), dtype=np.float32))
+        return self
+
+    def _bucket(self, size):
+        for bucket in self.batch_buckets:
+            if size <= bucket:
+                return bucket
+        return size
+
+    def _forward(self, batch):
+        """
+        One forward pass over a (batch, seq_length, n_features) array
+
+        Returns:
+            np.ndarray: Predictions of shape (batch,)
+        """
+        size = len(batch)
+        padded = self._bucket(size)
+        if padded != size:
+            pad = np.zeros((padded - size,) + batch.shape[1:], dtype=batch.dtype)
+            batch = np.concatenate([batch, pad])
+        with self._predict_lock, METRICS.timer("lstm_inference"):
+            output = self.model.predict_on_batch(batch)
+        return np.asarray(output).reshape(padded, -1)[:size, 0]
+
+    # ------------------------------------------------------------------
+    # Batched API
+    # ------------------------------------------------------------------
+    def predict_many(self, windows):
+        """
+        Predict many windows with as few forward passes as possible
+
+        Args:
+            windows: Array of shape (n, seq_length, n_features), a list of
+                     (seq_length, n_features) arrays, or a dict symbol -> window
+
+        Returns:
+            np.ndarray or dict: Predictions (dict keyed like the input if a dict was given)
+        """
+        keys = None
+        if isinstance(windows, dict):
+            keys = list(windows)
+            windows = [windows[k] for k in keys]
+        batch = np.asarray(windows, dtype=np.float32)
+        if batch.ndim == 2:
+            batch = batch[np.newaxis]
+
+        start = time.perf_counter()
+        predictions = np.concatenate([
+            self._forward(batch[i:i + self.max_batch_size])
+            for i in range(0, len(batch), self.max_batch_size)
+        ]) if len(batch) else np.empty(0, dtype=np.float32)
+        self._record(len(batch), -(-len(batch) // self.max_batch_size), [time.perf_counter() - start])
+
+        if keys is not None:
+            return dict(zip(keys, predictions.tolist()))
+        return predictions
+
+    # ------------------------------------------------------------------
+    # Request/response API (gathers concurrent callers into batches)
+    # ------------------------------------------------------------------
+    def start(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stop_event.clear()
+            self._worker = threading.Thread(target=self._batch_loop, name="lstm-inference", daemon=True)
+            self._worker.start()
+        return self
+
+    def submit(self, window):
+        """
+        Queue one window for the next batched forward pass
+
+        Args:
+            window (np.ndarray): (seq_length, n_features) input
+
+        Returns:
+            Future: Resolves to the predicted (scaled) value
+        """
+        self.start()
+        future = Future()
+        self._requests.put((np.asarray(window, dtype=np.float32), future, time.perf_counter()))
+        return future
+
+    def predict(self, window, timeout=None):
+        """
+        Blocking single prediction that shares batches with concurrent callers
+        """
+        return self.submit(window).result(timeout)
+
+    def _batch_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                first = self._requests.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            pending = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(pending) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    pending.append(self._requests.get(timeout=max(remaining, 0)) if remaining > 0
+                                   else self._requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                predictions = self._forward(np.stack([window for window, _, _ in pending]))
+                done = time.perf_counter()
+                for (_, future, _), value in zip(pending, predictions):
+                    future.set_result(float(value))
+                self._record(len(pending), 1, [done - queued for _, _, queued in pending])
+            except Exception as e:
+                for _, future, _ in pending:
+                    future.set_exception(e)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join()
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+    def _record(self, windows, batches, latencies):
+        with self._stats_lock:
+            self._windows += windows
+            self._batches += batches
+            for latency in latencies:
+                self._latency.observe(latency)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Windows served, batches, average batch size, throughput and latency percentiles (ms)
+        """
+        with self._stats_lock:
+            elapsed = time.perf_counter() - self._started_at
+            return {
+                'windows': self._windows,
+                'batches': self._batches,
+                'avg_batch_size': self._windows / self._batches if self._batches else 0.0,
+                'throughput_per_sec': self._windows / elapsed if elapsed > 0 else 0.0,
+                'latency_p50_ms': self._latency.quantile(0.5) * 1000,
+                'latency_p95_ms': self._latency.quantile(0.95) * 1000,
+                'latency_p99_ms': self._latency.quantile(0.99) * 1000,
+                'model_load_seconds': self.load_seconds,
+            }
+
+
+if __name__ == "__main__":
+    # Benchmark: one prediction vs. a batched prediction for every configured symbol
+    from utils.config import NIFTY_50_STOCKS
+
+    model_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, "models", "lstm_trained_model.h5")
+    service = LSTMInferenceService(model_path)
+    seq_length, n_features = service.input_shape
+    service.warmup()
+
+    rng = np.random.default_rng(0)
+    windows = {symbol: rng.random((seq_length, n_features), dtype=np.float32) for symbol in NIFTY_50_STOCKS}
+    single = next(iter(windows.values()))
+
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        service.predict_many([single])
+    one_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        service.predict_many(windows)
+    all_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    futures = [service.submit(window) for window in windows.values()]
+    [future.result() for future in futures]
+    queued_ms = (time.perf_counter() - start) * 1000
+    service.stop()
+
+    print(f"📈 1 symbol: {one_ms:.2f} ms per forward pass")
+    print(f"📈 {len(windows)} symbols batched: {all_ms:.2f} ms per forward pass")
+    print(f"📈 {len(windows)} symbols via request queue: {queued_ms:.2f} ms")
+    print(f"📊 Stats: {service.stats()}")
@@ -5,9 +5,19 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from sklearn.preprocessing import MinMaxScaler
 import matplotlib.pyplot as plt
+import os
+import sys
 
-# Load the dataset
-df = pd.read_csv("data/TSLA_data_with_indicators.csv", index_col="Date", parse_dates=True)
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from models.dataset import WindowDataset
+from models.registry import ModelRegistry
+from utils.feature_store import load_features
+
+# Load the dataset (memory-mapped feature store, built from data/TSLA_data.csv on first use)
+df = load_features("TSLA")
 
 # Select features and target variable
 features = ["Close", "SMA_50", "SMA_200", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"]
@@ -17,22 +27,12 @@ target = "Close"
 scaler = MinMaxScaler()
 df_scaled = scaler.fit_transform(df[features])
 
-# Convert data into sequences for LSTM
-def create_sequences(data, seq_length=50):
-    X, y = [], []
-    for i in range(len(data) - seq_length):
-        X.append(data[i:i+seq_length])
-        y.append(data[i+seq_length, 0])  # Predicting 'Close' price
-    return np.array(X), np.array(y)
-
-# Prepare training and testing data
+# Stream LSTM windows straight out of the scaled matrix (no per-window copies)
 seq_length = 50
-X, y = create_sequences(df_scaled, seq_length)
+dataset = WindowDataset({"TSLA": df_scaled.astype(np.float32)}, seq_length, batch_size=32, seed=42)
 
 # Split into training (80%) and testing (20%)
-train_size = int(len(X) * 0.8)
-X_train, X_test = X[:train_size], X[train_size:]
-y_train, y_test = y[:train_size], y[train_size:]
+train_data, test_data = dataset.split(0.8)
 
 # Build LSTM Model
 model = Sequential([
@@ -49,12 +49,20 @@ model.compile(optimizer="adam", loss="mse")
 
 # Train the model
 print("🚀 Training LSTM Model...")
-history = model.fit(X_train, y_train, epochs=20, batch_size=32, validation_data=(X_test, y_test))
+history = model.fit(train_data.as_tf_dataset(), epochs=20, validation_data=test_data.as_tf_dataset())
 
 # Save the trained model
 model.save("models/lstm_model.h5")
 print("✅ Model saved successfully!")
 
+# Register the model with its fitted scaler, feature list and training data hash
+artifact = ModelRegistry().register(
+    "lstm_model", "models/lstm_model.h5", features, seq_length, scaler, data=df[features],
+    metrics={'loss': history.history['loss'][-1], 'val_loss': history.history['val_loss'][-1]},
+    source="feature_store:TSLA"
+)
+print(f"✅ Registered {artifact.name}@{artifact.version}")
+
 # Plot training loss
 plt.plot(history.history['loss'], label="Training Loss")
 plt.plot(history.history['val_loss'], label="Validation Loss")
@@ -0,0 +1,331 @@
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import load_feature_arrays, save_feature_arrays, sliding_windows
+from models.registry import FittedScaler, ModelRegistry, hash_training_data
+from utils.config import MODEL_REGISTRY_DIR, ZOO_DIR, ZOO_LAGS, ZOO_MIN_ACCURACY
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class FeatureSet:
+    """
+    Feature matrix shared by every zoo model, built once and cached on disk
+
+    Holds the raw feature rows and the same rows min-max scaled on the
+    training split, both memory-mapped from <cache_dir>/<data hash>/. The
+    label of bar t is the direction of the next close (1 = up). Every model
+    is trained and scored on the same decision bars: the first `lookback - 1`
+    bars are skipped so the longest model input fits, and the last bar has
+    no label.
+    """
+
+    def __init__(self, df, features, price_column=None, lookback=50, train_fraction=0.8,
+                 cache_dir=os.path.join(ZOO_DIR, "features")):
+        """
+        Args:
+            df (pd.DataFrame): History with the feature columns
+            features (list): Feature columns
+            price_column (str): Column whose next move is predicted (default: first feature)
+            lookback (int): Longest history any model needs (e.g. the LSTM window)
+            train_fraction (float): Chronological share of decision bars used for training
+            cache_dir (str): Feature cache directory (relative paths are resolved from the project root)
+        """
+        self.features = list(features)
+        self.price_column = price_column or self.features[0]
+        self.lookback = lookback
+        df = df.dropna(subset=self.features)
+        self.index = df.index
+
+        cache_dir = cache_dir if os.path.isabs(cache_dir) else os.path.join(project_root, cache_dir)
+        key = f"{hash_training_data(df, self.features)[:12]}_L{lookback}_f{train_fraction}"
+        path = os.path.join(cache_dir, key)
+        n_rows = len(df)
+        rows = np.arange(lookback - 1, n_rows - 1)
+        n_train = int(len(rows) * train_fraction)
+        if not os.path.exists(os.path.join(path, "scaler.json")):
+            raw = df[self.features].to_numpy(dtype=np.float64)
+            # Fit on every row a training window can touch (up to and including the last training label)
+            scaler = FittedScaler.fit(raw[:rows[n_train - 1] + 2])
+            tmp_path = f"{path}.tmp"
+            save_feature_arrays(tmp_path, {'raw': raw, 'scaled': scaler.transform(raw)})
+            with open(os.path.join(tmp_path, "scaler.json"), "w") as f:
+                json.dump(scaler.to_dict(), f)
+            os.replace(tmp_path, path)
+            logger.info(f"💾 Cached feature matrix {key} ({n_rows} rows x {len(self.features)} features)")
+
+        arrays = load_feature_arrays(path, ["raw", "scaled"], mmap=True)
+        self.raw, self.scaled = arrays['raw'], arrays['scaled']
+        with open(os.path.join(path, "scaler.json")) as f:
+            self.scaler = FittedScaler.from_dict(json.load(f))
+
+        self.close = np.asarray(self.raw[:, self.features.index(self.price_column)], dtype=np.float64)
+        self.direction = np.zeros(n_rows, dtype=np.int8)
+        self.direction[:-1] = self.close[1:] > self.close[:-1]
+        self.train_rows, self.test_rows = rows[:n_train], rows[n_train:]
+
+    def tabular(self, rows, lags):
+        """
+        Last `lags` scaled rows before each decision bar, flattened
+
+        Returns:
+            np.ndarray: (len(rows), lags * n_features)
+        """
+        rows = np.asarray(rows)
+        return sliding_windows(self.scaled, lags)[rows - lags + 1].reshape(len(rows), -1)
+
+    def windows(self, rows, seq_length, scaler=None):
+        """
+        Sequence windows ending at each decision bar
+
+        Args:
+            rows (np.ndarray): Decision bars
+            seq_length (int): Window length
+            scaler (FittedScaler): Rescale the raw rows with this scaler (e.g. a model's training scaler)
+
+        Returns:
+            np.ndarray: (len(rows), seq_length, n_features) float32 windows
+        """
+        rows = np.asarray(rows)
+        if scaler is None:
+            return sliding_windows(self.scaled, seq_length)[rows - seq_length + 1]
+        # Only rescale the rows the windows cover
+        start = rows.min() - seq_length + 1
+        data = scaler.transform(self.raw[start:rows.max() + 1]).astype(np.float32)
+        return sliding_windows(data, seq_length)[rows - seq_length + 1 - start]
+
+
+class SklearnZooModel:
+    """
+    scikit-learn classifier on the last `lags` bars of the shared feature matrix
+    """
+
+    def __init__(self, name, estimator, lags=ZOO_LAGS):
+        """
+        Args:
+            name (str): Zoo name
+            estimator: Unfitted scikit-learn classifier
+            lags (int): Bars of history per prediction
+        """
+        self.name = name
+        self.estimator = estimator
+        self.lags = lags
+
+    def fit(self, feature_set, rows):
+        self.estimator.fit(feature_set.tabular(rows, self.lags), feature_set.direction[rows])
+        return self
+
+    def predict_direction(self, feature_set, rows):
+        """
+        Returns:
+            np.ndarray: 1 where the next close is predicted to be higher, else 0
+        """
+        return self.estimator.predict(feature_set.tabular(rows, self.lags)).astype(np.int8)
+
+    def size_bytes(self):
+        return len(pickle.dumps(self.estimator))
+
+
+class LSTMZooModel:
+    """
+    Registered LSTM price model used as a direction classifier
+
+    Direction is "up" when the predicted next close is above the current one,
+    the rule live_trading.py trades on. The network is trained by the LSTM
+    training scripts, so `fit` only checks the feature set matches the model.
+    """
+
+    def __init__(self, name="lstm", model_name="lstm_model", version=None, registry_root=MODEL_REGISTRY_DIR):
+        """
+        Args:
+            name (str): Zoo name
+            model_name (str): Registry model name
+            version (str): Registry version (default: latest)
+            registry_root (str): Registry directory
+        """
+        self.name = name
+        self.model_name = model_name
+        self.version = version
+        self.registry_root = registry_root
+        self._artifact = None
+
+    def __getstate__(self):
+        # Pickle the registry reference, not the loaded weights
+        state = dict(self.__dict__)
+        state['_artifact'] = None
+        return state
+
+    @property
+    def artifact(self):
+        if self._artifact is None:
+            self._artifact = ModelRegistry(self.registry_root).load(self.model_name, self.version)
+            self.version = self._artifact.version
+        return self._artifact
+
+    def fit(self, feature_set, rows):
+        if self.artifact.features != feature_set.features:
+            raise KeyError(f"{self.artifact.name}@{self.artifact.version} expects features {self.artifact.features}")
+        return self
+
+    def predict_direction(self, feature_set, rows):
+        artifact = self.artifact
+        rows = np.asarray(rows)
+        if artifact.features != feature_set.features:
+            raise KeyError(f"{artifact.name}@{artifact.version} expects features {artifact.features}")
+        windows = feature_set.windows(rows, artifact.seq_length, artifact.scaler)
+        output = artifact.model.predict(windows)[:, 0]
+        predicted = artifact.scaler.inverse_transform_column(output, artifact.features.index(artifact.target))
+        return (predicted > feature_set.close[rows]).astype(np.int8)
+
+    def size_bytes(self):
+        return int(sum(value.nbytes for layer in self.artifact.model.layers
+                       for value in layer.values() if isinstance(value, np.ndarray)))
+
+
+def default_zoo(seed=42):
+    """
+    Logistic regression, decision tree, gradient boosting and the registered LSTM
+
+    Returns:
+        list: Unfitted zoo models
+    """
+    from sklearn.ensemble import GradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.tree import DecisionTreeClassifier
+
+    return [
+        SklearnZooModel("logistic_regression", LogisticRegression(max_iter=1000)),
+        SklearnZooModel("decision_tree", DecisionTreeClassifier(max_depth=5, random_state=seed)),
+        SklearnZooModel("gradient_boosting", GradientBoostingClassifier(n_estimators=100, max_depth=3, random_state=seed)),
+        LSTMZooModel(),
+    ]
+
+
+def _median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def benchmark_zoo(models, feature_set, repeats=50, output_dir=ZOO_DIR):
+    """
+    Train every model on the shared features and compare cost and directional accuracy
+
+    Args:
+        models (list): Zoo models (see `default_zoo`)
+        feature_set (FeatureSet): Shared feature matrix
+        repeats (int): Timed calls for the latency medians
+        output_dir (str): Where fitted models and benchmark.json are written (None = don't save)
+
+    Returns:
+        pd.DataFrame: One row per model, cheapest single prediction first
+    """
+    train_rows, test_rows = feature_set.train_rows, feature_set.test_rows
+    latest = test_rows[-1:]
+    rows = []
+    for model in models:
+        start = time.perf_counter()
+        model.fit(feature_set, train_rows)
+        train_seconds = time.perf_counter() - start
+
+        predictions = model.predict_direction(feature_set, test_rows)
+        single_ms = _median_ms(lambda: model.predict_direction(feature_set, latest), repeats)
+        batch_ms = _median_ms(lambda: model.predict_direction(feature_set, test_rows), max(3, repeats // 10))
+
+        tracemalloc.start()
+        model.predict_direction(feature_set, test_rows)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        rows.append({
+            'model': model.name,
+            'accuracy': float(np.mean(predictions == feature_set.direction[test_rows])),
+            'train_seconds': train_seconds,
+            'latency_ms_single': single_ms,
+            'latency_ms_batch': batch_ms,
+            'batch_size': len(test_rows),
+            'model_kb': model.size_bytes() / 1024,
+            'predict_peak_kb': peak / 1024,
+        })
+        logger.info(f"✅ {model.name}: accuracy {rows[-1]['accuracy']:.3f}, {single_ms:.3f} ms/prediction")
+
+    report = pd.DataFrame(rows).sort_values("latency_ms_single").reset_index(drop=True)
+    if output_dir:
+        output_dir = output_dir if os.path.isabs(output_dir) else os.path.join(project_root, output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+        for model in models:
+            with open(os.path.join(output_dir, f"{model.name}.pkl"), "wb") as f:
+                pickle.dump(model, f)
+        report.to_json(os.path.join(output_dir, "benchmark.json"), orient="records", indent=2)
+    return report
+
+
+def choose_model(report, min_accuracy=ZOO_MIN_ACCURACY):
+    """
+    Cheapest model (single-prediction latency) whose test accuracy meets the bar
+
+    Returns:
+        str: Model name, or None if no model is accurate enough
+    """
+    eligible = report[report['accuracy'] >= min_accuracy].sort_values(["latency_ms_single", "model_kb"])
+    return eligible.iloc[0]['model'] if len(eligible) else None
+
+
+def load_zoo_model(name=None, min_accuracy=ZOO_MIN_ACCURACY, zoo_dir=ZOO_DIR):
+    """
+    Load a fitted zoo model; by default the cheapest one meeting the accuracy bar in the last benchmark
+
+    Returns:
+        SklearnZooModel or LSTMZooModel: Fitted model
+    """
+    zoo_dir = zoo_dir if os.path.isabs(zoo_dir) else os.path.join(project_root, zoo_dir)
+    if name is None:
+        report = pd.read_json(os.path.join(zoo_dir, "benchmark.json"))
+        name = choose_model(report, min_accuracy)
+        if name is None:
+            raise ValueError(f"No zoo model reaches {min_accuracy:.0%} directional accuracy")
+    with open(os.path.join(zoo_dir, f"{name}.pkl"), "rb") as f:
+        return pickle.load(f)
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m models.model_zoo [min_accuracy]
+    min_accuracy = float(sys.argv[1]) if len(sys.argv) > 1 else ZOO_MIN_ACCURACY
+    # Use the package module so pickled models reference models.model_zoo, not __main__
+    from models.model_zoo import FeatureSet, benchmark_zoo, choose_model, default_zoo
+    from utils.feature_store import load_features
+
+    # Same data and features as models/lstm_model.py
+    features = ["Close", "SMA_50", "SMA_200", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"]
+    df = load_features("TSLA", features)
+    feature_set = FeatureSet(df, features, lookback=ModelRegistry().load("lstm_model").seq_length)
+
+    report = benchmark_zoo(default_zoo(), feature_set)
+    up_share = feature_set.direction[feature_set.test_rows].mean()
+    print(f"\n🦓 Model zoo on TSLA daily bars: {len(feature_set.train_rows)} train / {len(feature_set.test_rows)} test "
+          f"decision bars (next close up on {up_share:.1%} of test bars)")
+    print(report.to_string(index=False, float_format=lambda v: f"{v:.4g}"))
+
+    best = choose_model(report, min_accuracy)
+    if best is None:
+        print(f"\n❌ No model reaches {min_accuracy:.0%} directional accuracy")
+    else:
+        print(f"\n✅ Cheapest model with accuracy >= {min_accuracy:.0%}: {best}")
@@ -0,0 +1,545 @@
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Format version stored in exported weight files
+WEIGHTS_FORMAT_VERSION = 1
+
+# Arrays a layer may carry. `symbol_bias` is an optional (n_symbols, 4 * units)
+# table on the first LSTM layer: a symbol embedding folded into the input bias
+WEIGHT_KEYS = ('kernel', 'recurrent_kernel', 'bias', 'symbol_bias')
+
+# Quantized layers store int8 `kernel` / `recurrent_kernel` arrays plus a
+# float32 per-output-column `<key>_scale`; they are dequantized on load
+SCALE_SUFFIX = "_scale"
+STORED_KEYS = WEIGHT_KEYS + tuple(f"{key}{SCALE_SUFFIX}" for key in WEIGHT_KEYS)
+
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def _hard_sigmoid(x):
+    # Keras 3 definition: relu6(x + 3) / 6
+    return np.clip(x / 6.0 + 0.5, 0.0, 1.0)
+
+
+def _relu(x):
+    return np.maximum(x, 0.0)
+
+
+def _linear(x):
+    return x
+
+
+ACTIVATIONS = {
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': _hard_sigmoid,
+    'tanh': np.tanh,
+    'relu': _relu,
+    'linear': _linear,
+    None: _linear,
+}
+
+
+def _activation(name):
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Unsupported activation: {name}")
+    return ACTIVATIONS[name]
+
+
+def _stored(value):
+    # int8 (quantized) weights keep their dtype, everything else is float32
+    return np.ascontiguousarray(value, dtype=np.int8 if value.dtype == np.int8 else np.float32)
+
+
+# ----------------------------------------------------------------------
+# Export (.h5 -> .npz), needs h5py but not TensorFlow
+# ----------------------------------------------------------------------
+def read_h5_weights(h5_path):
+    """
+    Read the layer specs and weights of a saved Keras Sequential LSTM model
+
+    Supports InputLayer, LSTM, Dropout and Dense layers, which covers every
+    model trained in this project.
+
+    Args:
+        h5_path (str): Path to the Keras .h5 model
+
+    Returns:
+        tuple: (input_shape (seq_length, n_features), list of layer dicts)
+    """
+    import h5py
+
+    with h5py.File(h5_path, "r") as f:
+        config = json.loads(f.attrs['model_config'])
+        weights_root = f['model_weights']
+
+        def layer_weights(name):
+            arrays = {}
+            weights_root[name].visititems(
+                lambda path, obj: arrays.__setitem__(path.rsplit("/", 1)[-1], obj[()])
+                if isinstance(obj, h5py.Dataset) else None
+            )
+            return arrays
+
+        input_shape = None
+        layers = []
+        for layer in config['config']['layers']:
+            kind = layer['class_name']
+            cfg = layer['config']
+            if input_shape is None:
+                shape = cfg.get('batch_shape') or cfg.get('batch_input_shape')
+                if shape:
+                    input_shape = tuple(shape[1:])
+
+            if kind in ("InputLayer", "Dropout"):
+                continue  # Dropout is the identity at inference time
+            if kind == "LSTM":
+                arrays = layer_weights(cfg['name'])
+                layers.append({
+                    'type': 'lstm',
+                    'units': cfg['units'],
+                    'activation': cfg.get('activation', 'tanh'),
+                    'recurrent_activation': cfg.get('recurrent_activation', 'sigmoid'),
+                    'return_sequences': cfg.get('return_sequences', False),
+                    'kernel': arrays['kernel'],
+                    'recurrent_kernel': arrays['recurrent_kernel'],
+                    'bias': arrays.get('bias', np.zeros(4 * cfg['units'], dtype=np.float32)),
+                })
+            elif kind == "Dense":
+                arrays = layer_weights(cfg['name'])
+                layers.append({
+                    'type': 'dense',
+                    'units': cfg['units'],
+                    'activation': cfg.get('activation', 'linear'),
+                    'kernel': arrays['kernel'],
+                    'bias': arrays.get('bias', np.zeros(cfg['units'], dtype=np.float32)),
+                })
+            else:
+                raise ValueError(f"Unsupported layer type for NumPy runtime: {kind}")
+
+    if input_shape is None:
+        input_shape = (None, layers[0]['kernel'].shape[0])
+    return input_shape, layers
+
+
+def read_keras_model(model):
+    """
+    Read the layer specs and weights of an in-memory Keras Sequential LSTM model
+
+    Args:
+        model: Trained tf.keras Sequential model (InputLayer/LSTM/Dropout/Dense)
+
+    Returns:
+        tuple: (input_shape (seq_length, n_features), list of layer dicts)
+    """
+    layers = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        config = layer.get_config()
+        if kind in ("InputLayer", "Dropout"):
+            continue
+        weights = [np.asarray(w, dtype=np.float32) for w in layer.get_weights()]
+        if kind == "LSTM":
+            layers.append({
+                'type': 'lstm',
+                'units': config['units'],
+                'activation': config['activation'],
+                'recurrent_activation': config['recurrent_activation'],
+                'return_sequences': config['return_sequences'],
+                'kernel': weights[0],
+                'recurrent_kernel': weights[1],
+                'bias': weights[2] if len(weights) > 2 else np.zeros(4 * config['units'], dtype=np.float32),
+            })
+        elif kind == "Dense":
+            layers.append({
+                'type': 'dense',
+                'units': config['units'],
+                'activation': config['activation'],
+                'kernel': weights[0],
+                'bias': weights[1] if len(weights) > 1 else np.zeros(config['units'], dtype=np.float32),
+            })
+        else:
+            raise ValueError(f"Unsupported layer type for NumPy runtime: {kind}")
+    return tuple(model.input_shape[1:]), layers
+
+
+def save_weights(path, input_shape, layers):
+    """
+    Save layer specs and weights as one compact .npz file
+
+    Args:
+        path (str): Output .npz path
+        input_shape (tuple): (seq_length, n_features)
+        layers (list): Layer dicts as returned by `read_h5_weights`
+    """
+    arrays = {}
+    specs = []
+    for i, layer in enumerate(layers):
+        spec = {k: v for k, v in layer.items() if not isinstance(v, np.ndarray)}
+        for key, value in layer.items():
+            if isinstance(value, np.ndarray):
+                arrays[f"{i}/{key}"] = _stored(value)
+        specs.append(spec)
+
+    meta = {'format_version': WEIGHTS_FORMAT_VERSION, 'input_shape': list(input_shape), 'layers': specs}
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez(path, __meta__=np.array(json.dumps(meta)), **arrays)
+
+
+def save_weights_dir(directory, input_shape, layers):
+    """
+    Save layer specs and weights as a directory of .npy files (memory-mappable)
+
+    Args:
+        directory (str): Output directory (weights.json plus one .npy per array)
+        input_shape (tuple): (seq_length, n_features)
+        layers (list): Layer dicts as returned by `read_h5_weights`
+    """
+    os.makedirs(directory, exist_ok=True)
+    specs = []
+    for i, layer in enumerate(layers):
+        specs.append({k: v for k, v in layer.items() if not isinstance(v, np.ndarray)})
+        for key, value in layer.items():
+            if isinstance(value, np.ndarray):
+                np.save(os.path.join(directory, f"{i}_{key}.npy"), _stored(value))
+
+    meta = {'format_version': WEIGHTS_FORMAT_VERSION, 'input_shape': list(input_shape), 'layers': specs}
+    with open(os.path.join(directory, "weights.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_weights_dir(directory, mmap=True):
+    """
+    Load layer specs and weights saved by `save_weights_dir`
+
+    Args:
+        directory (str): Weight directory
+        mmap (bool): Memory-map the arrays instead of reading them into RAM
+
+    Returns:
+        tuple: (input_shape, list of layer dicts)
+    """
+    with open(os.path.join(directory, "weights.json")) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != WEIGHTS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported weight file version in {directory}: {meta.get('format_version')}")
+
+    layers = []
+    for i, spec in enumerate(meta['layers']):
+        layer = dict(spec)
+        for key in STORED_KEYS:
+            path = os.path.join(directory, f"{i}_{key}.npy")
+            if os.path.exists(path):
+                layer[key] = np.load(path, mmap_mode="r" if mmap else None)
+        layers.append(layer)
+    return tuple(meta['input_shape']), layers
+
+
+def export_h5_model(h5_path, output_path=None):
+    """
+    Export a Keras .h5 LSTM model to a .npz weight file for the NumPy runtime
+
+    Args:
+        h5_path (str): Path to the Keras .h5 model
+        output_path (str): Output path (default: same name with .npz)
+
+    Returns:
+        str: Path of the written weight file
+    """
+    if output_path is None:
+        output_path = os.path.splitext(h5_path)[0] + ".npz"
+    input_shape, layers = read_h5_weights(h5_path)
+    save_weights(output_path, input_shape, layers)
+    logger.info(f"✅ Exported {h5_path} -> {output_path} ({os.path.getsize(output_path) / 1024:.0f} KB)")
+    return output_path
+
+
+def load_weights(path):
+    """
+    Load layer specs and weights from a .npz file written by `save_weights`
+
+    Returns:
+        tuple: (input_shape, list of layer dicts)
+    """
+    with np.load(path) as data:
+        meta = json.loads(str(data['__meta__']))
+        if meta.get('format_version') != WEIGHTS_FORMAT_VERSION:
+            raise ValueError(f"Unsupported weight file version in {path}: {meta.get('format_version')}")
+        layers = []
+        for i, spec in enumerate(meta['layers']):
+            layer = dict(spec)
+            prefix = f"{i}/"
+            for key in data.files:
+                if key.startswith(prefix):
+                    layer[key[len(prefix):]] = data[key]
+            layers.append(layer)
+    return tuple(meta['input_shape']), layers
+
+
+# ----------------------------------------------------------------------
+# Runtime
+# ----------------------------------------------------------------------
+class NumpyLSTMModel:
+    """
+    Pure-NumPy forward pass for the project's Sequential LSTM models
+
+    Mirrors Keras' LSTM cell (gate order i, f, c, o) in float32 and exposes
+    the `input_shape` / `predict_on_batch` / `predict` subset of the Keras
+    model API used by the inference service and scripts.
+    """
+
+    def __init__(self, input_shape, layers):
+        """
+        Args:
+            input_shape (tuple): (seq_length, n_features)
+            layers (list): Layer dicts (see `read_h5_weights`)
+        """
+        self.input_shape = (None,) + tuple(input_shape)
+        self.layers = []
+        for layer in layers:
+            layer = dict(layer)
+            for key in WEIGHT_KEYS:
+                if key in layer:
+                    # Quantized weights are expanded once here; matmuls accumulate in float32
+                    scale = layer.pop(f"{key}{SCALE_SUFFIX}", None)
+                    weights = np.asarray(layer[key], dtype=np.float32)
+                    layer[key] = np.ascontiguousarray(weights * scale if scale is not None else weights, dtype=np.float32)
+            layer['activation_fn'] = _activation(layer.get('activation'))
+            if layer['type'] == 'lstm':
+                layer['recurrent_activation_fn'] = _activation(layer.get('recurrent_activation'))
+            self.layers.append(layer)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load from an exported .npz file, a weight directory (memory-mapped),
+        or straight from a Keras .h5 file (needs h5py)
+
+        Args:
+            path (str): Weight file or directory path
+
+        Returns:
+            NumpyLSTMModel: Ready-to-run model
+        """
+        if os.path.isdir(path):
+            return cls(*load_weights_dir(path))
+        if path.endswith(".npz"):
+            return cls(*load_weights(path))
+        return cls(*read_h5_weights(path))
+
+    @property
+    def lstm_units(self):
+        """
+        Returns:
+            list: Units of each LSTM layer (the shape of the recurrent state)
+        """
+        return [layer['units'] for layer in self.layers if layer['type'] == 'lstm']
+
+    def initial_state(self, batch):
+        """
+        Zero (h, c) state for every LSTM layer
+
+        Returns:
+            list: One (h, c) tuple of (batch, units) float32 arrays per LSTM layer
+        """
+        return [(np.zeros((batch, units), dtype=np.float32), np.zeros((batch, units), dtype=np.float32))
+                for units in self.lstm_units]
+
+    @property
+    def n_symbols(self):
+        """
+        Returns:
+            int: Symbols known to a multi-symbol model (0 for single-symbol models)
+        """
+        first = self.layers[0]
+        return len(first['symbol_bias']) if 'symbol_bias' in first else 0
+
+    @staticmethod
+    def _lstm(layer, x, h=None, c=None, symbol_ids=None):
+        batch, steps, _ = x.shape
+        units = layer['units']
+        activation = layer['activation_fn']
+        recurrent_activation = layer['recurrent_activation_fn']
+        recurrent_kernel = layer['recurrent_kernel']
+
+        # Input projections for every timestep in one matmul
+        if 'symbol_bias' in layer:
+            if symbol_ids is None:
+                raise ValueError("This model needs symbol_ids (it was trained with a symbol embedding)")
+            bias = layer['symbol_bias'][np.asarray(symbol_ids)][:, np.newaxis, :]
+        else:
+            bias = layer['bias']
+        projected = x @ layer['kernel'] + bias
+        if h is None:
+            h = np.zeros((batch, units), dtype=np.float32)
+            c = np.zeros((batch, units), dtype=np.float32)
+        outputs = np.empty((batch, steps, units), dtype=np.float32) if layer['return_sequences'] else None
+
+        for t in range(steps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            if outputs is not None:
+                outputs[:, t] = h
+        return (outputs if outputs is not None else h), (h, c)
+
+    def run(self, x, state=None, symbol_ids=None):
+        """
+        Forward pass that starts from, and returns, the recurrent state
+
+        Args:
+            x (np.ndarray): (batch, steps, n_features) inputs
+            state (list): (h, c) per LSTM layer (default: zeros, as in `predict_on_batch`)
+            symbol_ids (np.ndarray): (batch,) symbol ids for multi-symbol models
+
+        Returns:
+            tuple: ((batch, outputs) predictions after the last step, new state)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        new_state = []
+        lstm_index = 0
+        for layer in self.layers:
+            if layer['type'] == 'lstm':
+                h, c = state[lstm_index] if state is not None else (None, None)
+                x, layer_state = self._lstm(layer, x, h, c, symbol_ids if lstm_index == 0 else None)
+                new_state.append(layer_state)
+                lstm_index += 1
+            else:
+                x = layer['activation_fn'](x @ layer['kernel'] + layer['bias'])
+        return x, new_state
+
+    def step(self, x_t, state, symbol_ids=None):
+        """
+        Advance the recurrent state by one bar
+
+        Args:
+            x_t (np.ndarray): (batch, n_features) inputs for the new bar
+            state (list): (h, c) per LSTM layer
+            symbol_ids (np.ndarray): (batch,) symbol ids for multi-symbol models
+
+        Returns:
+            tuple: ((batch, outputs) predictions, new state)
+        """
+        return self.run(np.asarray(x_t, dtype=np.float32)[:, np.newaxis, :], state, symbol_ids)
+
+    def predict_on_batch(self, x, symbol_ids=None):
+        """
+        Run the forward pass
+
+        Args:
+            x (np.ndarray): (batch, seq_length, n_features) inputs
+            symbol_ids (np.ndarray): (batch,) symbol ids for multi-symbol models
+
+        Returns:
+            np.ndarray: (batch, units of the last layer) float32 outputs
+        """
+        return self.run(x, symbol_ids=symbol_ids)[0]
+
+    def predict(self, x, batch_size=1024, verbose=0, symbol_ids=None):
+        """
+        Keras-style `predict` (runs in chunks of `batch_size`)
+        """
+        x = np.asarray(x, dtype=np.float32)
+        if len(x) <= batch_size:
+            return self.predict_on_batch(x, symbol_ids)
+        return np.concatenate([
+            self.predict_on_batch(x[i:i + batch_size], None if symbol_ids is None else symbol_ids[i:i + batch_size])
+            for i in range(0, len(x), batch_size)
+        ])
+
+
+def measure_latency(model, batch_sizes=(1, 50), repeats=30, seed=0):
+    """
+    Median `predict_on_batch` latency on random inputs (one warm-up call per batch size)
+
+    Returns:
+        dict: Batch size -> milliseconds per call
+    """
+    rng = np.random.default_rng(seed)
+    latency = {}
+    for batch in batch_sizes:
+        X = rng.random((batch,) + tuple(model.input_shape[1:]), dtype=np.float32)
+        model.predict_on_batch(X)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict_on_batch(X)
+            timings.append(time.perf_counter() - start)
+        latency[batch] = float(np.median(timings) * 1000)
+    return latency
+
+
+if __name__ == "__main__":
+    # Run from the project root:
+    #   python -m models.numpy_lstm export models/lstm_model.h5 [output.npz]
+    #   python -m models.numpy_lstm bench [models/lstm_trained_model.h5]
+    import subprocess
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "bench"
+    if command == "export":
+        export_h5_model(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        sys.exit(0)
+
+    h5_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(project_root, "models", "lstm_trained_model.h5")
+    npz_path = export_h5_model(h5_path, os.path.join(project_root, "models", "_bench_weights.npz"))
+
+    # Cold start (import + load + first prediction) in a fresh interpreter for each runtime
+    cold_start = {
+        'numpy': (
+            "from models.numpy_lstm import NumpyLSTMModel; import numpy as np; "
+            f"m = NumpyLSTMModel.load({npz_path!r}); m.predict_on_batch(np.zeros((1,) + m.input_shape[1:]))"
+        ),
+        'keras': (
+            "import tensorflow as tf; import numpy as np; "
+            f"m = tf.keras.models.load_model({h5_path!r}, compile=False); m.predict_on_batch(np.zeros((1,) + m.input_shape[1:]))"
+        ),
+    }
+    cold_ms = {}
+    for name, code in cold_start.items():
+        wrapped = f"import time; t = time.perf_counter(); {code}; print((time.perf_counter() - t) * 1000)"
+        result = subprocess.run([sys.executable, "-c", wrapped], cwd=project_root, capture_output=True, text=True)
+        cold_ms[name] = float(result.stdout.strip().splitlines()[-1]) if result.returncode == 0 else float("nan")
+
+    import tensorflow as tf
+
+    numpy_model = NumpyLSTMModel.load(npz_path)
+    keras_model = tf.keras.models.load_model(h5_path, compile=False)
+    os.remove(npz_path)
+
+    rng = np.random.default_rng(0)
+    seq_length, n_features = numpy_model.input_shape[1:]
+    print(f"📦 Model {os.path.basename(h5_path)}: input ({seq_length}, {n_features})")
+    print(f"🚀 Cold start (import + load + first prediction): NumPy {cold_ms['numpy']:.0f} ms, Keras {cold_ms['keras']:.0f} ms")
+
+    for batch in (1, 8, 64):
+        X = rng.random((batch, seq_length, n_features), dtype=np.float32)
+        keras_model.predict_on_batch(X)
+        diff = np.abs(numpy_model.predict_on_batch(X) - np.asarray(keras_model.predict_on_batch(X))).max()
+
+        timings = {}
+        for name, fn in (('numpy', numpy_model.predict_on_batch), ('keras', keras_model.predict_on_batch)):
+            repeats = 20
+            start = time.perf_counter()
+            for _ in range(repeats):
+                fn(X)
+            timings[name] = (time.perf_counter() - start) / repeats * 1000
+        print(f"📈 batch {batch:>3}: NumPy {timings['numpy']:.2f} ms, Keras {timings['keras']:.2f} ms, max |diff| {diff:.2e}")
@@ -0,0 +1,498 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.config import MODEL_REFRESH_SECONDS, MODEL_REGISTRY_DIR
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+WEIGHTS_DIR = "weights"
+LATEST_FILE = "LATEST"
+
+
+def hash_training_data(data, features=None):
+    """
+    Stable hash of the training data (feature names, shape and values)
+
+    Args:
+        data: DataFrame or array the model was trained on, or a dict symbol -> DataFrame
+        features (list): Columns to hash when `data` is a DataFrame
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(list(features or [])).encode("utf-8"))
+    parts = sorted(data.items()) if isinstance(data, dict) else [(None, data)]
+    for symbol, frame in parts:
+        if features is not None and hasattr(frame, "columns"):
+            frame = frame[features]
+        values = np.ascontiguousarray(np.asarray(frame, dtype=np.float64))
+        if symbol is not None:
+            digest.update(str(symbol).encode("utf-8"))
+        digest.update(str(values.shape).encode("utf-8"))
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+
+class FittedScaler:
+    """
+    Min-max scaler restored from training (no re-fitting at inference time)
+
+    Matches sklearn's MinMaxScaler with feature_range=(0, 1), including
+    constant columns (range 0 is treated as 1).
+    """
+
+    def __init__(self, data_min, data_max):
+        self.data_min = np.asarray(data_min, dtype=np.float64)
+        self.data_max = np.asarray(data_max, dtype=np.float64)
+        data_range = self.data_max - self.data_min
+        self.data_range = np.where(data_range == 0, 1.0, data_range)
+
+    @classmethod
+    def from_sklearn(cls, scaler):
+        return cls(scaler.data_min_, scaler.data_max_)
+
+    @classmethod
+    def fit(cls, values):
+        values = np.asarray(values, dtype=np.float64)
+        return cls(np.nanmin(values, axis=0), np.nanmax(values, axis=0))
+
+    def transform(self, values):
+        return (np.asarray(values, dtype=np.float64) - self.data_min) / self.data_range
+
+    def inverse_transform_column(self, values, column=0):
+        """
+        Map scaled predictions of one feature (the target) back to its units
+        """
+        return np.asarray(values, dtype=np.float64) * self.data_range[column] + self.data_min[column]
+
+    def to_dict(self):
+        return {'type': 'minmax', 'data_min': self.data_min.tolist(), 'data_max': self.data_max.tolist()}
+
+    @classmethod
+    def from_dict(cls, params):
+        return cls(params['data_min'], params['data_max'])
+
+
+class ModelArtifact:
+    """
+    One registered model version: weights, fitted scaler and feature schema
+
+    The manifest is read eagerly; the weights are memory-mapped and the
+    inference service is created only when first used.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Version directory inside the registry
+        """
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            self.manifest = json.load(f)
+        self.name = self.manifest['name']
+        self.version = self.manifest['version']
+        self.features = self.manifest['features']
+        self.target = self.manifest.get('target', self.features[0])
+        self.seq_length = self.manifest['seq_length']
+        self.scaler = FittedScaler.from_dict(self.manifest['scaler']) if self.manifest.get('scaler') else None
+        # Multi-symbol models: per-symbol scalers, symbol id = position in `symbols`
+        self.symbols = self.manifest.get('symbols') or []
+        self.symbol_scalers = {
+            symbol: FittedScaler.from_dict(params)
+            for symbol, params in (self.manifest.get('symbol_scalers') or {}).items()
+        }
+        self._model = None
+        self._service = None
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"ModelArtifact({self.name}@{self.version})"
+
+    @property
+    def model(self):
+        """
+        NumPy LSTM runtime over memory-mapped weights (loaded on first use)
+        """
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from models.numpy_lstm import NumpyLSTMModel
+
+                    start = time.perf_counter()
+                    self._model = NumpyLSTMModel.load(os.path.join(self.path, WEIGHTS_DIR))
+                    logger.info(f"✅ Loaded {self.name}@{self.version} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return self._model
+
+    @property
+    def service(self):
+        """
+        Batched inference service wrapping this version's model
+        """
+        if self._service is None:
+            from models.inference_service import LSTMInferenceService
+
+            model = self.model
+            with self._lock:
+                if self._service is None:
+                    self._service = LSTMInferenceService(self.path, model=model)
+        return self._service
+
+    def scaler_for(self, symbol=None):
+        """
+        Training scaler for a symbol (per-symbol for multi-symbol models)
+        """
+        if self.symbol_scalers:
+            if symbol not in self.symbol_scalers:
+                raise KeyError(f"{self.name}@{self.version} was not trained on {symbol}")
+            return self.symbol_scalers[symbol]
+        return self.scaler
+
+    def prepare_window(self, df, symbol=None):
+        """
+        Scale the last `seq_length` rows of a DataFrame with the training scaler
+
+        Args:
+            df (pd.DataFrame): Data containing every feature column
+            symbol (str): Symbol the data belongs to (needed by multi-symbol models)
+
+        Returns:
+            np.ndarray: (seq_length, n_features) float32 window
+        """
+        missing = [f for f in self.features if f not in df.columns]
+        if missing:
+            raise KeyError(f"{self.name}@{self.version} needs features {missing}")
+        if len(df) < self.seq_length:
+            raise ValueError(f"{self.name}@{self.version} needs {self.seq_length} rows, got {len(df)}")
+        values = df[self.features].to_numpy(dtype=np.float64)[-self.seq_length:]
+        return self.scaler_for(symbol).transform(values).astype(np.float32)
+
+    def predict_prices(self, frames):
+        """
+        Predict the next target value (e.g. close) for many symbols in one batched pass
+
+        Args:
+            frames (dict): Symbol -> DataFrame with this model's feature columns
+
+        Returns:
+            dict: Symbol -> predicted value in original units
+        """
+        windows = {symbol: self.prepare_window(df, symbol) for symbol, df in frames.items()}
+        if self.symbols:
+            symbols = list(windows)
+            symbol_ids = np.array([self.symbols.index(symbol) for symbol in symbols])
+            output = self.model.predict_on_batch(np.stack([windows[s] for s in symbols]), symbol_ids)
+            scaled = dict(zip(symbols, output[:, 0].tolist()))
+        else:
+            scaled = self.service.predict_many(windows)
+        target_column = self.features.index(self.target)
+        return {
+            symbol: float(self.scaler_for(symbol).inverse_transform_column(value, target_column))
+            for symbol, value in scaled.items()
+        }
+
+
+class ModelRegistry:
+    """
+    Versioned model artifact registry
+
+    Layout:
+        <root>/<name>/LATEST                      current version id
+        <root>/<name>/<version>/manifest.json     features, seq_length, scaler, data hash, metrics
+        <root>/<name>/<version>/weights/          one .npy per weight array (memory-mapped)
+        <root>/<name>/<version>/model.h5          original Keras model (optional)
+    """
+
+    def __init__(self, root=MODEL_REGISTRY_DIR):
+        """
+        Args:
+            root (str): Registry directory (relative paths are resolved from the project root)
+        """
+        self.root = root if os.path.isabs(root) else os.path.join(project_root, root)
+
+    def _model_dir(self, name):
+        return os.path.join(self.root, name)
+
+    def register(self, name, model, features, seq_length, scaler, data=None, target=None,
+                 metrics=None, source=None, set_latest=True, keep_h5=False, symbol_scalers=None):
+        """
+        Store a trained model as a new version
+
+        Args:
+            name (str): Model name (e.g. "lstm_model")
+            model: Path to a Keras .h5 file, or a (input_shape, layers) tuple from models.numpy_lstm
+            features (list): Feature columns in model input order
+            seq_length (int): Window length
+            scaler: Fitted sklearn MinMaxScaler or FittedScaler (None with `symbol_scalers`)
+            data: Training data (hashed into the manifest)
+            target (str): Predicted feature (default: first feature)
+            metrics (dict): Training/validation metrics to record
+            source (str): Where the training data came from
+            set_latest (bool): Point LATEST at the new version
+            keep_h5 (bool): Also copy the original Keras .h5 into the version directory
+            symbol_scalers (dict): Symbol -> scaler for multi-symbol models (ordered by symbol id)
+
+        Returns:
+            ModelArtifact: The registered version
+        """
+        from models.numpy_lstm import read_h5_weights, save_weights_dir
+
+        if scaler is not None and not isinstance(scaler, FittedScaler):
+            scaler = FittedScaler.from_sklearn(scaler)
+        symbol_scalers = {
+            symbol: s if isinstance(s, FittedScaler) else FittedScaler.from_sklearn(s)
+            for symbol, s in (symbol_scalers or {}).items()
+        }
+        if scaler is None and not symbol_scalers:
+            raise ValueError("A scaler (or per-symbol scalers) is required")
+        data_hash = hash_training_data(data, features) if data is not None else None
+        created_at = datetime.now()
+        version = created_at.strftime("%Y%m%d-%H%M%S") + (f"-{data_hash[:8]}" if data_hash else "")
+
+        model_dir = self._model_dir(name)
+        final_dir = os.path.join(model_dir, version)
+        if os.path.exists(final_dir):
+            raise FileExistsError(f"Version already registered: {name}@{version}")
+        tmp_dir = os.path.join(model_dir, f".{version}.tmp")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        if isinstance(model, str):
+            input_shape, layers = read_h5_weights(model)
+            if keep_h5:
+                shutil.copy2(model, os.path.join(tmp_dir, "model.h5"))
+        else:
+            input_shape, layers = model
+        save_weights_dir(os.path.join(tmp_dir, WEIGHTS_DIR), input_shape, layers)
+
+        if tuple(input_shape) != (seq_length, len(features)):
+            shutil.rmtree(tmp_dir)
+            raise ValueError(f"Model input {tuple(input_shape)} does not match seq_length={seq_length}, "
+                             f"{len(features)} features")
+
+        manifest = {
+            'name': name,
+            'version': version,
+            'created_at': created_at.isoformat(),
+            'features': list(features),
+            'target': target or features[0],
+            'seq_length': seq_length,
+            'scaler': scaler.to_dict() if scaler is not None else None,
+            'symbols': list(symbol_scalers),
+            'symbol_scalers': {symbol: s.to_dict() for symbol, s in symbol_scalers.items()},
+            'data_hash': data_hash,
+            'data_rows': (int(sum(len(frame) for frame in data.values())) if isinstance(data, dict)
+                          else int(len(data)) if data is not None else None),
+            'source': source,
+            'metrics': metrics or {},
+        }
+        with open(os.path.join(tmp_dir, MANIFEST_FILE), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Rename into place so readers never see a half-written version
+        os.replace(tmp_dir, final_dir)
+        if set_latest:
+            self.set_latest(name, version)
+        logger.info(f"✅ Registered {name}@{version}")
+        return ModelArtifact(final_dir)
+
+    def list_versions(self, name):
+        """
+        Returns:
+            list: Version ids, oldest first
+        """
+        model_dir = self._model_dir(name)
+        if not os.path.isdir(model_dir):
+            return []
+        return sorted(
+            entry for entry in os.listdir(model_dir)
+            if os.path.exists(os.path.join(model_dir, entry, MANIFEST_FILE))
+        )
+
+    def latest_version(self, name):
+        """
+        Returns:
+            str: Version LATEST points at (or the newest version, or None)
+        """
+        try:
+            with open(os.path.join(self._model_dir(name), LATEST_FILE)) as f:
+                version = f.read().strip()
+            if version:
+                return version
+        except FileNotFoundError:
+            pass
+        versions = self.list_versions(name)
+        return versions[-1] if versions else None
+
+    def set_latest(self, name, version):
+        """
+        Promote (or roll back to) a version; running ModelHandles pick it up on refresh
+        """
+        if version not in self.list_versions(name):
+            raise KeyError(f"Unknown version: {name}@{version}")
+        path = os.path.join(self._model_dir(name), LATEST_FILE)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(version + "\n")
+        os.replace(tmp_path, path)
+
+    def load(self, name, version=None):
+        """
+        Open a version (default: LATEST); weights are mapped lazily
+
+        Returns:
+            ModelArtifact: Registered model version
+        """
+        version = version or self.latest_version(name)
+        if version is None:
+            raise FileNotFoundError(
+                f"No versions of '{name}' in {self.root}. Register one with: "
+                f"python -m models.registry register {name} <model.h5> <data.csv> <feature> ..."
+            )
+        return ModelArtifact(os.path.join(self._model_dir(name), version))
+
+    def handle(self, name, version=None):
+        """
+        Returns:
+            ModelHandle: Hot-swappable handle following LATEST (or pinned to `version`)
+        """
+        return ModelHandle(self, name, version)
+
+
+class ModelHandle:
+    """
+    Hot-swappable reference to the current version of a model
+
+    `refresh()` (or the optional watcher thread) re-reads LATEST and, if it
+    changed, loads the new version before swapping it in, so a live process
+    switches models between predictions without restarting. In-flight calls
+    finish on the artifact they started with.
+    """
+
+    def __init__(self, registry, name, version=None):
+        """
+        Args:
+            registry (ModelRegistry): Registry to read from
+            name (str): Model name
+            version (str): Pin to this version instead of following LATEST
+        """
+        self.registry = registry
+        self.name = name
+        self.pinned = version
+        self._artifact = registry.load(name, version)
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._stop_event = threading.Event()
+
+    @property
+    def current(self):
+        return self._artifact
+
+    def refresh(self):
+        """
+        Swap in the LATEST version if it changed
+
+        Returns:
+            bool: True if a new version was swapped in
+        """
+        if self.pinned is not None:
+            return False
+        version = self.registry.latest_version(self.name)
+        if version is None or version == self._artifact.version:
+            return False
+        with self._lock:
+            if version == self._artifact.version:
+                return False
+            artifact = self.registry.load(self.name, version)
+            artifact.model  # Map weights before the swap so the next prediction is not delayed
+            previous, self._artifact = self._artifact, artifact
+        logger.info(f"🔄 Hot-swapped {self.name}: {previous.version} -> {version}")
+        return True
+
+    def predict_prices(self, frames):
+        return self._artifact.predict_prices(frames)
+
+    def start_watching(self, interval=MODEL_REFRESH_SECONDS):
+        """
+        Poll LATEST from a background thread every `interval` seconds
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return self
+        self._stop_event.clear()
+
+        def watch():
+            while not self._stop_event.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"❌ Model refresh failed for {self.name}: {e}")
+
+        self._watcher = threading.Thread(target=watch, name=f"model-watch-{self.name}", daemon=True)
+        self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._watcher is not None:
+            self._watcher.join()
+
+
+if __name__ == "__main__":
+    # Run from the project root:
+    #   python -m models.registry register <name> <model.h5> <data.csv | feature_store:<symbol>> <feature> [<feature> ...]
+    #   python -m models.registry list <name>
+    #   python -m models.registry promote <name> <version>
+    import pandas as pd
+
+    registry = ModelRegistry()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+
+    if command == "register":
+        name, model_path, data_path, features = sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5:]
+        if data_path.startswith("feature_store:"):
+            from utils.feature_store import load_features
+
+            source = data_path
+            data = load_features(data_path.split(":", 1)[1], features)
+        else:
+            source = os.path.relpath(os.path.abspath(data_path), project_root)
+            data = pd.read_csv(data_path)[features]  # NaN warm-up rows are ignored per column, as MinMaxScaler does
+        from models.numpy_lstm import read_h5_weights
+
+        seq_length = read_h5_weights(model_path)[0][0]
+        artifact = registry.register(
+            name, model_path, features, seq_length, FittedScaler.fit(data.values),
+            data=data, source=source
+        )
+        print(f"✅ Registered {artifact}")
+    elif command == "list":
+        names = sys.argv[2:]
+        if not names and os.path.isdir(registry.root):
+            names = sorted(os.listdir(registry.root))
+        for name in names:
+            latest = registry.latest_version(name)
+            for version in registry.list_versions(name):
+                print(f"📦 {name}@{version}{'  <- LATEST' if version == latest else ''}")
+    elif command == "promote":
+        registry.set_latest(sys.argv[2], sys.argv[3])
+        print(f"✅ {sys.argv[2]} LATEST -> {sys.argv[3]}")
+    else:
+        print(f"❌ Unknown command: {command}")
+        sys.exit(1)
@@ -0,0 +1,271 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.numpy_lstm import NumpyLSTMModel
+from utils.metrics import METRICS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class StreamingLSTMPredictor:
+    """
+    Incremental LSTM inference that carries the hidden/cell state across bars
+
+    The windowed model re-runs all `seq_length` timesteps for every prediction,
+    although consecutive windows share all but one bar. Here each symbol keeps
+    its recurrent state and every new bar costs one LSTM step.
+
+    Re-anchoring keeps several states per symbol:
+    - primary: the state predictions are read from
+    - shadows: each starts from zeros `seq_length` bars before an anchor bar
+      (every `reanchor_every` bars, default `seq_length`), so on that bar it
+      has seen exactly the full window and equals the full-window state
+    All states advance together in one batched step. On an anchor bar the
+    shadow replaces the primary, so predictions are exact there, and in
+    between the primary has seen at most `seq_length + reanchor_every` bars,
+    which bounds the drift. Shadows overlap when `reanchor_every <
+    seq_length`; each bar costs 1 + ceil(seq_length / reanchor_every) steps
+    instead of `seq_length`.
+
+    Inputs must be scaled consistently from bar to bar (fit the scaler once,
+    e.g. when priming, rather than re-fitting it on every bar).
+    """
+
+    def __init__(self, model, reanchor_every=None):
+        """
+        Args:
+            model (NumpyLSTMModel): Loaded model
+            reanchor_every (int): Bars between re-anchors (default: the model's sequence length)
+        """
+        self.model = model
+        self.seq_length, self.n_features = model.input_shape[1:]
+        self.reanchor_every = reanchor_every or self.seq_length
+        if self.reanchor_every < 1:
+            raise ValueError(f"reanchor_every must be at least 1, got {reanchor_every}")
+        self.units = model.lstm_units
+        # Shadows alive at once: each lives `seq_length` bars, one starts every `reanchor_every` bars
+        self.n_shadows = -(-self.seq_length // self.reanchor_every)
+
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._capacity = 0
+        rows = 1 + self.n_shadows
+        self._h = [np.zeros((0, rows, units), dtype=np.float32) for units in self.units]
+        self._c = [np.zeros((0, rows, units), dtype=np.float32) for units in self.units]
+        self._bars = np.zeros(0, dtype=np.int64)  # Bars streamed since priming
+
+    @classmethod
+    def load(cls, path, reanchor_every=None):
+        """
+        Build a predictor from an exported .npz weight file (or a Keras .h5 file)
+        """
+        return cls(NumpyLSTMModel.load(path), reanchor_every)
+
+    @property
+    def symbols(self):
+        return list(self._slots)
+
+    def _slot(self, symbol):
+        slot = self._slots.get(symbol)
+        if slot is not None:
+            return slot
+        slot = len(self._slots)
+        if slot >= self._capacity:
+            self._capacity = max(8, self._capacity * 2)
+            self._h = [np.resize(h, (self._capacity,) + h.shape[1:]) for h in self._h]
+            self._c = [np.resize(c, (self._capacity,) + c.shape[1:]) for c in self._c]
+            self._bars = np.resize(self._bars, self._capacity)
+        self._slots[symbol] = slot
+        return slot
+
+    def prime(self, windows):
+        """
+        Start (or restart) streaming from full windows, one batched forward pass
+
+        Args:
+            windows (dict): Symbol -> (seq_length, n_features) scaled window ending at the latest bar
+
+        Returns:
+            dict: Symbol -> exact full-window prediction for the latest bar
+        """
+        if not windows:
+            return {}
+        symbols = list(windows)
+        batch = np.asarray([windows[s] for s in symbols], dtype=np.float32)
+        with METRICS.timer("lstm_stream_prime"):
+            output, state = self.model.run(batch)
+            # Shadows of anchors closer than `seq_length` bars started inside the window:
+            # anchor bar a has consumed the window's bars from position a on
+            suffixes = {}
+            for anchor in range(self.reanchor_every, self.seq_length, self.reanchor_every):
+                suffixes[self._shadow_row(anchor)] = self.model.run(batch[:, anchor:])[1]
+
+        with self._lock:
+            slots = np.array([self._slot(s) for s in symbols])
+            for layer, (h, c) in enumerate(state):
+                self._h[layer][slots, 0] = h
+                self._c[layer][slots, 0] = c
+                self._h[layer][slots, 1:] = 0.0
+                self._c[layer][slots, 1:] = 0.0
+            for row, suffix_state in suffixes.items():
+                for layer, (h, c) in enumerate(suffix_state):
+                    self._h[layer][slots, row] = h
+                    self._c[layer][slots, row] = c
+            self._bars[slots] = 0
+        return dict(zip(symbols, output[:, 0].tolist()))
+
+    def update(self, bars):
+        """
+        Advance every given symbol by one bar in a single batched step
+
+        Args:
+            bars (dict): Symbol -> (n_features,) scaled feature row of the new bar
+
+        Returns:
+            dict: Symbol -> prediction for the next bar
+        """
+        if not bars:
+            return {}
+        symbols = list(bars)
+        missing = [s for s in symbols if s not in self._slots]
+        if missing:
+            raise KeyError(f"Symbols must be primed before streaming: {missing}")
+
+        x = np.asarray([bars[s] for s in symbols], dtype=np.float32)
+        rows = 1 + self.n_shadows
+        with self._lock:
+            slots = np.array([self._slots[s] for s in symbols])
+            k = len(slots)
+            bar = self._bars[slots] + 1
+
+            # The shadow of the anchor `seq_length - 1` bars ahead starts from zeros on this bar
+            starting = (bar + self.seq_length - 1) % self.reanchor_every == 0
+            if starting.any():
+                started = self._shadow_row(bar[starting] + self.seq_length - 1)
+                for layer in range(len(self.units)):
+                    self._h[layer][slots[starting], started] = 0.0
+                    self._c[layer][slots[starting], started] = 0.0
+
+            # Primary and shadow rows go through the same matmuls: (k, rows, units) -> (k * rows, units)
+            state = [(self._h[layer][slots].reshape(rows * k, -1), self._c[layer][slots].reshape(rows * k, -1))
+                     for layer in range(len(self.units))]
+            with METRICS.timer("lstm_stream_step"):
+                output, state = self.model.step(np.repeat(x, rows, axis=0), state)
+
+            for layer, (h, c) in enumerate(state):
+                self._h[layer][slots] = h.reshape(k, rows, -1)
+                self._c[layer][slots] = c.reshape(k, rows, -1)
+            output = output[:, 0].reshape(k, rows)
+            predictions = output[:, 0].copy()
+
+            anchored = bar % self.reanchor_every == 0
+            if anchored.any():
+                # The anchor's shadow has seen exactly the last `seq_length` bars: exact state and prediction
+                shadow = self._shadow_row(bar[anchored])
+                for layer in range(len(self.units)):
+                    self._h[layer][slots[anchored], 0] = self._h[layer][slots[anchored], shadow]
+                    self._c[layer][slots[anchored], 0] = self._c[layer][slots[anchored], shadow]
+                predictions[anchored] = output[anchored, shadow]
+            self._bars[slots] = bar
+
+        return dict(zip(symbols, predictions.tolist()))
+
+    def _shadow_row(self, anchor_bar):
+        # Shadows are reused round-robin; one never outlives the `n_shadows` anchors after its own
+        return 1 + (anchor_bar // self.reanchor_every) % self.n_shadows
+
+    def reset(self, symbol):
+        """
+        Forget a symbol's state (it must be primed again before `update`)
+        """
+        with self._lock:
+            slot = self._slots.pop(symbol, None)
+            if slot is None:
+                return
+            # Move the last slot into the freed one to keep slots dense
+            last = len(self._slots)
+            if slot != last:
+                moved = next(s for s, i in self._slots.items() if i == last)
+                self._slots[moved] = slot
+                for layer in range(len(self.units)):
+                    self._h[layer][slot] = self._h[layer][last]
+                    self._c[layer][slot] = self._c[layer][last]
+                self._bars[slot] = self._bars[last]
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m models.streaming_lstm [weights.npz]
+    # Drift and per-bar cost of streaming vs. re-running the full window on TSLA history
+    from sklearn.preprocessing import MinMaxScaler
+
+    from models.dataset import sliding_windows
+    from utils.feature_store import load_features
+
+    weights = sys.argv[1] if len(sys.argv) > 1 else os.path.join(project_root, "models", "lstm_model.npz")
+    model = NumpyLSTMModel.load(weights)
+    seq_length, n_features = model.input_shape[1:]
+
+    features = ["Close", "SMA_50", "SMA_200", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"][:n_features]
+    df = load_features("TSLA", features)
+    scaled = MinMaxScaler().fit_transform(df[features]).astype(np.float32)
+
+    # Reference: full-window prediction at every bar
+    start = time.perf_counter()
+    reference = model.predict(np.ascontiguousarray(sliding_windows(scaled, seq_length)))[:, 0]
+    window_ms = (time.perf_counter() - start) / len(reference) * 1000
+
+    def stream(reanchor_every):
+        predictor = StreamingLSTMPredictor(model, reanchor_every)
+        predictions = [predictor.prime({"TSLA": scaled[:seq_length]})["TSLA"]]
+        start = time.perf_counter()
+        for row in scaled[seq_length:]:
+            predictions.append(predictor.update({"TSLA": row})["TSLA"])
+        return np.array(predictions), (time.perf_counter() - start) / (len(scaled) - seq_length) * 1000
+
+    start = time.perf_counter()
+    for i in range(100):
+        model.predict_on_batch(scaled[np.newaxis, i:i + seq_length])
+    single_ms = (time.perf_counter() - start) / 100 * 1000
+
+    streamed, step_ms = stream(None)
+    drifting, _ = stream(10 ** 9)  # Never re-anchored
+
+    scale = reference.max() - reference.min()
+    print(f"📦 {len(reference)} bars, window {seq_length}, {n_features} features")
+    print(f"⏱️ Full window: {single_ms:.3f} ms/bar ({window_ms:.3f} batched over history), streaming: {step_ms:.3f} ms/bar")
+    print(f"📉 Re-anchored every {seq_length} bars: max |diff| {np.abs(streamed - reference).max():.5f}, "
+          f"mean {np.abs(streamed - reference).mean():.5f} (prediction range {scale:.3f})")
+    print(f"📉 Never re-anchored:           max |diff| {np.abs(drifting - reference).max():.5f}, "
+          f"mean {np.abs(drifting - reference).mean():.5f}")
+
+    # Many symbols: per-bar cost of one batched streaming step vs. re-running every window
+    rng = np.random.default_rng(0)
+    n_symbols = 50
+    windows = {f"SYM{i}": rng.random((seq_length, n_features), dtype=np.float32) for i in range(n_symbols)}
+    predictor = StreamingLSTMPredictor(model)
+    predictor.prime(windows)
+    bars = {symbol: rng.random(n_features, dtype=np.float32) for symbol in windows}
+    batch = np.stack(list(windows.values()))
+
+    repeats = 20
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predictor.update(bars)
+    stream_ms = (time.perf_counter() - start) / repeats * 1000
+    start = time.perf_counter()
+    for _ in range(repeats):
+        model.predict_on_batch(batch)
+    full_ms = (time.perf_counter() - start) / repeats * 1000
+    print(f"📈 {n_symbols} symbols per bar: streaming {stream_ms:.2f} ms vs. full windows {full_ms:.2f} ms")
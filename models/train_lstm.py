@@ -4,33 +4,38 @@ import tensorflow as tf
 from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dense, Dropout
 from sklearn.preprocessing import MinMaxScaler
+import os
+import sys
 
-# ✅ Load the processed dataset
-df = pd.read_csv("C:/Users/91882/Desktop/College Projects/Ai driven Algorithm trading projext and paper/project/data/tsla_90_days_with_indicators.csv")
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
 
-# ✅ Remove SMA_200 (not enough data)
-df.drop(columns=["SMA_200"], inplace=True, errors="ignore")
+from models.dataset import WindowDataset
+from models.registry import ModelRegistry
+from utils.feature_store import load_features
 
-# ✅ Select features for training
+# ✅ Load the features from the same store series live_trading.py predicts from
+# (Alpaca IEX bars, warm-up rows dropped rather than back-filled)
 features = ["close", "SMA_50", "RSI", "MACD", "MACD_Signal", "OBV"]
+df = load_features("TSLA_IEX", features)
+
+# ✅ Ensure there are windows for both the training and the validation split
+seq_length = 50
+if len(df) < seq_length + 2:
+    print(f"❌ ERROR: Need at least {seq_length + 2} bars with complete indicators in TSLA_IEX, got {len(df)}.")
+    print("📝 live_trading.py appends each completed session; or run: python -m utils.feature_store append TSLA_IEX <bars.csv>")
+    exit()
+
+# ✅ Scale the selected features
 scaler = MinMaxScaler()
 df_scaled = scaler.fit_transform(df[features])
 
-# ✅ Convert data into LSTM sequences
-def create_sequences(data, seq_length=50):
-    X, y = [], []
-    for i in range(len(data) - seq_length):
-        X.append(data[i:i+seq_length])
-        y.append(data[i+seq_length, 0])  # Predicting 'close' price
-    return np.array(X), np.array(y)
-
-seq_length = 50
-X, y = create_sequences(df_scaled, seq_length)
+# ✅ Stream LSTM windows straight out of the scaled matrix (no per-window copies)
+dataset = WindowDataset({"TSLA": df_scaled.astype(np.float32)}, seq_length, batch_size=8, seed=42)
 
 # ✅ Split into training (80%) and validation (20%) sets
-split = int(len(X) * 0.8)
-X_train, X_val = X[:split], X[split:]
-y_train, y_val = y[:split], y[split:]
+train_data, val_data = dataset.split(0.8)
 
 # ✅ Define LSTM Model
 model = Sequential([
@@ -47,15 +52,22 @@ model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.001), loss="mse
 
 # ✅ Train the model
 history = model.fit(
-    X_train, y_train,
-    validation_data=(X_val, y_val),
+    train_data.as_tf_dataset(),
+    validation_data=val_data.as_tf_dataset(),
     epochs=50,
-    batch_size=8,
     verbose=1
 )
 
 # ✅ Save the trained model
-model.save("C:/Users/91882/Desktop/College Projects/Ai driven Algorithm trading projext and paper/project/models/lstm_trained_model.h5", save_format="h5")
+model.save("models/lstm_trained_model.h5")
 
 print("✅ Model training complete! Model saved at: models/lstm_trained_model.h5")
 
+# ✅ Register the model with its fitted scaler, feature list and training data hash
+artifact = ModelRegistry().register(
+    "lstm_trained_model", "models/lstm_trained_model.h5", features, seq_length, scaler, data=df[features],
+    metrics={'loss': history.history['loss'][-1], 'val_loss': history.history['val_loss'][-1]},
+    source="feature_store:TSLA_IEX"
+)
+print(f"✅ Registered {artifact.name}@{artifact.version}")
+
@@ -0,0 +1,302 @@
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import WindowDataset, scale_per_symbol
+from models.registry import ModelRegistry
+from strategies.assignment_strategy import AssignmentTradingStrategy
+from utils.config import (
+    NIFTY_50_STOCKS, TRAINING_BATCH_SIZE, TRAINING_CHECKPOINT_DIR, TRAINING_EMBEDDING_DIM,
+    TRAINING_EPOCHS, TRAINING_FEATURES, TRAINING_INTER_OP_THREADS, TRAINING_INTRA_OP_THREADS,
+    TRAINING_LOADER_WORKERS, TRAINING_PARITY_TOLERANCE, TRAINING_PERIOD, TRAINING_SEQ_LENGTH
+)
+from utils.metrics import METRICS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def configure_threads(intra_op=TRAINING_INTRA_OP_THREADS, inter_op=TRAINING_INTER_OP_THREADS):
+    """
+    Size TensorFlow's thread pools (must run before the first TF operation)
+
+    Args:
+        intra_op (int): Threads used inside one op, e.g. a matmul (0 = one per core)
+        inter_op (int): Ops run concurrently (0 = 2, or 1 on a single core)
+
+    Returns:
+        tuple: (intra_op, inter_op) actually requested
+    """
+    cores = os.cpu_count() or 1
+    intra_op = intra_op or cores
+    inter_op = inter_op or (2 if cores > 1 else 1)
+    try:
+        tf.config.threading.set_intra_op_parallelism_threads(intra_op)
+        tf.config.threading.set_inter_op_parallelism_threads(inter_op)
+    except RuntimeError as e:
+        logger.warning(f"⚠️ TensorFlow already initialized, thread pools unchanged: {e}")
+    logger.info(f"🧵 TensorFlow threads: intra-op {intra_op}, inter-op {inter_op} ({cores} cores)")
+    return intra_op, inter_op
+
+
+def load_symbol_frames(symbols, features=TRAINING_FEATURES, period=TRAINING_PERIOD, csv_dir=None):
+    """
+    Load price history with indicators for many symbols
+
+    Args:
+        symbols (list): Stock symbols
+        features (list): Feature columns every frame must provide
+        period (str): yfinance period when downloading
+        csv_dir (str): Read <csv_dir>/<symbol>.csv (Date index, OHLCV columns) instead of downloading
+
+    Returns:
+        dict: Symbol -> DataFrame with indicator columns, warm-up rows dropped
+    """
+    strategy = AssignmentTradingStrategy()
+    if csv_dir is None:
+        frames = strategy.fetch_nifty_data(symbols, period=period)
+    else:
+        frames = {}
+        for symbol in symbols:
+            path = os.path.join(csv_dir, f"{symbol}.csv")
+            if not os.path.exists(path):
+                logger.warning(f"⚠️ No CSV for {symbol} at {path}")
+                continue
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
+            frames[symbol] = strategy.calculate_indicators(df)
+
+    return {symbol: df.dropna(subset=features) for symbol, df in frames.items()}
+
+
+def build_model(seq_length, n_features, n_symbols, embedding_dim=TRAINING_EMBEDDING_DIM):
+    """
+    Multi-symbol LSTM: the same layers as train_lstm.py, plus a learned symbol
+    embedding concatenated to every timestep
+
+    Returns:
+        tf.keras.Model: Compiled model with inputs (window, symbol_id)
+    """
+    from tensorflow.keras import layers
+
+    window = layers.Input(shape=(seq_length, n_features), name="window")
+    symbol = layers.Input(shape=(), dtype="int32", name="symbol")
+    embedded = layers.Embedding(n_symbols, embedding_dim, name="symbol_embedding")(symbol)
+    x = layers.Concatenate(name="window_with_symbol")([window, layers.RepeatVector(seq_length)(embedded)])
+    x = layers.LSTM(128, return_sequences=True, name="lstm_1")(x)
+    x = layers.Dropout(0.2)(x)
+    x = layers.LSTM(64, name="lstm_2")(x)
+    x = layers.Dropout(0.2)(x)
+    x = layers.Dense(32, activation="relu", name="dense_1")(x)
+    output = layers.Dense(1, name="output")(x)  # Next scaled close
+
+    model = tf.keras.Model([window, symbol], output)
+    model.compile(optimizer=tf.keras.optimizers.Adam(learning_rate=0.001), loss="mse")
+    return model
+
+
+def export_numpy_layers(model, n_features):
+    """
+    Convert the trained Keras model for the NumPy runtime
+
+    The embedding only enters through the first LSTM's input projection, so
+    it folds into a per-symbol bias: bias + embedding[s] @ kernel[n_features:].
+
+    Returns:
+        tuple: (input_shape, layer dicts) for ModelRegistry.register / NumpyLSTMModel
+    """
+    embedding = model.get_layer("symbol_embedding").get_weights()[0]
+    layers = []
+    for name in ("lstm_1", "lstm_2", "dense_1", "output"):
+        layer = model.get_layer(name)
+        config = layer.get_config()
+        weights = [np.asarray(w, dtype=np.float32) for w in layer.get_weights()]
+        if name.startswith("lstm"):
+            kernel, recurrent_kernel, bias = weights
+            spec = {
+                'type': 'lstm',
+                'units': config['units'],
+                'activation': config['activation'],
+                'recurrent_activation': config['recurrent_activation'],
+                'return_sequences': config['return_sequences'],
+                'kernel': kernel,
+                'recurrent_kernel': recurrent_kernel,
+                'bias': bias,
+            }
+            if name == "lstm_1":
+                spec['kernel'] = kernel[:n_features]
+                spec['symbol_bias'] = embedding @ kernel[n_features:] + bias
+            layers.append(spec)
+        else:
+            kernel, bias = weights
+            layers.append({
+                'type': 'dense',
+                'units': config['units'],
+                'activation': config['activation'],
+                'kernel': kernel,
+                'bias': bias,
+            })
+    seq_length = model.get_layer("window").output.shape[1]
+    return (seq_length, n_features), layers
+
+
+class ThroughputLogger(tf.keras.callbacks.Callback):
+    """
+    Log training samples/second per epoch (validation time excluded)
+    """
+
+    def __init__(self, samples_per_epoch):
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.samples_per_sec = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._start = time.perf_counter()
+        self._train_end = None
+
+    def on_test_begin(self, logs=None):
+        if self._train_end is None:
+            self._train_end = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = (self._train_end or time.perf_counter()) - self._start
+        rate = self.samples_per_epoch / elapsed if elapsed > 0 else 0.0
+        self.samples_per_sec.append(rate)
+        METRICS.observe("train_epoch", elapsed)
+        METRICS.increment("train_samples", self.samples_per_epoch)
+        if logs is not None:
+            logs['samples_per_sec'] = rate
+        logger.info(f"⚡ Epoch {epoch + 1}: {rate:,.0f} samples/s ({self.samples_per_epoch} samples in {elapsed:.1f}s)")
+
+
+def train_multi_symbol(symbols=NIFTY_50_STOCKS, features=TRAINING_FEATURES, seq_length=TRAINING_SEQ_LENGTH,
+                       epochs=TRAINING_EPOCHS, batch_size=TRAINING_BATCH_SIZE, period=TRAINING_PERIOD,
+                       csv_dir=None, frames=None, train_fraction=0.8,
+                       checkpoint_dir=TRAINING_CHECKPOINT_DIR, embedding_dim=TRAINING_EMBEDDING_DIM,
+                       intra_op_threads=TRAINING_INTRA_OP_THREADS, inter_op_threads=TRAINING_INTER_OP_THREADS,
+                       loader_workers=TRAINING_LOADER_WORKERS, register_as="lstm_multi_symbol",
+                       registry=None, parity_tolerance=TRAINING_PARITY_TOLERANCE, seed=42):
+    """
+    Train one LSTM on many symbols, checkpointing every epoch
+
+    Re-running after an interruption resumes from the last completed epoch
+    (BackupAndRestore state in `checkpoint_dir`). The last epoch is always
+    saved as <checkpoint_dir>/last.keras.
+
+    Args:
+        symbols (list): Symbols to train on
+        features (list): Feature columns; the first is the target
+        seq_length (int): Window length
+        epochs (int): Total epochs (including ones already completed before a resume)
+        batch_size (int): Windows per batch
+        period (str): yfinance period when downloading
+        csv_dir (str): Load <symbol>.csv files from here instead of downloading
+        frames (dict): Pre-loaded symbol -> DataFrame (skips loading)
+        train_fraction (float): Chronological train share per symbol
+        checkpoint_dir (str): Checkpoint and resume directory
+        embedding_dim (int): Symbol embedding size
+        intra_op_threads (int): TensorFlow intra-op threads (0 = cores)
+        inter_op_threads (int): TensorFlow inter-op threads (0 = auto)
+        loader_workers (int): Threads gathering batches
+        register_as (str): Registry name for the trained model (None to skip)
+        registry (ModelRegistry): Registry to use (default: MODEL_REGISTRY_DIR)
+        parity_tolerance (float): Max prediction difference between the NumPy export and Keras
+        seed (int): Random seed
+
+    Returns:
+        dict: {'model', 'history', 'artifact', 'samples_per_sec'}
+
+    Raises:
+        RuntimeError: If the NumPy export does not reproduce the Keras model
+    """
+    configure_threads(intra_op_threads, inter_op_threads)
+    tf.keras.utils.set_random_seed(seed)
+
+    if frames is None:
+        frames = load_symbol_frames(symbols, features, period, csv_dir)
+    arrays, scalers = scale_per_symbol(frames, features, seq_length, train_fraction)
+    if not arrays:
+        raise ValueError("No symbol has enough data to train on")
+
+    dataset = WindowDataset(arrays, seq_length, batch_size=batch_size, seed=seed,
+                            return_symbols=True, workers=loader_workers)
+    train_data, val_data = dataset.split(train_fraction)
+    logger.info(f"📦 {len(arrays)} symbols, {train_data.n_windows} training / {val_data.n_windows} validation windows")
+
+    checkpoint_dir = checkpoint_dir if os.path.isabs(checkpoint_dir) else os.path.join(project_root, checkpoint_dir)
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    throughput = ThroughputLogger(train_data.n_windows)
+    callbacks = [
+        tf.keras.callbacks.BackupAndRestore(os.path.join(checkpoint_dir, "backup")),
+        tf.keras.callbacks.ModelCheckpoint(os.path.join(checkpoint_dir, "last.keras"), save_freq="epoch"),
+        throughput,
+    ]
+
+    model = build_model(seq_length, len(features), len(arrays), embedding_dim)
+    history = model.fit(
+        train_data.as_tf_dataset(),
+        validation_data=val_data.as_tf_dataset(),
+        epochs=epochs,
+        callbacks=callbacks,
+        shuffle=False,  # WindowDataset already shuffles every epoch
+        verbose=2
+    )
+
+    # The NumPy export must reproduce Keras before it is registered
+    input_shape, layers = export_numpy_layers(model, len(features))
+    check_data = val_data if val_data.n_windows else train_data
+    (X, symbol_ids), _ = check_data.gather(check_data.index[:64])
+    from models.numpy_lstm import NumpyLSTMModel
+
+    parity = float(np.abs(
+        NumpyLSTMModel(input_shape, layers).predict_on_batch(X, symbol_ids)
+        - np.asarray(model.predict_on_batch((X, symbol_ids)))
+    ).max())
+    if not parity <= parity_tolerance:
+        raise RuntimeError(
+            f"NumPy export does not match Keras (max |diff| {parity:.2e} > {parity_tolerance:.0e}); not registering"
+        )
+    logger.info(f"✅ NumPy export matches Keras (max |diff| {parity:.2e})")
+
+    artifact = None
+    if register_as:
+        losses = history.history
+        artifact = (registry or ModelRegistry()).register(
+            register_as, (input_shape, layers), features, seq_length, None,
+            data={symbol: frames[symbol][features] for symbol in arrays},
+            symbol_scalers=scalers,
+            metrics={
+                'loss': losses['loss'][-1] if losses.get('loss') else None,
+                'val_loss': losses['val_loss'][-1] if losses.get('val_loss') else None,
+                'samples_per_sec': float(np.median(throughput.samples_per_sec)) if throughput.samples_per_sec else None,
+                'numpy_parity': parity,
+            },
+            source=csv_dir or f"yfinance:{period}"
+        )
+    return {'model': model, 'history': history, 'artifact': artifact, 'samples_per_sec': throughput.samples_per_sec}
+
+
+if __name__ == "__main__":
+    # Run from the project root:
+    #   python -m models.train_multi_symbol            (downloads TRAINING_PERIOD of every NIFTY 50 stock)
+    #   python -m models.train_multi_symbol <csv_dir>  (uses <csv_dir>/<symbol>.csv for every CSV found)
+    csv_dir = sys.argv[1] if len(sys.argv) > 1 else None
+    symbols = NIFTY_50_STOCKS
+    if csv_dir is not None:
+        symbols = sorted(f[:-4] for f in os.listdir(csv_dir) if f.endswith(".csv"))
+
+    result = train_multi_symbol(symbols, csv_dir=csv_dir)
+    rates = result['samples_per_sec']
+    print(f"✅ Trained on {len(symbols)} symbols, median {np.median(rates):,.0f} samples/s")
+    if result['artifact'] is not None:
+        print(f"📦 Registered {result['artifact']}")
@@ -4,6 +4,18 @@ import yfinance as yf
 import ta
 from datetime import datetime, timedelta
 import logging
+import os
+import sys
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from strategies.kernels import SIGNAL_LABELS, backtest_arrays, backtest_metrics, signal_codes
+from utils.compact import bar_timestamp, compact_frame, is_compact
+from utils.metrics import METRICS
+from utils.profiling import PROFILER
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -18,7 +30,7 @@ class AssignmentTradingStrategy:
     """
     
     def __init__(self, rsi_buy_threshold=30, rsi_sell_threshold=70, 
-                 sma_short=20, sma_long=50):
+                 sma_short=20, sma_long=50, data_fetcher=None, compact=None):
         """
         Initialize strategy parameters
         
@@ -27,11 +39,18 @@ class AssignmentTradingStrategy:
             rsi_sell_threshold (int): RSI threshold for sell signal
             sma_short (int): Short-term SMA period
             sma_long (int): Long-term SMA period
+            data_fetcher (callable): fetcher(symbol, period) -> OHLCV DataFrame used instead of
+                yfinance (e.g. utils.synthetic_data.SyntheticDataFetcher for offline runs)
+            compact (bool): Produce compact frames - float32 prices/indicators, int8 signal codes,
+                int64 epoch index (see utils.compact; defaults to COMPACT_FRAMES in config.py)
         """
+        from utils.config import COMPACT_FRAMES
         self.rsi_buy_threshold = rsi_buy_threshold
         self.rsi_sell_threshold = rsi_sell_threshold
         self.sma_short = sma_short
         self.sma_long = sma_long
+        self.data_fetcher = data_fetcher
+        self.compact = COMPACT_FRAMES if compact is None else compact
         
     def fetch_nifty_data(self, symbols, period="6mo"):
         """
@@ -49,18 +68,29 @@ class AssignmentTradingStrategy:
         for symbol in symbols:
             try:
                 logger.info(f"📊 Fetching data for {symbol}...")
-                ticker = yf.Ticker(symbol)
-                df = ticker.history(period=period)
+                with METRICS.timer("fetch", symbol):
+                    if self.data_fetcher is not None:
+                        df = self.data_fetcher(symbol, period)
+                    else:
+                        ticker = yf.Ticker(symbol)
+                        df = ticker.history(period=period)
                 
                 if not df.empty:
                     # Calculate technical indicators
-                    df = self.calculate_indicators(df)
+                    with METRICS.timer("indicators", symbol):
+                        # Indicators are computed in float64 and stored compact
+                        df = self.calculate_indicators(df)
+                        if self.compact:
+                            df = compact_frame(df)
                     data[symbol] = df
+                    METRICS.increment("bars_fetched", len(df))
                     logger.info(f"✅ Data fetched for {symbol}: {len(df)} days")
                 else:
+                    METRICS.increment("fetch_errors", reason="empty")
                     logger.warning(f"⚠️ No data available for {symbol}")
                     
             except Exception as e:
+                METRICS.increment("fetch_errors", reason="exception")
                 logger.error(f"❌ Error fetching data for {symbol}: {e}")
                 
         return data
@@ -104,9 +134,14 @@ class AssignmentTradingStrategy:
             df (DataFrame): Data with indicators
             
         Returns:
-            DataFrame: Data with signals added
+            DataFrame: Data with signals added (int8 codes in compact frames)
         """
         df = df.copy()
+        if is_compact(df):
+            df['Signal'], df['Signal_Strength'] = signal_codes(
+                df['RSI'].to_numpy(), df['SMA_20'].to_numpy(), df['SMA_50'].to_numpy(),
+                self.rsi_buy_threshold, self.rsi_sell_threshold)
+            return df
         
         # Initialize signal columns
         df['Signal'] = 'HOLD'
@@ -148,6 +183,14 @@ class AssignmentTradingStrategy:
             dict: Backtest results
         """
         df = df.copy()
+        if is_compact(df):
+            # Array kernel; portfolio values, shares and P&L stay float64
+            values, shares_held, trade_rows = backtest_arrays(df['Close'].to_numpy(), df['Signal'].to_numpy(), initial_capital)
+            df['Portfolio_Value'] = values
+            df['Shares_Held'] = shares_held
+            results = backtest_metrics(self._trade_dicts(df, trade_rows), values[-1], initial_capital)
+            results['portfolio_data'] = df
+            return results
         
         # Initialize backtest variables
         capital = initial_capital
@@ -156,8 +199,8 @@ class AssignmentTradingStrategy:
         buy_price = 0
         
         # Track portfolio value
-        df['Portfolio_Value'] = capital
-        df['Shares_Held'] = 0
+        df['Portfolio_Value'] = float(capital)
+        df['Shares_Held'] = 0.0
         
         for i in range(len(df)):
             current_price = df['Close'].iloc[i]
@@ -201,41 +244,86 @@ class AssignmentTradingStrategy:
             df.loc[df.index[i], 'Shares_Held'] = shares
         
         # Calculate performance metrics
-        final_value = df['Portfolio_Value'].iloc[-1]
-        total_return = ((final_value - initial_capital) / initial_capital) * 100
-        
-        # Calculate win rate
-        winning_trades = [t for t in trades if t.get('P&L', 0) > 0]
-        win_rate = (len(winning_trades) / len([t for t in trades if 'P&L' in t])) * 100 if len([t for t in trades if 'P&L' in t]) > 0 else 0
-        
-        # Calculate total P&L
-        total_pnl = sum([t.get('P&L', 0) for t in trades])
-        
-        results = {
-            'initial_capital': initial_capital,
-            'final_value': final_value,
-            'total_return': total_return,
-            'total_pnl': total_pnl,
-            'win_rate': win_rate,
-            'total_trades': len([t for t in trades if 'P&L' in t]),
-            'winning_trades': len(winning_trades),
-            'trades': trades,
-            'portfolio_data': df
-        }
+        results = backtest_metrics(trades, df['Portfolio_Value'].iloc[-1], initial_capital)
+        results['portfolio_data'] = df
         
         return results
     
-    def run_strategy_for_symbols(self, symbols, period="6mo"):
+    def analyze_arrays(self, df, initial_capital=10000):
+        """
+        Signals and backtest of one symbol with the array kernels (no DataFrame copies)
+        
+        Produces the same signals and backtest numbers as generate_signals +
+        backtest_strategy, but keeps only the latest bar, the trades and the
+        equity/position arrays.
+        
+        Args:
+            df (DataFrame): Data with indicators
+            initial_capital (float): Initial capital for backtesting
+            
+        Returns:
+            tuple: (latest bar dict, backtest results without portfolio_data, portfolio values, shares held)
+        """
+        codes, strength = signal_codes(df['RSI'].to_numpy(), df['SMA_20'].to_numpy(), df['SMA_50'].to_numpy(),
+                                       self.rsi_buy_threshold, self.rsi_sell_threshold)
+        close = df['Close'].to_numpy()
+        values, shares_held, trade_rows = backtest_arrays(close, codes, initial_capital)
+        trades = self._trade_dicts(df, trade_rows)
+        
+        latest = {column: float(df[column].iloc[-1])
+                  for column in ['Close', 'Volume', 'RSI', 'SMA_20', 'SMA_50', 'MACD', 'MACD_Signal', 'BB_High', 'BB_Low']}
+        # The previous bar's SMAs let the screener see crossovers
+        latest.update(Prev_SMA_20=float(df['SMA_20'].iloc[-2]) if len(df) > 1 else np.nan,
+                      Prev_SMA_50=float(df['SMA_50'].iloc[-2]) if len(df) > 1 else np.nan)
+        latest.update(Signal=SIGNAL_LABELS[codes[-1]], Signal_Strength=float(strength[-1]),
+                      Date=bar_timestamp(df, len(df) - 1))
+        return latest, backtest_metrics(trades, values[-1], initial_capital), values, shares_held
+    
+    @staticmethod
+    def _trade_dicts(df, trade_rows):
+        trades = []
+        for i, action, price, shares, value, pnl in trade_rows:
+            trade = {'Date': bar_timestamp(df, i), 'Action': action, 'Price': price, 'Shares': shares, 'Value': value}
+            if pnl is not None:
+                trade['P&L'] = pnl
+            trades.append(trade)
+        return trades
+    
+    @PROFILER.profiled("strategy")
+    def run_strategy_for_symbols(self, symbols, period="6mo", results_mode=None, spill=None, scanner=None):
         """
-        Run the complete strategy for multiple symbols
+        Run the complete strategy for multiple symbols (profiled when the profiler is armed)
+        
+        In "full" mode every symbol keeps its signal frame ('data') and its
+        backtest frame (['backtest']['portfolio_data']). In "summary" mode
+        symbols are fetched and analyzed one at a time with the array
+        kernels; only the latest bar ('latest'), the metrics and the trades
+        stay in memory, and the equity/position series are spilled to disk
+        ('portfolio_data' is a SpilledFrame whose load() reads them back),
+        so memory does not grow with the universe. In "sharded" mode the
+        universe is stacked into one PricePanel and scanned in shards by a
+        ShardedScanner (worker processes reading it from shared memory); only
+        the latest bar and the backtest metrics are returned, without trades.
         
         Args:
             symbols (list): List of stock symbols
             period (str): Data period
+            results_mode (str): "full", "summary" or "sharded" (defaults to BACKTEST_RESULTS_MODE in config.py)
+            spill (SeriesSpill): Spill store for summary mode (defaults to one at BACKTEST_SPILL_DIR)
+            scanner (ShardedScanner): Scanner for sharded mode (defaults to an in-process one)
             
         Returns:
             dict: Results for all symbols
         """
+        from utils.config import BACKTEST_RESULTS_MODE
+        results_mode = results_mode or BACKTEST_RESULTS_MODE
+        if results_mode == "summary":
+            return self._run_summary_mode(symbols, period, spill)
+        if results_mode == "sharded":
+            return self._run_sharded_mode(symbols, period, scanner)
+        if results_mode != "full":
+            raise ValueError(f"Unknown results mode: {results_mode}")
+        
         logger.info(f"🚀 Starting strategy analysis for {len(symbols)} symbols...")
         
         # Fetch data for all symbols
@@ -247,10 +335,13 @@ class AssignmentTradingStrategy:
             logger.info(f"📈 Analyzing {symbol}...")
             
             # Generate signals
-            df_with_signals = self.generate_signals(df)
+            with METRICS.timer("generate_signals", symbol):
+                df_with_signals = self.generate_signals(df)
             
             # Backtest strategy
-            backtest_results = self.backtest_strategy(df_with_signals)
+            with METRICS.timer("backtest", symbol):
+                backtest_results = self.backtest_strategy(df_with_signals)
+            METRICS.increment("symbols_analyzed")
             
             results[symbol] = {
                 'data': df_with_signals,
@@ -260,3 +351,79 @@ class AssignmentTradingStrategy:
             logger.info(f"✅ {symbol} analysis complete - Return: {backtest_results['total_return']:.2f}%, Win Rate: {backtest_results['win_rate']:.2f}%")
         
         return results
+    
+    def _run_summary_mode(self, symbols, period, spill=None):
+        from utils.result_store import SeriesSpill
+        
+        logger.info(f"🚀 Starting strategy analysis for {len(symbols)} symbols (summary results)...")
+        if spill is None:
+            spill = SeriesSpill()
+        
+        results = {}
+        for symbol in symbols:
+            # One symbol in memory at a time
+            data = self.fetch_nifty_data([symbol], period)
+            if symbol not in data:
+                continue
+            df = data.pop(symbol)
+            
+            with METRICS.timer("analyze", symbol):
+                latest, backtest_results, values, shares_held = self.analyze_arrays(df)
+            with METRICS.timer("spill", symbol):
+                backtest_results['portfolio_data'] = spill.append(
+                    symbol, df.index, {'Portfolio_Value': values, 'Shares_Held': shares_held}, tz=df.attrs.get('tz'))
+            METRICS.increment("symbols_analyzed")
+            
+            results[symbol] = {
+                'latest': latest,
+                'backtest': backtest_results
+            }
+            logger.info(f"✅ {symbol} analysis complete - Return: {backtest_results['total_return']:.2f}%, Win Rate: {backtest_results['win_rate']:.2f}%")
+        
+        spill.flush()
+        return results
+    
+    def _run_sharded_mode(self, symbols, period, scanner=None, initial_capital=10000):
+        from strategies.panel import INDICATOR_COLUMNS, PricePanel
+        from strategies.sharded_scan import ShardedScanner
+        from utils.compact import epochs_to_index, expand_frame
+        from utils.synthetic_data import BAR_COLUMNS
+        
+        logger.info(f"🚀 Starting strategy analysis for {len(symbols)} symbols (sharded scan)...")
+        data = self.fetch_nifty_data(symbols, period)
+        if not data:
+            return {}
+        
+        with METRICS.timer("panel"):
+            panel = PricePanel.from_frames({symbol: expand_frame(df) for symbol, df in data.items()},
+                                           columns=BAR_COLUMNS + INDICATOR_COLUMNS)
+            del data
+        with METRICS.timer("sharded_scan"):
+            if scanner is None:
+                with ShardedScanner(workers=0) as scanner:
+                    scan = scanner.scan(panel, self.rsi_buy_threshold, self.rsi_sell_threshold, initial_capital)
+            else:
+                scan = scanner.scan(panel, self.rsi_buy_threshold, self.rsi_sell_threshold, initial_capital)
+        
+        # Latest and previous bar of every symbol: its own last two bars, which may be
+        # earlier than the panel's or separated by bars where it has no data
+        results = {}
+        for row, symbol in enumerate(panel.symbols):
+            bars = np.flatnonzero(~np.isnan(panel.columns['Close'][row]))
+            last = bars[-1]
+            latest = {column: float(panel.columns[column][row, last])
+                      for column in ['Close', 'Volume', 'RSI', 'SMA_20', 'SMA_50', 'MACD', 'MACD_Signal', 'BB_High', 'BB_Low']}
+            latest.update(Prev_SMA_20=float(panel.columns['SMA_20'][row, bars[-2]]) if len(bars) > 1 else np.nan,
+                          Prev_SMA_50=float(panel.columns['SMA_50'][row, bars[-2]]) if len(bars) > 1 else np.nan)
+            latest.update(Signal=SIGNAL_LABELS[scan['signal'][row]], Signal_Strength=float(scan['signal_strength'][row]),
+                          Date=epochs_to_index(panel.index[last:last + 1], panel.tz)[0])
+            backtest_results = {name: scan[name][row].item()
+                                for name in ['final_value', 'total_return', 'total_pnl', 'win_rate', 'total_trades', 'winning_trades']}
+            backtest_results.update(initial_capital=initial_capital, trades=[])
+            results[symbol] = {
+                'latest': latest,
+                'backtest': backtest_results
+            }
+        METRICS.increment("symbols_analyzed", len(results))
+        logger.info(f"✅ Sharded scan of {len(results)} symbols complete")
+        return results
@@ -0,0 +1,565 @@
+import itertools
+import json
+import logging
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from strategies.kernels import backtest_arrays, signal_codes
+from utils.config import (
+    DISTRIBUTED_CONNECT_TIMEOUT_SECONDS, DISTRIBUTED_HOST, DISTRIBUTED_JOB_TIMEOUT_SECONDS,
+    DISTRIBUTED_MAX_ATTEMPTS, DISTRIBUTED_POLL_SECONDS, DISTRIBUTED_PORT, DISTRIBUTED_SHARD_SIZE, FEATURE_SET, FEATURE_STORE_DIR
+)
+from utils.feature_store import FeatureStore
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Strategy parameters of a job; SMA columns name feature-store columns
+DEFAULT_PARAMS = {
+    'rsi_buy_threshold': 30,
+    'rsi_sell_threshold': 70,
+    'sma_short': 'SMA_20',
+    'sma_long': 'SMA_50',
+    'initial_capital': 10000,
+}
+
+# Per-symbol values a worker returns for a job
+RESULT_FIELDS = ['bars', 'final_value', 'total_return', 'total_pnl', 'total_trades', 'winning_trades']
+
+
+def send_message(stream, message):
+    """
+    Write one message (a JSON line) to a socket file
+    """
+    stream.write(json.dumps(message).encode() + b"\n")
+    stream.flush()
+
+
+def read_message(stream):
+    """
+    Read one message from a socket file
+
+    Raises:
+        ConnectionError: The peer closed the connection
+    """
+    line = stream.readline()
+    if not line:
+        raise ConnectionError("Connection closed by peer")
+    return json.loads(line)
+
+
+def _epoch(value):
+    # Bound of a date range as tz-naive UTC nanoseconds (the feature store's index)
+    if value is None:
+        return None
+    timestamp = pd.Timestamp(value)
+    return (timestamp.tz_convert("UTC").tz_localize(None) if timestamp.tz is not None else timestamp).value
+
+
+def sweep_jobs(symbols, param_sets, date_ranges=((None, None),), shard_size=DISTRIBUTED_SHARD_SIZE):
+    """
+    Jobs of a sweep: every symbol shard x parameter set x date range
+
+    Args:
+        symbols (list): Feature-store symbols
+        param_sets (list): Parameter dicts (missing keys default to DEFAULT_PARAMS)
+        date_ranges (list): (start, end) pairs of dates; bars with start <= time < end (None = unbounded)
+        shard_size (int): Symbols per job
+
+    Returns:
+        list: Job dicts with job_id, symbols, params, start and end
+    """
+    shards = [list(symbols[i:i + shard_size]) for i in range(0, len(symbols), shard_size)]
+    jobs = []
+    for params, (start, end), shard in itertools.product(param_sets, date_ranges, shards):
+        jobs.append({
+            'job_id': len(jobs),
+            'symbols': shard,
+            'params': dict(DEFAULT_PARAMS, **params),
+            'start': None if start is None else str(start),
+            'end': None if end is None else str(end),
+        })
+    return jobs
+
+
+def run_job(store, job):
+    """
+    Backtest one job's symbols from memory-mapped feature-store columns
+
+    Args:
+        store (FeatureStore): Shared store holding the symbols
+        job (dict): Job from sweep_jobs
+
+    Returns:
+        dict: job_id, symbols and one list per RESULT_FIELDS entry
+    """
+    params = dict(DEFAULT_PARAMS, **job['params'])
+    capital = params['initial_capital']
+    start, end = _epoch(job['start']), _epoch(job['end'])
+    columns = ['Close', 'RSI', params['sma_short'], params['sma_long']]
+    result = {'job_id': job['job_id'], 'symbols': job['symbols']}
+    result.update({field: [] for field in RESULT_FIELDS})
+
+    for symbol in job['symbols']:
+        index, arrays = store.arrays(symbol, columns)
+        lo = int(np.searchsorted(index, start)) if start is not None else 0
+        hi = int(np.searchsorted(index, end)) if end is not None else len(index)
+        codes, _ = signal_codes(arrays['RSI'][lo:hi], arrays[params['sma_short']][lo:hi],
+                                arrays[params['sma_long']][lo:hi],
+                                params['rsi_buy_threshold'], params['rsi_sell_threshold'])
+        values, _, trades = backtest_arrays(arrays['Close'][lo:hi], codes, capital)
+        pnl = [trade[5] for trade in trades if trade[5] is not None]
+        final_value = float(values[-1]) if len(values) else float(capital)
+        result['bars'].append(hi - lo)
+        result['final_value'].append(final_value)
+        result['total_return'].append((final_value - capital) / capital * 100)
+        result['total_pnl'].append(float(sum(pnl)))
+        result['total_trades'].append(len(pnl))
+        result['winning_trades'].append(sum(p > 0 for p in pnl))
+    return result
+
+
+def sweep_frame(jobs, results):
+    """
+    One row per (job, symbol): the job's parameters and date range plus the symbol's results
+
+    Args:
+        jobs (list): Jobs from sweep_jobs
+        results (list): Job results in job order (see Coordinator.run or run_job)
+
+    Returns:
+        pd.DataFrame: Sweep results with a win_rate column
+    """
+    frames = []
+    for job, result in zip(jobs, results):
+        frame = pd.DataFrame({'symbol': result['symbols'], **{field: result[field] for field in RESULT_FIELDS}})
+        for key, value in list(job['params'].items()) + [('start', job['start']), ('end', job['end'])]:
+            frame.insert(len(frame.columns) - len(RESULT_FIELDS), key, value)
+        frame.insert(0, 'job_id', job['job_id'])
+        frames.append(frame)
+    df = pd.concat(frames, ignore_index=True)
+    df['win_rate'] = np.where(df['total_trades'] > 0, df['winning_trades'] / df['total_trades'].clip(lower=1) * 100, 0.0)
+    return df
+
+
+class Coordinator:
+    """
+    Job queue served to worker daemons over TCP
+
+    Workers connect, ask for jobs and send back compact results (one line of
+    JSON per message). A job handed out is leased to its worker: when the
+    connection drops, or no result arrives within `job_timeout` seconds, the
+    job goes back to the queue for another worker. Workers report jobs that
+    raise as errors; a job that errors, times out or loses its worker
+    `max_attempts` times is recorded as failed and makes `wait` raise. The
+    first result of a job wins; late duplicates from a reassigned job are
+    ignored.
+    """
+
+    def __init__(self, host=DISTRIBUTED_HOST, port=DISTRIBUTED_PORT, job_timeout=DISTRIBUTED_JOB_TIMEOUT_SECONDS,
+                 poll_seconds=DISTRIBUTED_POLL_SECONDS, max_attempts=DISTRIBUTED_MAX_ATTEMPTS):
+        """
+        Args:
+            host (str): Interface to listen on
+            port (int): TCP port (0 picks a free one, see `address`)
+            job_timeout (float): Seconds a worker may hold a job before it is reassigned
+            poll_seconds (float): How long idle workers wait before asking again
+            max_attempts (int): Attempts per job before it is recorded as failed
+        """
+        self.job_timeout = job_timeout
+        self.poll_seconds = poll_seconds
+        self.max_attempts = max_attempts
+        self.jobs = {}
+        self.results = {}
+        self.failed = {}  # job_id -> last error
+        self.attempts = {}  # job_id -> failed attempts
+        self.pending = deque()
+        self.leases = {}  # job_id -> (worker, deadline)
+        self.workers = {}  # worker -> jobs completed, for connected workers
+        self.reassigned = 0
+        self._stopping = False
+        self._connections = 0
+        self._condition = threading.Condition()
+        self._thread = None
+
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                coordinator._serve(self.rfile, self.wfile, self.client_address)
+
+        class Server(socketserver.ThreadingTCPServer):
+            allow_reuse_address = True
+            daemon_threads = True
+
+        self._server = Server((host, port), Handler)
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="coordinator", daemon=True)
+        self._thread.start()
+        logger.info(f"🛰️ Coordinator listening on {self.address[0]}:{self.address[1]}")
+        return self
+
+    def stop(self, timeout=None):
+        """
+        Tell workers to exit on their next request, then close the server
+
+        Args:
+            timeout (float): Seconds to wait for workers to leave (defaults to two poll periods)
+        """
+        timeout = 2 * self.poll_seconds + 1 if timeout is None else timeout
+        with self._condition:
+            self._stopping = True
+            self._condition.wait_for(lambda: not self.workers, timeout)
+        self._server.shutdown()
+        self._server.server_close()
+        logger.info("🛑 Coordinator stopped")
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def submit(self, jobs):
+        with self._condition:
+            for job in jobs:
+                self.jobs[job['job_id']] = job
+                self.pending.append(job['job_id'])
+            self._condition.notify_all()
+
+    def wait(self, job_ids, timeout=None):
+        """
+        Block until every job has a result
+
+        Returns:
+            list: Results in the order of `job_ids`
+
+        Raises:
+            RuntimeError: A job failed `max_attempts` times (see `failed`)
+            TimeoutError: Jobs are still outstanding after `timeout` seconds
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while not all(job_id in self.results for job_id in job_ids):
+                failed = [job_id for job_id in job_ids if job_id in self.failed and job_id not in self.results]
+                if failed:
+                    raise RuntimeError(f"{len(failed)} job(s) failed, e.g. job {failed[0]}: {self.failed[failed[0]]}")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    missing = sum(job_id not in self.results for job_id in job_ids)
+                    raise TimeoutError(f"{missing} job(s) still outstanding")
+                self._expire_leases()
+                self._condition.wait(self.poll_seconds if remaining is None else min(self.poll_seconds, remaining))
+            return [self.results[job_id] for job_id in job_ids]
+
+    def run(self, jobs, timeout=None):
+        """
+        Submit jobs and wait for all of their results (see wait)
+        """
+        self.submit(jobs)
+        return self.wait([job['job_id'] for job in jobs], timeout)
+
+    def wait_for_workers(self, n_workers, timeout=None):
+        with self._condition:
+            if not self._condition.wait_for(lambda: len(self.workers) >= n_workers, timeout):
+                raise TimeoutError(f"{len(self.workers)} of {n_workers} workers connected")
+
+    def _retry(self, job_id, error):
+        # Requeue a job that did not complete, or give up on it after max_attempts (lock held)
+        self.attempts[job_id] = self.attempts.get(job_id, 0) + 1
+        if self.attempts[job_id] >= self.max_attempts:
+            self.failed[job_id] = error
+            logger.error(f"❌ Job {job_id} failed {self.attempts[job_id]} time(s), giving up: {error}")
+        else:
+            self.pending.appendleft(job_id)
+            self.reassigned += 1
+        self._condition.notify_all()
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for job_id, (worker, deadline) in list(self.leases.items()):
+            if deadline < now:
+                del self.leases[job_id]
+                logger.warning(f"⚠️ Job {job_id} timed out on {worker}; reassigning")
+                self._retry(job_id, f"timed out on {worker}")
+
+    def _lease(self, worker):
+        with self._condition:
+            self._expire_leases()
+            while self.pending:
+                job_id = self.pending.popleft()
+                if job_id not in self.results:
+                    self.leases[job_id] = (worker, time.monotonic() + self.job_timeout)
+                    return self.jobs[job_id]
+            return None
+
+    def _complete(self, worker, result):
+        with self._condition:
+            job_id = result['job_id']
+            lease = self.leases.get(job_id)
+            if lease is not None and lease[0] == worker:
+                del self.leases[job_id]
+            if job_id not in self.results:
+                self.results[job_id] = result
+                self.failed.pop(job_id, None)
+                self.workers[worker] = self.workers.get(worker, 0) + 1
+                self._condition.notify_all()
+
+    def _error(self, worker, job_id, error):
+        with self._condition:
+            lease = self.leases.get(job_id)
+            if lease is None or lease[0] != worker or job_id in self.results:
+                return
+            del self.leases[job_id]
+            logger.warning(f"⚠️ Job {job_id} raised on {worker}: {error}")
+            self._retry(job_id, error)
+
+    def _release(self, worker):
+        with self._condition:
+            released = [job_id for job_id, (holder, _) in self.leases.items() if holder == worker]
+            for job_id in released:
+                del self.leases[job_id]
+                self._retry(job_id, f"{worker} disconnected")
+            self.workers.pop(worker, None)
+            self._condition.notify_all()
+        if released:
+            logger.warning(f"⚠️ {worker} disconnected holding {len(released)} job(s); reassigning")
+
+    def _serve(self, rfile, wfile, client_address):
+        # One worker connection: hello, then get/result requests until it leaves
+        with self._condition:
+            self._connections += 1
+            connection = self._connections
+        worker = f"worker-{connection}@{client_address[0]}"
+        try:
+            while True:
+                message = read_message(rfile)
+                if message['type'] == 'hello':
+                    worker = f"{message.get('name') or 'worker'}-{connection}@{client_address[0]}"
+                    with self._condition:
+                        self.workers[worker] = 0
+                        self._condition.notify_all()
+                    logger.info(f"🤝 {worker} connected")
+                    send_message(wfile, {'type': 'ok'})
+                elif message['type'] == 'get':
+                    job = self._lease(worker)
+                    if job is not None:
+                        send_message(wfile, {'type': 'job', 'job': job})
+                    elif self._stopping:
+                        send_message(wfile, {'type': 'stop'})
+                        return
+                    else:
+                        send_message(wfile, {'type': 'wait', 'seconds': self.poll_seconds})
+                elif message['type'] == 'result':
+                    self._complete(worker, message['result'])
+                    send_message(wfile, {'type': 'ok'})
+                elif message['type'] == 'error':
+                    self._error(worker, message['job_id'], message['error'])
+                    send_message(wfile, {'type': 'ok'})
+                else:
+                    raise ValueError(f"Unknown message type: {message['type']}")
+        except (ConnectionError, OSError, ValueError, KeyError) as e:
+            logger.info(f"🔌 {worker} left: {e}")
+        finally:
+            self._release(worker)
+
+
+class Worker:
+    """
+    Worker daemon: pulls jobs from a coordinator and runs them against the shared feature store
+
+    The store is read through memory maps, so several workers on one machine
+    share the page cache; on several machines the store directory is a
+    shared or replicated filesystem. Only job descriptions and per-symbol
+    result lists cross the network.
+    """
+
+    def __init__(self, host=DISTRIBUTED_HOST, port=DISTRIBUTED_PORT, store=None, name=None,
+                 connect_timeout=DISTRIBUTED_CONNECT_TIMEOUT_SECONDS):
+        """
+        Args:
+            host (str): Coordinator host
+            port (int): Coordinator port
+            store (FeatureStore): Shared store (defaults to FEATURE_STORE_DIR / FEATURE_SET in config.py)
+            name (str): Name shown in the coordinator's log (defaults to host:pid)
+            connect_timeout (float): Seconds to keep retrying an unreachable coordinator
+        """
+        self.host = host
+        self.port = port
+        self.store = store or FeatureStore()
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.connect_timeout = connect_timeout
+        self.jobs_done = 0
+        self.jobs_failed = 0
+
+    def _connect(self):
+        deadline = time.monotonic() + self.connect_timeout
+        while True:
+            try:
+                return socket.create_connection((self.host, self.port))
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.2)
+
+    def run(self):
+        """
+        Serve jobs until the coordinator says stop (reconnecting if the connection drops)
+
+        Returns:
+            int: Jobs completed
+        """
+        while True:
+            try:
+                sock = self._connect()
+            except OSError as e:
+                logger.error(f"❌ Coordinator {self.host}:{self.port} unreachable: {e}")
+                return self.jobs_done
+            try:
+                with sock, sock.makefile("rb") as rfile, sock.makefile("wb") as wfile:
+                    send_message(wfile, {'type': 'hello', 'name': self.name})
+                    read_message(rfile)
+                    while True:
+                        send_message(wfile, {'type': 'get'})
+                        message = read_message(rfile)
+                        if message['type'] == 'stop':
+                            logger.info(f"🛑 {self.name} stopping after {self.jobs_done} job(s)")
+                            return self.jobs_done
+                        if message['type'] == 'wait':
+                            time.sleep(message['seconds'])
+                            continue
+                        job = message['job']
+                        try:
+                            reply = {'type': 'result', 'result': run_job(self.store, job)}
+                        except Exception as e:
+                            # A bad job (missing symbol or column file, ...) must not look like a lost connection
+                            logger.error(f"❌ Job {job['job_id']} failed on {self.name}: {e}")
+                            reply = {'type': 'error', 'job_id': job['job_id'], 'error': f"{type(e).__name__}: {e}"}
+                        send_message(wfile, reply)
+                        read_message(rfile)
+                        if reply['type'] == 'result':
+                            self.jobs_done += 1
+                        else:
+                            self.jobs_failed += 1
+            except (ConnectionError, OSError) as e:
+                logger.warning(f"⚠️ {self.name} lost the coordinator ({e}); reconnecting")
+
+
+def start_local_workers(n_workers, address, store_root, feature_set=FEATURE_SET):
+    """
+    Start worker daemons as local subprocesses (python -m strategies.distributed worker ...)
+
+    Returns:
+        list: subprocess.Popen handles
+    """
+    command = [sys.executable, "-m", "strategies.distributed", "worker", f"{address[0]}:{address[1]}", store_root, feature_set]
+    return [subprocess.Popen(command, cwd=project_root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            for _ in range(n_workers)]
+
+
+def build_synthetic_store(store_root, n_symbols, period, seed=0):
+    """
+    Write a synthetic universe (utils.synthetic_data) into a feature store
+
+    Returns:
+        FeatureStore: The populated store
+    """
+    from utils.synthetic_data import generate_universe
+    store = FeatureStore(store_root)
+    for symbol, bars in generate_universe(n_symbols, period, seed=seed).items():
+        store.write(symbol, bars)
+    return store
+
+
+if __name__ == "__main__":
+    # Run from the project root:
+    #   python -m strategies.distributed worker [host:port] [store_dir] [feature_set]
+    #   python -m strategies.distributed bench [n_symbols] [period] [workers,...]
+    mode = sys.argv[1] if len(sys.argv) > 1 else "bench"
+
+    if mode == "worker":
+        host, port = (sys.argv[2] if len(sys.argv) > 2 else f"{DISTRIBUTED_HOST}:{DISTRIBUTED_PORT}").rsplit(":", 1)
+        store = FeatureStore(sys.argv[3] if len(sys.argv) > 3 else FEATURE_STORE_DIR,
+                             sys.argv[4] if len(sys.argv) > 4 else FEATURE_SET)
+        Worker(host, int(port), store).run()
+        sys.exit(0)
+
+    import tempfile
+
+    n_symbols = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    period = sys.argv[3] if len(sys.argv) > 3 else "10y"
+    worker_counts = [int(w) for w in (sys.argv[4] if len(sys.argv) > 4 else "1,2,4").split(",")]
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as store_root:
+        start = time.perf_counter()
+        store = build_synthetic_store(store_root, n_symbols, period)
+        symbols = store.symbols()
+        index, _ = store.arrays(symbols[0], ['Close'])
+        middle = pd.Timestamp(index[len(index) // 2])
+        print(f"🗃️ Feature store with {n_symbols} symbols x {len(index):,} bars built in {time.perf_counter() - start:.1f} s; "
+              f"{os.cpu_count()} CPU(s)")
+
+        param_sets = [{'rsi_buy_threshold': buy, 'rsi_sell_threshold': sell, 'sma_long': sma_long}
+                      for buy, sell, sma_long in itertools.product([30, 40, 50], [50, 60, 70], ['SMA_50', 'SMA_200'])]
+        jobs = sweep_jobs(symbols, param_sets, [(None, middle), (middle, None)], shard_size=max(1, n_symbols // 8))
+        backtests = sum(len(job['symbols']) for job in jobs)
+
+        start = time.perf_counter()
+        reference = sweep_frame(jobs, [run_job(store, job) for job in jobs])
+        rate = backtests / (time.perf_counter() - start)
+        print(f"📋 {len(jobs)} jobs ({len(param_sets)} parameter sets x 2 date ranges x {n_symbols} symbols), "
+              f"{reference['total_trades'].sum():,} trades; in-process: {rate:,.0f} backtests/s")
+
+        rates = {}
+        for n_workers in worker_counts + [max(worker_counts)]:
+            failure = len(rates) == len(worker_counts)
+            coordinator = Coordinator(port=0, job_timeout=60, poll_seconds=0.2).start()
+            processes = start_local_workers(n_workers, coordinator.address, store_root)
+            try:
+                coordinator.wait_for_workers(n_workers, timeout=120)
+                start = time.perf_counter()
+                coordinator.submit(jobs)
+                if failure:
+                    # Kill one worker once results are flowing; the job it holds is reassigned
+                    coordinator.wait(list(range(len(jobs) // 4)), timeout=600)
+                    processes[0].kill()
+                results = coordinator.wait([job['job_id'] for job in jobs], timeout=600)
+                seconds = time.perf_counter() - start
+            finally:
+                coordinator.stop()
+                for process in processes:
+                    try:
+                        process.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        process.kill()
+            pd.testing.assert_frame_equal(sweep_frame(jobs, results), reference)
+            rate = backtests / seconds
+            if failure:
+                print(f"💥 {n_workers} worker(s), one killed mid-sweep: {seconds:6.2f} s, {rate:9,.0f} backtests/s, "
+                      f"{coordinator.reassigned} job(s) reassigned, results identical")
+            else:
+                rates[n_workers] = rate
+                speedup = f", {rate / rates[1]:.2f}x vs. 1 worker" if n_workers > 1 and 1 in rates else ""
+                print(f"⚡ {n_workers} worker(s): {seconds:6.2f} s, {rate:9,.0f} backtests/s{speedup}")
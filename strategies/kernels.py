@@ -0,0 +1,135 @@
+import numpy as np
+
+# Signal codes of the array kernels (and of compact frames; regular frames hold the labels)
+HOLD, BUY, SELL = 0, 1, 2
+SIGNAL_LABELS = np.array(['HOLD', 'BUY', 'SELL'], dtype=object)
+
+
+def signal_codes(rsi, sma_short, sma_long, rsi_buy_threshold=30, rsi_sell_threshold=70):
+    """
+    Vectorized AssignmentTradingStrategy.generate_signals rule
+
+    Bar i is a BUY when RSI < buy threshold and the short SMA crosses above
+    the long SMA between bars i-1 and i; otherwise a SELL when RSI > sell
+    threshold or the short SMA crosses below. The first bar is always HOLD.
+
+    Args:
+        rsi, sma_short, sma_long (np.ndarray): Indicator series (NaN during warm-up); 2-D panels
+            are processed row by row along the last (time) axis
+        rsi_buy_threshold (float): RSI threshold for buy signal
+        rsi_sell_threshold (float): RSI threshold for sell signal
+
+    Returns:
+        tuple: (int8 signal codes, signal strength in the RSI dtype), both shaped like rsi
+    """
+    # Inputs keep their dtype: float32 panels are compared and scored in float32
+    rsi, sma_short, sma_long = np.asarray(rsi), np.asarray(sma_short), np.asarray(sma_long)
+    codes = np.zeros(rsi.shape, dtype=np.int8)
+    strength = np.zeros(rsi.shape, dtype=rsi.dtype)
+    if rsi.shape[-1] < 2:
+        return codes, strength
+
+    current = rsi[..., 1:]
+    prev_short, prev_long = sma_short[..., :-1], sma_long[..., :-1]
+    cur_short, cur_long = sma_short[..., 1:], sma_long[..., 1:]
+    buy = (current < rsi_buy_threshold) & (prev_short <= prev_long) & (cur_short > cur_long)
+    sell = ~buy & ((current > rsi_sell_threshold) | ((prev_short >= prev_long) & (cur_short < cur_long)))
+
+    codes[..., 1:][buy] = BUY
+    codes[..., 1:][sell] = SELL
+    strength[..., 1:][buy] = (rsi_buy_threshold - current[buy]) / rsi_buy_threshold
+    strength[..., 1:][sell] = (current[sell] - rsi_sell_threshold) / (100 - rsi_sell_threshold)
+    return codes, strength
+
+
+def backtest_arrays(close, codes, initial_capital=10000):
+    """
+    Array version of AssignmentTradingStrategy.backtest_strategy
+
+    Same accounting (all-in buy when flat, sell everything when holding),
+    with the same floating-point operations, so values match the
+    DataFrame backtest exactly. Only bars carrying a signal are visited.
+    Cash, shares and P&L are always float64, also for float32 prices.
+
+    Args:
+        close (np.ndarray): Close prices
+        codes (np.ndarray): Signal codes (see signal_codes)
+        initial_capital (float): Initial capital for backtesting
+
+    Returns:
+        tuple: (portfolio values, shares held, trades as (bar, action, price, shares, value, pnl or None))
+    """
+    close = np.asarray(close)
+    n = len(close)
+    capital = initial_capital
+    shares = 0
+    buy_price = 0
+    trades = []
+    held = np.zeros(n, dtype=bool)
+    shares_held = np.zeros(n)
+    cash_changes = [0]
+    cash_levels = [float(initial_capital)]
+    entry = 0
+
+    for i in np.flatnonzero(codes):
+        current_price = float(close[i])
+        if codes[i] == BUY and shares == 0:
+            shares = capital / current_price
+            buy_price = current_price
+            capital = 0
+            entry = i
+            trades.append((i, 'BUY', current_price, shares, shares * current_price, None))
+        elif codes[i] == SELL and shares > 0:
+            sell_value = shares * current_price
+            capital = sell_value
+            trades.append((i, 'SELL', current_price, shares, sell_value, sell_value - (shares * buy_price)))
+            held[entry:i] = True
+            shares_held[entry:i] = shares
+            shares = 0
+            buy_price = 0
+        else:
+            continue
+        cash_changes.append(i)
+        cash_levels.append(float(capital))
+    if shares > 0:
+        held[entry:] = True
+        shares_held[entry:] = shares
+
+    # Cash between trades is a step function; while holding, cash is 0 and value = shares x price
+    cash = np.asarray(cash_levels)[np.searchsorted(cash_changes, np.arange(n), side='right') - 1]
+    values = np.where(held, cash + shares_held * close, cash)
+    return values, shares_held, trades
+
+
+def backtest_metrics(trades, final_value, initial_capital=10000):
+    """
+    Performance summary of a backtest (the backtest_strategy result fields)
+
+    Args:
+        trades (list): Trade dicts; closed trades carry 'P&L'
+        final_value (float): Portfolio value at the last bar
+        initial_capital (float): Initial capital for backtesting
+
+    Returns:
+        dict: initial_capital, final_value, total_return, total_pnl, win_rate, total_trades, winning_trades, trades
+    """
+    total_return = ((final_value - initial_capital) / initial_capital) * 100
+
+    # Calculate win rate
+    closed_trades = [t for t in trades if 'P&L' in t]
+    winning_trades = [t for t in trades if t.get('P&L', 0) > 0]
+    win_rate = (len(winning_trades) / len(closed_trades)) * 100 if len(closed_trades) > 0 else 0
+
+    # Calculate total P&L
+    total_pnl = sum([t.get('P&L', 0) for t in trades])
+
+    return {
+        'initial_capital': initial_capital,
+        'final_value': final_value,
+        'total_return': total_return,
+        'total_pnl': total_pnl,
+        'win_rate': win_rate,
+        'total_trades': len(closed_trades),
+        'winning_trades': len(winning_trades),
+        'trades': trades,
+    }
@@ -0,0 +1,164 @@
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.compact import epochs_to_index, index_epochs
+from utils.synthetic_data import BAR_COLUMNS, period_to_bars, stream_bars, synthetic_symbols
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDICATOR_COLUMNS = ["RSI", "SMA_20", "SMA_50", "MACD", "MACD_Signal", "OBV", "BB_High", "BB_Low"]
+
+
+class PricePanel:
+    """
+    Bars and indicators of a whole universe on one time axis
+
+    Each column is one (n_symbols, n_bars) array, one row per symbol, so a
+    symbol's history is contiguous and the latest bar of every symbol is a
+    single column slice. Symbols without a bar at some time hold NaN there.
+    """
+
+    def __init__(self, symbols, index, columns, tz=None):
+        """
+        Args:
+            symbols (list): Row labels
+            index (np.ndarray): Bar times as int64 epoch nanoseconds (UTC)
+            columns (dict): Column name -> (n_symbols, n_bars) array
+            tz (str): Time zone of the bars
+        """
+        self.symbols = list(symbols)
+        self.index = np.asarray(index, dtype=np.int64)
+        self.columns = dict(columns)
+        self.tz = tz
+        self._rows = {symbol: row for row, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_frames(cls, frames, columns=BAR_COLUMNS, dtype=np.float64):
+        """
+        Stack per-symbol frames (yfinance layout) on the union of their timestamps
+
+        Args:
+            frames (dict): Symbol -> DataFrame with a tz-aware DatetimeIndex
+            columns (list): Columns to stack
+            dtype: Panel dtype
+
+        Returns:
+            PricePanel: Panel of the given columns
+        """
+        index = None
+        for df in frames.values():
+            index = df.index if index is None else index.union(df.index)
+        arrays = {column: np.full((len(frames), len(index)), np.nan, dtype=dtype) for column in columns}
+        for row, df in enumerate(frames.values()):
+            positions = index.get_indexer(df.index)
+            for column in columns:
+                arrays[column][row, positions] = df[column].to_numpy()
+        epochs, tz = index_epochs(index)
+        return cls(list(frames), epochs, arrays, tz)
+
+    @classmethod
+    def synthetic(cls, n_symbols, period="6mo", seed=0, dtype=np.float64):
+        """
+        Panel of a synthetic daily universe (see utils.synthetic_data), filled straight from the generator
+        """
+        arrays = None
+        for symbol_ids, offset, timestamps, bars in stream_bars(n_symbols, period_to_bars(period), seed=seed):
+            if arrays is None:
+                arrays = {column: np.empty((n_symbols, len(timestamps)), dtype=dtype) for column in BAR_COLUMNS}
+                epochs, tz = index_epochs(timestamps)
+            for column in BAR_COLUMNS:
+                arrays[column][symbol_ids, offset:offset + len(timestamps)] = bars[column]
+        return cls(synthetic_symbols(n_symbols), epochs, arrays, tz)
+
+    @property
+    def n_bars(self):
+        return len(self.index)
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self.columns.values()) + self.index.nbytes
+
+    def row(self, symbol):
+        return self._rows[symbol]
+
+    def latest(self, columns=None, offset=1):
+        """
+        One column slice per column: the value `offset` bars from the end for every symbol
+
+        Returns:
+            dict: Column name -> (n_symbols,) array
+        """
+        return {column: self.columns[column][:, -offset] for column in (columns or self.columns)}
+
+    def frame(self, symbol):
+        """
+        One symbol's rows as a DataFrame (tz-aware index, bars without data dropped)
+        """
+        row = self._rows[symbol]
+        df = pd.DataFrame({column: values[row] for column, values in self.columns.items()},
+                          index=epochs_to_index(self.index, self.tz))
+        return df[~np.isnan(df['Close'].to_numpy())]
+
+
+def add_indicators(panel, sma_short=20, sma_long=50):
+    """
+    Add the AssignmentTradingStrategy.calculate_indicators columns to a panel
+
+    Same formulas and warm-up as the `ta` calls, evaluated on the whole
+    (bars x symbols) matrix at once instead of symbol by symbol. Indicators
+    are computed in float64 and stored in the panel's dtype.
+
+    Args:
+        panel (PricePanel): Panel with Close and Volume
+        sma_short (int): Short-term SMA period (stored as SMA_20)
+        sma_long (int): Long-term SMA period (stored as SMA_50)
+
+    Returns:
+        PricePanel: The same panel, with INDICATOR_COLUMNS added
+    """
+    dtype = panel.columns['Close'].dtype
+    close = pd.DataFrame(panel.columns['Close'].T, dtype=np.float64)
+    volume = pd.DataFrame(panel.columns['Volume'].T, dtype=np.float64)
+
+    # RSI (Wilder smoothing)
+    diff = close.diff(1)
+    emaup = diff.where(diff > 0, 0.0).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    emadn = (-diff.where(diff < 0, 0.0)).ewm(alpha=1 / 14, min_periods=14, adjust=False).mean()
+    rsi = np.where(emadn == 0, 100, 100 - (100 / (1 + emaup / emadn)))
+
+    # MACD
+    macd = (close.ewm(span=12, min_periods=12, adjust=False).mean()
+            - close.ewm(span=26, min_periods=26, adjust=False).mean())
+    macd_signal = macd.ewm(span=9, min_periods=9, adjust=False).mean()
+
+    # OBV
+    obv = pd.DataFrame(np.where(close < close.shift(1), -volume, volume)).cumsum()
+
+    # Bollinger Bands
+    mavg = close.rolling(20, min_periods=20).mean()
+    mstd = close.rolling(20, min_periods=20).std(ddof=0)
+
+    computed = {
+        'RSI': rsi,
+        'SMA_20': close.rolling(sma_short, min_periods=sma_short).mean(),
+        'SMA_50': close.rolling(sma_long, min_periods=sma_long).mean(),
+        'MACD': macd,
+        'MACD_Signal': macd_signal,
+        'OBV': obv,
+        'BB_High': mavg + 2 * mstd,
+        'BB_Low': mavg - 2 * mstd,
+    }
+    for column, values in computed.items():
+        panel.columns[column] = np.ascontiguousarray(np.asarray(values, dtype=np.float64).T, dtype=dtype)
+    return panel
@@ -0,0 +1,252 @@
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from strategies.kernels import backtest_arrays, signal_codes
+from utils.config import SHARDED_SCAN_SHARD_SIZE, SHARDED_SCAN_WORKERS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Panel columns the scan reads
+SCAN_COLUMNS = ["Close", "RSI", "SMA_20", "SMA_50"]
+
+# Per-symbol result arrays returned by the workers
+RESULT_DTYPES = {
+    'final_value': np.float64,
+    'total_pnl': np.float64,
+    'total_trades': np.int32,
+    'winning_trades': np.int32,
+    'signal': np.int8,
+    'signal_strength': np.float64,
+}
+
+_ALIGNMENT = 64
+
+# Worker side: the panel block currently attached (name, SharedMemory, column views)
+_attached = None
+
+
+class SharedPanel:
+    """
+    Panel columns copied once into a shared memory block
+
+    Workers attach by name and read zero-copy views; only the small
+    descriptor (block name, dtypes, shapes, offsets) is pickled to them.
+    """
+
+    def __init__(self, panel, columns=SCAN_COLUMNS):
+        arrays = [np.ascontiguousarray(panel.columns[column]) for column in columns]
+        offsets, size = [], 0
+        for values in arrays:
+            offsets.append(size)
+            size += math.ceil(values.nbytes / _ALIGNMENT) * _ALIGNMENT
+        self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self.descriptor = {'name': self.shm.name, 'columns': {}}
+        for column, values, offset in zip(columns, arrays, offsets):
+            view = np.ndarray(values.shape, dtype=values.dtype, buffer=self.shm.buf, offset=offset)
+            view[...] = values
+            self.descriptor['columns'][column] = (values.dtype.str, values.shape, offset)
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _attach(descriptor):
+    global _attached
+    if _attached is None or _attached[0] != descriptor['name']:
+        if _attached is not None:
+            _attached[1].close()
+        # Spawned workers share the coordinator's resource tracker, which already tracks the block
+        shm = shared_memory.SharedMemory(name=descriptor['name'])
+        views = {
+            column: np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            for column, (dtype, shape, offset) in descriptor['columns'].items()
+        }
+        _attached = (descriptor['name'], shm, views)
+    return _attached[2]
+
+
+def scan_rows(columns, start, stop, params):
+    """
+    Signals and backtests of panel rows [start, stop)
+
+    Bars where a symbol has no data (NaN close, e.g. a symbol missing from
+    part of the union calendar) are dropped before signals are computed, so
+    crossovers compare consecutive bars of the symbol as in the per-symbol
+    path. Shards without gaps are signalled in one 2-D pass.
+
+    Args:
+        columns (dict): Column name -> (n_symbols, n_bars) array (SCAN_COLUMNS)
+        start, stop (int): Row range
+        params (dict): rsi_buy_threshold, rsi_sell_threshold, initial_capital
+
+    Returns:
+        dict: RESULT_DTYPES arrays of length stop - start
+    """
+    rsi, sma_short, sma_long = (columns[column][start:stop] for column in ['RSI', 'SMA_20', 'SMA_50'])
+    close = columns['Close'][start:stop]
+    thresholds = (params['rsi_buy_threshold'], params['rsi_sell_threshold'])
+    gaps = np.isnan(close)
+    if not gaps.any():
+        codes, strength = signal_codes(rsi, sma_short, sma_long, *thresholds)
+
+    out = {name: np.zeros(stop - start, dtype=dtype) for name, dtype in RESULT_DTYPES.items()}
+    for offset in range(stop - start):
+        if gaps.any():
+            valid = ~gaps[offset]
+            prices = close[offset][valid]
+            row_codes, row_strength = signal_codes(rsi[offset][valid], sma_short[offset][valid],
+                                                   sma_long[offset][valid], *thresholds)
+        else:
+            prices, row_codes, row_strength = close[offset], codes[offset], strength[offset]
+        values, _, trades = backtest_arrays(prices, row_codes, params['initial_capital'])
+        pnl = [trade[5] for trade in trades if trade[5] is not None]
+        out['final_value'][offset] = values[-1] if len(values) else params['initial_capital']
+        out['total_pnl'][offset] = sum(pnl)
+        out['total_trades'][offset] = len(pnl)
+        out['winning_trades'][offset] = sum(p > 0 for p in pnl)
+        if len(prices):
+            out['signal'][offset] = row_codes[-1]
+            out['signal_strength'][offset] = row_strength[-1]
+    return out
+
+
+def _scan_shard(descriptor, start, stop, params):
+    return start, scan_rows(_attach(descriptor), start, stop, params)
+
+
+class ShardedScanner:
+    """
+    Scans a PricePanel's symbols in shards on a pool of worker processes
+
+    The coordinator places the scanned columns in shared memory, workers
+    run signal generation and backtests on zero-copy views of their rows
+    and return compact per-symbol arrays. The pool is started on the first
+    scan and reused until close(). With workers=0 shards run in-process.
+    """
+
+    def __init__(self, workers=SHARDED_SCAN_WORKERS, shard_size=SHARDED_SCAN_SHARD_SIZE):
+        """
+        Args:
+            workers (int): Worker processes (0 runs the shards in this process)
+            shard_size (int): Symbols per task
+        """
+        self.workers = workers
+        self.shard_size = shard_size
+        self._pool = None
+
+    def scan(self, panel, rsi_buy_threshold=30, rsi_sell_threshold=70, initial_capital=10000):
+        """
+        Scan every symbol of a panel
+
+        Args:
+            panel (PricePanel): Panel with Close, RSI, SMA_20 and SMA_50
+            rsi_buy_threshold (float): RSI threshold for buy signal
+            rsi_sell_threshold (float): RSI threshold for sell signal
+            initial_capital (float): Initial capital for backtesting
+
+        Returns:
+            dict: RESULT_DTYPES arrays (one entry per panel symbol) plus total_return and win_rate
+        """
+        params = {'rsi_buy_threshold': rsi_buy_threshold, 'rsi_sell_threshold': rsi_sell_threshold,
+                  'initial_capital': initial_capital}
+        n_symbols = len(panel.symbols)
+        shards = [(start, min(start + self.shard_size, n_symbols)) for start in range(0, n_symbols, self.shard_size)]
+        results = {name: np.zeros(n_symbols, dtype=dtype) for name, dtype in RESULT_DTYPES.items()}
+
+        if self.workers == 0:
+            for start, stop in shards:
+                for name, values in scan_rows(panel.columns, start, stop, params).items():
+                    results[name][start:stop] = values
+        else:
+            if self._pool is None:
+                # Spawned workers, as in models/hyperparam_search.py; the pool is reused across scans
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            with SharedPanel(panel) as shared:
+                futures = [self._pool.submit(_scan_shard, shared.descriptor, start, stop, params)
+                           for start, stop in shards]
+                for future in futures:
+                    start, shard = future.result()
+                    for name, values in shard.items():
+                        results[name][start:start + len(values)] = values
+
+        results['total_return'] = (results['final_value'] - initial_capital) / initial_capital * 100
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results['win_rate'] = np.where(results['total_trades'] > 0,
+                                           results['winning_trades'] / results['total_trades'] * 100, 0.0)
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m strategies.sharded_scan [n_symbols] [period] [workers,...]
+    import pickle
+    from strategies.panel import PricePanel, add_indicators
+
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    period = sys.argv[2] if len(sys.argv) > 2 else "10y"
+    worker_counts = [int(w) for w in (sys.argv[3] if len(sys.argv) > 3 else "0,1,2,4").split(",")]
+    rounds = 3
+
+    start = time.perf_counter()
+    panel = add_indicators(PricePanel.synthetic(n_symbols, period))
+    print(f"📊 {n_symbols:,} symbols x {panel.n_bars:,} bars ({panel.nbytes / 1e6:,.0f} MB panel) "
+          f"built in {time.perf_counter() - start:.1f} s; {os.cpu_count()} CPU(s)")
+
+    # What shipping per-symbol frames to workers would cost instead of shared memory
+    start = time.perf_counter()
+    pickled = sum(len(pickle.dumps(panel.frame(symbol)[SCAN_COLUMNS])) for symbol in panel.symbols[:200])
+    pickle_seconds = (time.perf_counter() - start) * n_symbols / min(200, n_symbols)
+    start = time.perf_counter()
+    SharedPanel(panel).close()
+    print(f"📦 Pickling per-symbol frames: ~{pickle_seconds:.2f} s, {pickled * n_symbols / min(200, n_symbols) / 1e6:,.0f} MB; "
+          f"shared-memory copy: {time.perf_counter() - start:.2f} s")
+
+    reference = None
+    rates = {}
+    for workers in worker_counts:
+        with ShardedScanner(workers) as scanner:
+            scanner.scan(panel)  # Start the pool and import the kernels in every worker
+            best = float("inf")
+            for _ in range(rounds):
+                start = time.perf_counter()
+                results = scanner.scan(panel)
+                best = min(best, time.perf_counter() - start)
+        if reference is None:
+            reference = results
+        assert all(np.array_equal(reference[name], results[name]) for name in RESULT_DTYPES)
+        rates[workers] = rate = n_symbols / best
+        speedup = f", {rate / rates[1]:.2f}x vs. 1 worker" if workers > 1 and 1 in rates else ""
+        label = "in-process" if workers == 0 else f"{workers} worker(s)"
+        print(f"⚡ {label:>12}: {best:6.2f} s per scan, {rate:9,.0f} symbols/s{speedup}")
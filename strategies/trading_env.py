@@ -0,0 +1,304 @@
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from models.dataset import scale_per_symbol, sliding_windows
+from utils.feature_store import load_features
+from utils.config import (
+    RL_EPISODE_LENGTH, RL_FEATURES, RL_NUM_ENVS, RL_OBSERVATION_WINDOW, RL_SYMBOLS, RL_TRANSACTION_COST
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# gymnasium (stable-baselines3 >= 2) or gym spaces when installed; the env itself needs neither
+try:
+    from gymnasium import spaces
+except ImportError:
+    try:
+        from gym import spaces
+    except ImportError:
+        spaces = None
+
+try:
+    from stable_baselines3.common.vec_env import VecEnv
+except ImportError:
+    VecEnv = None
+
+# Discrete actions, in the same terms as the strategy signals
+HOLD, BUY, SELL = 0, 1, 2
+
+
+class _Box:
+    """Minimal stand-in for gym.spaces.Box when gym is not installed"""
+
+    def __init__(self, low, high, shape, dtype):
+        self.low, self.high, self.shape, self.dtype = low, high, shape, np.dtype(dtype)
+
+    def sample(self):
+        return np.random.standard_normal(self.shape).astype(self.dtype)
+
+
+class _Discrete:
+    """Minimal stand-in for gym.spaces.Discrete when gym is not installed"""
+
+    def __init__(self, n):
+        self.n, self.shape, self.dtype = n, (), np.dtype(np.int64)
+
+    def sample(self):
+        return int(np.random.randint(self.n))
+
+
+class _VecEnvBase:
+    """Same constructor and step() as stable_baselines3's VecEnv, used when it is not installed"""
+
+    def __init__(self, num_envs, observation_space, action_space):
+        self.num_envs = num_envs
+        self.observation_space = observation_space
+        self.action_space = action_space
+
+    def step(self, actions):
+        self.step_async(actions)
+        return self.step_wait()
+
+
+class VectorizedTradingEnv(VecEnv or _VecEnvBase):
+    """
+    Thousands of trading episodes stepped in lockstep over shared feature arrays
+
+    Every symbol's scaled features and closes are concatenated once into flat
+    arrays; an episode is only a row pointer into them plus its own cash and
+    shares. A step applies all actions, advances every pointer and gathers
+    the next observations with a handful of array operations, so the cost
+    per step barely depends on how many episodes run.
+
+    Trades follow AssignmentTradingStrategy.backtest_strategy: BUY invests all
+    cash at the bar's close when flat, SELL liquidates at the close when long,
+    other actions hold. The reward is the change in portfolio value over the
+    next bar as a fraction of the initial capital, so an episode's rewards sum
+    to its backtest total return.
+
+    Implements the stable-baselines3 VecEnv interface (reset / step_async /
+    step_wait / get_attr / ...): finished episodes restart automatically and
+    report `terminal_observation` and an `episode` summary in their info dict.
+    """
+
+    def __init__(self, frames, features=RL_FEATURES, num_envs=RL_NUM_ENVS, episode_length=RL_EPISODE_LENGTH,
+                 window=RL_OBSERVATION_WINDOW, initial_capital=10000, transaction_cost=RL_TRANSACTION_COST,
+                 train_fraction=0.8, seed=None):
+        """
+        Args:
+            frames (dict): Symbol -> DataFrame with a Close column and the feature columns
+            features (list): Observation features (min-max scaled per symbol on its training rows)
+            num_envs (int): Episodes run in lockstep
+            episode_length (int): Steps per episode
+            window (int): Bars of features in each observation
+            initial_capital (float): Starting cash of every episode
+            transaction_cost (float): Fraction of the traded value paid per buy/sell
+            train_fraction (float): Share of each symbol's rows the feature scaler is fitted on
+            seed (int): Seed for episode start sampling
+        """
+        self.features = list(features)
+        self.episode_length = int(episode_length)
+        self.window = int(window)
+        self.initial_capital = float(initial_capital)
+        self.transaction_cost = float(transaction_cost)
+
+        scaled, self.scalers = scale_per_symbol(frames, self.features, self.window, train_fraction)
+        self.symbols = [s for s in frames if s in scaled and len(scaled[s]) >= self.window + self.episode_length]
+        if not self.symbols:
+            raise ValueError(f"No symbol has the {self.window + self.episode_length} rows an episode needs")
+        for symbol in set(frames) - set(self.symbols):
+            logger.warning(f"⚠️ Skipping {symbol}: too short for {self.episode_length}-step episodes")
+
+        lengths = np.array([len(scaled[s]) for s in self.symbols])
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        self._windows = sliding_windows(np.concatenate([scaled[s] for s in self.symbols]), self.window)
+        self._close = np.concatenate([frames[s]['Close'].to_numpy(dtype=np.float64) for s in self.symbols])
+        # Valid episode start rows per symbol: a full window behind, episode_length bars ahead
+        self._first_start = offsets + self.window - 1
+        self._n_starts = lengths - self.window - self.episode_length + 1
+        self._start_weights = self._n_starts / self._n_starts.sum()
+
+        n_obs = self.window * len(self.features) + 2
+        if spaces is not None:
+            observation_space = spaces.Box(low=-np.inf, high=np.inf, shape=(n_obs,), dtype=np.float32)
+            action_space = spaces.Discrete(3)
+        else:
+            observation_space = _Box(-np.inf, np.inf, (n_obs,), np.float32)
+            action_space = _Discrete(3)
+        super().__init__(num_envs, observation_space, action_space)
+
+        self._rng = np.random.default_rng(seed)
+        self._actions = np.zeros(num_envs, dtype=np.int64)
+        self._symbol = np.zeros(num_envs, dtype=np.int64)
+        self._row = np.zeros(num_envs, dtype=np.int64)
+        self._steps = np.zeros(num_envs, dtype=np.int64)
+        self._cash = np.zeros(num_envs)
+        self._shares = np.zeros(num_envs)
+        self._entry_price = np.zeros(num_envs)
+        self._start(np.arange(num_envs))
+
+    @classmethod
+    def from_feature_store(cls, symbols=RL_SYMBOLS, features=RL_FEATURES, **kwargs):
+        """
+        Build the environment from the feature store (indicator warm-up rows dropped)
+
+        Args:
+            symbols (list): Feature-store keys
+            features (list): Observation features
+            **kwargs: Other VectorizedTradingEnv arguments
+
+        Returns:
+            VectorizedTradingEnv: The environment
+        """
+        frames = {symbol: load_features(symbol, ['Close'] + [f for f in features if f != 'Close'])
+                  for symbol in symbols}
+        return cls(frames, features, **kwargs)
+
+    def _start(self, envs):
+        # New episodes at random (symbol, start row), weighted by how many starts each symbol has
+        symbol = self._rng.choice(len(self.symbols), size=len(envs), p=self._start_weights)
+        self._symbol[envs] = symbol
+        self._row[envs] = self._first_start[symbol] + (self._rng.random(len(envs)) * self._n_starts[symbol]).astype(np.int64)
+        self._steps[envs] = 0
+        self._cash[envs] = self.initial_capital
+        self._shares[envs] = 0.0
+        self._entry_price[envs] = 0.0
+
+    def _observations(self, envs=None):
+        rows = self._row if envs is None else self._row[envs]
+        shares = self._shares if envs is None else self._shares[envs]
+        entry_price = self._entry_price if envs is None else self._entry_price[envs]
+        observations = np.empty((len(rows), self.observation_space.shape[0]), dtype=np.float32)
+        observations[:, :-2] = self._windows[rows - self.window + 1].reshape(len(rows), -1)
+        long = shares > 0
+        observations[:, -2] = long
+        observations[:, -1] = np.where(long, self._close[rows] / np.where(long, entry_price, 1.0) - 1, 0.0)
+        return observations
+
+    def portfolio_values(self):
+        """
+        Current portfolio value of every episode
+
+        Returns:
+            np.ndarray: (num_envs,) cash + shares * close
+        """
+        return self._cash + self._shares * self._close[self._row]
+
+    def reset(self):
+        """
+        Start a new episode in every env
+
+        Returns:
+            np.ndarray: (num_envs, n_obs) float32 observations
+        """
+        self._start(np.arange(self.num_envs))
+        return self._observations()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        """
+        Trade at the current close, then move every episode one bar ahead
+
+        Returns:
+            tuple: (observations, rewards, dones, infos)
+        """
+        price = self._close[self._row]
+        value_before = self._cash + self._shares * price
+
+        buy = (self._actions == BUY) & (self._shares == 0)
+        sell = (self._actions == SELL) & (self._shares > 0)
+        self._shares[buy] = self._cash[buy] * (1 - self.transaction_cost) / price[buy]
+        self._entry_price[buy] = price[buy]
+        self._cash[buy] = 0.0
+        self._cash[sell] = self._shares[sell] * price[sell] * (1 - self.transaction_cost)
+        self._shares[sell] = 0.0
+        self._entry_price[sell] = 0.0
+
+        self._row += 1
+        self._steps += 1
+        value_after = self._cash + self._shares * self._close[self._row]
+        rewards = ((value_after - value_before) / self.initial_capital).astype(np.float32)
+
+        dones = self._steps >= self.episode_length
+        infos = [{} for _ in range(self.num_envs)]
+        if dones.any():
+            finished = np.flatnonzero(dones)
+            terminal = self._observations(finished)
+            for i, env in enumerate(finished):
+                # Episodes end on the time limit, not on a terminal market state
+                infos[env]['terminal_observation'] = terminal[i]
+                infos[env]['TimeLimit.truncated'] = True
+                infos[env]['episode'] = {'r': value_after[env] / self.initial_capital - 1,
+                                         'l': int(self._steps[env])}
+            self._start(finished)
+        return self._observations(), rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def seed(self, seed=None):
+        self._rng = np.random.default_rng(seed)
+        return [seed] * self.num_envs
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        return [indices] if isinstance(indices, int) else indices
+
+    def get_attr(self, attr_name, indices=None):
+        # All episodes share one object, so every env reports the same attribute
+        return [getattr(self, attr_name) for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return [getattr(self, method_name)(*method_args, **method_kwargs) for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
+
+
+def measure_throughput(env, steps=200, seed=0):
+    """
+    Environment steps per second under uniformly random actions
+
+    Args:
+        env (VectorizedTradingEnv): Environment (reset here)
+        steps (int): Lockstep iterations timed
+        seed (int): Action sampling seed
+
+    Returns:
+        float: Single-episode steps per second (iterations * num_envs / seconds)
+    """
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, 3, size=(steps, env.num_envs))
+    env.reset()
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step_async(step_actions)
+        env.step_wait()
+    return steps * env.num_envs / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m strategies.trading_env [num_envs]
+    num_envs = int(sys.argv[1]) if len(sys.argv) > 1 else RL_NUM_ENVS
+    print(f"🎮 Trading env on {RL_SYMBOLS}: {len(RL_FEATURES)} features x {RL_OBSERVATION_WINDOW} bars, "
+          f"{RL_EPISODE_LENGTH}-step episodes")
+    for n in sorted({1, 64, num_envs}):
+        env = VectorizedTradingEnv.from_feature_store(num_envs=n, seed=0)
+        print(f"  {n:>6} envs: {measure_throughput(env):>12,.0f} steps/s")
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compact frame test: float32/int8 frames reproduce the float64 strategy within float32 precision
+"""
+
+import sys
+import os
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from strategies.assignment_strategy import AssignmentTradingStrategy
+from utils.compact import expand_frame, frame_bytes, is_compact
+from utils.result_store import SeriesSpill
+from utils.synthetic_data import SyntheticDataFetcher, generate_universe
+
+
+def test_compact_frames_match_float64(tmp_path):
+    """
+    Same signals, P&L within float32 price precision, less than half the memory, lossless index
+    """
+    universe = generate_universe(3, "1y", seed=3)
+    fetcher = SyntheticDataFetcher(universe)
+    symbols = list(universe)
+    # Looser thresholds than the assignment rule so the backtests actually trade
+    regular = AssignmentTradingStrategy(60, 65, data_fetcher=fetcher).run_strategy_for_symbols(symbols, "1y", "full")
+    strategy = AssignmentTradingStrategy(60, 65, data_fetcher=fetcher, compact=True)
+    compact = strategy.run_strategy_for_symbols(symbols, "1y", "full")
+    summary = strategy.run_strategy_for_symbols(symbols, "1y", "summary", spill=SeriesSpill(str(tmp_path)))
+
+    assert sum(result['backtest']['total_trades'] for result in regular.values()) > 0
+    for symbol in symbols:
+        expected, df = regular[symbol]['data'], compact[symbol]['data']
+        assert is_compact(df) and df['Signal'].dtype == np.int8 and df['Close'].dtype == np.float32
+        assert frame_bytes(df) < 0.5 * frame_bytes(expected)
+
+        expanded = expand_frame(df)
+        assert (expanded.index == expected.index).all()
+        assert (expanded['Signal'] == expected['Signal']).all()
+
+        backtest = compact[symbol]['backtest']
+        assert backtest['portfolio_data']['Portfolio_Value'].dtype == np.float64
+        assert backtest['total_trades'] == regular[symbol]['backtest']['total_trades']
+        np.testing.assert_allclose(backtest['final_value'], regular[symbol]['backtest']['final_value'], rtol=1e-6)
+        assert [t['Date'] for t in backtest['trades']] == [t['Date'] for t in regular[symbol]['backtest']['trades']]
+
+        spilled = summary[symbol]['backtest']['portfolio_data'].load()
+        assert (spilled.index == expected.index).all()
+        assert summary[symbol]['backtest']['final_value'] == backtest['final_value']
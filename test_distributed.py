@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Distributed sweep test: local workers over TCP, with a dropped and a stalled job reassigned
+"""
+
+import sys
+import os
+import socket
+import threading
+
+import pandas as pd
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from strategies.distributed import (Coordinator, Worker, build_synthetic_store, read_message, run_job,
+                                    send_message, sweep_frame, sweep_jobs)
+
+
+def test_distributed_sweep_reassigns_failed_jobs(tmp_path):
+    """
+    A worker that disconnects and one that stalls lose their jobs to the healthy workers;
+    the sweep still equals the in-process run
+    """
+    store = build_synthetic_store(str(tmp_path), 6, "2y", seed=3)
+    symbols = store.symbols()
+    jobs = sweep_jobs(symbols, [{'rsi_buy_threshold': 45, 'rsi_sell_threshold': 55}, {'sma_long': 'SMA_200'}],
+                      [(None, "2024-01-01"), ("2024-01-01", None)], shard_size=4)
+    expected = sweep_frame(jobs, [run_job(store, job) for job in jobs])
+    assert expected['total_trades'].sum() > 0
+
+    coordinator = Coordinator(port=0, job_timeout=1.0, poll_seconds=0.05).start()
+    coordinator.submit(jobs)
+    # One client takes a job and drops the connection, another takes one and never answers
+    stalled = []
+    for _ in range(2):
+        sock = socket.create_connection(coordinator.address)
+        rfile, wfile = sock.makefile("rb"), sock.makefile("wb")
+        send_message(wfile, {'type': 'hello', 'name': 'faulty'})
+        read_message(rfile)
+        send_message(wfile, {'type': 'get'})
+        assert read_message(rfile)['type'] == 'job'
+        stalled.append((sock, rfile, wfile))
+    dropped = stalled.pop(0)
+    for f in dropped:
+        f.close()
+
+    workers = [Worker(*coordinator.address, store=store, name=f"local{i}") for i in range(2)]
+    threads = [threading.Thread(target=worker.run) for worker in workers]
+    for thread in threads:
+        thread.start()
+    results = coordinator.wait([job['job_id'] for job in jobs], timeout=60)
+    for f in stalled[0]:
+        f.close()
+    coordinator.stop()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    pd.testing.assert_frame_equal(sweep_frame(jobs, results), expected)
+    assert coordinator.reassigned == 2
+    assert sum(worker.jobs_done for worker in workers) == len(jobs)
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_distributed_poison_jobs_fail_without_killing_workers(tmp_path):
+    """
+    Jobs that raise on every worker are retried max_attempts times, then wait() raises;
+    the workers survive and finish the healthy jobs
+    """
+    store = build_synthetic_store(str(tmp_path), 4, "1y", seed=1)
+    symbols = store.symbols()
+    # A column file lost from the shared store raises FileNotFoundError (an OSError) in the worker
+    os.remove(os.path.join(store._dir(symbols[3]), "RSI.bin"))
+    jobs = sweep_jobs(symbols[:3], [{}, {'rsi_buy_threshold': 45}], shard_size=3)
+    jobs += sweep_jobs(["MISSING.NS"], [{}]) + sweep_jobs([symbols[3]], [{}])
+    for job_id, job in enumerate(jobs):
+        job['job_id'] = job_id
+
+    coordinator = Coordinator(port=0, job_timeout=30, poll_seconds=0.05, max_attempts=3).start()
+    workers = [Worker(*coordinator.address, store=store, name=f"local{i}") for i in range(2)]
+    threads = [threading.Thread(target=worker.run) for worker in workers]
+    for thread in threads:
+        thread.start()
+    try:
+        with pytest.raises(RuntimeError, match="failed"):
+            coordinator.run(jobs, timeout=30)
+        healthy = coordinator.wait([0, 1], timeout=30)
+        assert all(thread.is_alive() for thread in threads)
+        # Let the second poison job use up its attempts as well
+        with pytest.raises(RuntimeError):
+            coordinator.wait([3], timeout=30)
+    finally:
+        coordinator.stop()
+        for thread in threads:
+            thread.join(timeout=10)
+
+    pd.testing.assert_frame_equal(sweep_frame(jobs[:2], healthy),
+                                  sweep_frame(jobs[:2], [run_job(store, job) for job in jobs[:2]]))
+    assert sorted(coordinator.failed) == [2, 3]
+    assert "KeyError" in coordinator.failed[2] and "FileNotFoundError" in coordinator.failed[3]
+    assert coordinator.attempts == {2: 3, 3: 3}
+    assert sum(worker.jobs_failed for worker in workers) == 6
+    assert sum(worker.jobs_done for worker in workers) == 2
+    assert not any(thread.is_alive() for thread in threads)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Google Sheets logger tests against the local gspread stand-in
+"""
+
+import sys
+import os
+import atexit
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from utils.google_sheets import GoogleSheetsLogger
+from utils.standins import FakeSpreadsheet
+
+INDICATORS = {'RSI': 25.0, 'SMA_20': 101.0, 'SMA_50': 100.0, 'MACD': 0.1}
+
+
+def log_scan(sheets_logger, n_rows):
+    for i in range(n_rows):
+        sheets_logger.log_signal(f"SYM{i}.NS", "BUY", 100.0 + i, 0.5, INDICATORS)
+        sheets_logger.log_trade(f"SYM{i}.NS", "BUY", 100.0 + i, 10)
+    sheets_logger.update_pnl_summary(1234.5, 7, 10, 70.0)
+    sheets_logger.flush()
+
+
+def test_api_calls_per_scan_do_not_grow_with_rows():
+    """
+    A flushed scan costs one call per worksheet however many rows it logs
+    """
+    calls = {}
+    for n_rows in (1, 10, 200):
+        spreadsheet = FakeSpreadsheet()
+        sheets_logger = GoogleSheetsLogger(None, None, flush_rows=10_000, flush_interval=60.0,
+                                           spreadsheet=spreadsheet)
+        log_scan(sheets_logger, n_rows)
+        # Worksheet creation happens once; measure the steady-state scan
+        before = spreadsheet.api_calls
+        log_scan(sheets_logger, n_rows)
+        calls[n_rows] = spreadsheet.api_calls - before
+        sheets_logger.close()
+
+        assert len(spreadsheet.worksheets["Signals"].values) == 1 + 2 * n_rows
+        assert len(spreadsheet.worksheets["Trade Log"].values) == 1 + 2 * n_rows
+
+    # append_rows on Signals and Trade Log plus one P&L range update
+    assert calls == {1: 3, 10: 3, 200: 3}
+
+
+def test_flusher_restart_registers_close_once(monkeypatch):
+    """
+    Restarting the background flusher does not pile up atexit handlers
+    """
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+
+    sheets_logger = GoogleSheetsLogger(None, None, flush_interval=0.05, spreadsheet=FakeSpreadsheet())
+    for _ in range(3):
+        sheets_logger.log_signal("SYM.NS", "BUY", 100.0, 0.5, INDICATORS)
+        sheets_logger.close()
+
+    assert registered == [sheets_logger.close]
+    assert sheets_logger.pending_rows() == 0
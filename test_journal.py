@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Journal tailer delivery tests against the local Sheets and Telegram stand-ins
+"""
+
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from utils.google_sheets import GoogleSheetsLogger
+from utils.journal import JournalTailer, PartialDeliveryError, SheetsJournalSink, TelegramJournalSink, TradeJournal
+from utils.standins import FakeSpreadsheet, TelegramStandInServer
+from utils.telegram_alerts import DIGEST_SEPARATOR, RateLimiter, TelegramAlertDispatcher
+
+INDICATORS = {'RSI': 25.0, 'SMA_20': 101.0, 'SMA_50': 100.0, 'MACD': 0.1}
+
+
+def record_signals(journal, symbols):
+    for symbol in symbols:
+        journal.record_signal(symbol, "BUY", 100.0, 0.5, INDICATORS)
+
+
+def test_sheets_failure_mid_batch_retries_only_the_rest(tmp_path):
+    """
+    Signals written before a Trade Log failure are not appended again on retry
+    """
+    journal = TradeJournal(str(tmp_path / "journal.db"))
+    record_signals(journal, ["AAA.NS", "BBB.NS"])
+    journal.record_fill("AAA.NS", "buy", 1, 100.0)
+    record_signals(journal, ["CCC.NS"])
+    assert journal.flush(timeout=5)
+
+    spreadsheet = FakeSpreadsheet()
+    sheets_logger = GoogleSheetsLogger(None, None, buffered=False, spreadsheet=spreadsheet)
+    write_rows = sheets_logger.write_rows
+    failures = []
+
+    def failing_trade_log(name, rows):
+        if name == "Trade Log" and not failures:
+            failures.append(rows)
+            raise ConnectionError("stand-in failure")
+        write_rows(name, rows)
+
+    sheets_logger.write_rows = failing_trade_log
+    tailer = JournalTailer(journal, "google_sheets", SheetsJournalSink(sheets_logger))
+
+    with pytest.raises(PartialDeliveryError):
+        tailer.drain()
+    assert journal.get_offset("google_sheets") == 2 and tailer.delivered == 2
+
+    assert tailer.drain() == 2
+    journal.close()
+
+    signal_symbols = [row[1] for row in spreadsheet.worksheets["Signals"].values[1:]]
+    assert signal_symbols == ["AAA.NS", "BBB.NS", "CCC.NS"]
+    trades = spreadsheet.worksheets["Trade Log"].values[1:]
+    assert len(trades) == 1 and trades[0][-1] == "FILLED"
+
+
+def test_telegram_offset_moves_only_after_delivery(tmp_path):
+    """
+    Alerts Telegram rejected stay in the journal and go out exactly once later
+    """
+    journal = TradeJournal(str(tmp_path / "journal.db"))
+    record_signals(journal, ["AAA.NS", "BBB.NS", "CCC.NS"])
+    assert journal.flush(timeout=5)
+
+    with TelegramStandInServer(fail_first=1, fail_status=500) as server:
+        dispatcher = TelegramAlertDispatcher(
+            "TEST_TOKEN", "12345", api_url=server.url, max_retries=0,
+            rate_limiters=[RateLimiter(rate=100.0, capacity=1)]
+        )
+        tailer = JournalTailer(journal, "telegram", TelegramJournalSink(dispatcher, lambda e: e['symbol']),
+                               kinds=['signal'])
+
+        with pytest.raises(PartialDeliveryError):
+            tailer.drain()
+        assert journal.get_offset("telegram") == 0
+
+        assert tailer.drain() == 3
+        dispatcher.stop()
+
+    journal.close()
+    assert [m['text'] for m in server.messages] == [DIGEST_SEPARATOR.join(["AAA.NS", "BBB.NS", "CCC.NS"])]
+    assert dispatcher.stats['failed_messages'] == 1 and dispatcher.stats['sent_alerts'] == 3
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Parity test for the TensorFlow-free NumPy LSTM runtime
+Compares NumPy predictions with Keras for every trained model in models/
+and streaming (stateful) predictions with full-window predictions
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pytest
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from models.numpy_lstm import NumpyLSTMModel, export_h5_model
+
+MODEL_FILES = ["lstm_model.h5", "lstm_trained_model.h5", "lstm_fixed.h5"]
+
+
+@pytest.mark.parametrize("model_file", MODEL_FILES)
+def test_numpy_lstm_matches_keras(model_file, tmp_path):
+    """
+    NumPy forward pass matches Keras within float32 tolerance
+    """
+    tf = pytest.importorskip("tensorflow")
+    h5_path = os.path.join(project_root, "models", model_file)
+
+    npz_path = export_h5_model(h5_path, str(tmp_path / "weights.npz"))
+    numpy_model = NumpyLSTMModel.load(npz_path)
+    keras_model = tf.keras.models.load_model(h5_path, compile=False)
+    assert numpy_model.input_shape == tuple(keras_model.input_shape)
+
+    rng = np.random.default_rng(42)
+    X = rng.random((16,) + numpy_model.input_shape[1:], dtype=np.float32)
+    expected = np.asarray(keras_model.predict_on_batch(X))
+    actual = numpy_model.predict_on_batch(X)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-5)
+
+    # Loading straight from the .h5 gives the same weights as the exported file
+    np.testing.assert_array_equal(NumpyLSTMModel.load(h5_path).predict_on_batch(X), actual)
+
+
+@pytest.mark.parametrize("reanchor_every", [None, 7, 25])
+def test_streaming_matches_full_window_on_anchor_bars(reanchor_every):
+    """
+    Streaming predictions equal full-window predictions on re-anchor bars and stay close in between
+    """
+    from models.dataset import sliding_windows
+    from models.streaming_lstm import StreamingLSTMPredictor
+
+    model = NumpyLSTMModel.load(os.path.join(project_root, "models", "lstm_trained_model.npz"))
+    seq_length, n_features = model.input_shape[1:]
+    rng = np.random.default_rng(7)
+    bars = np.cumsum(rng.normal(0, 0.02, (3 * seq_length + 5, n_features)), axis=0).astype(np.float32)
+    reference = model.predict(np.ascontiguousarray(sliding_windows(bars, seq_length)))[:, 0]
+
+    predictor = StreamingLSTMPredictor(model, reanchor_every)
+    streamed = [predictor.prime({"SYM": bars[:seq_length]})["SYM"]]
+    for row in bars[seq_length:]:
+        streamed.append(predictor.update({"SYM": row})["SYM"])
+    streamed = np.array(streamed)
+
+    anchors = np.arange(0, len(reference), reanchor_every or seq_length)
+    np.testing.assert_allclose(streamed[anchors], reference[anchors], rtol=1e-4, atol=1e-5)
+    assert np.abs(streamed - reference).max() < 0.05
+
+
+def test_int8_weights_round_trip(tmp_path):
+    """
+    Quantized weights stay int8 on disk and predict close to the float32 model
+    """
+    from models.compress import prune_layers, quantize_layers
+    from models.numpy_lstm import load_weights_dir, read_h5_weights, save_weights_dir
+
+    input_shape, layers = read_h5_weights(os.path.join(project_root, "models", "lstm_trained_model.h5"))
+    save_weights_dir(str(tmp_path / "int8"), input_shape, quantize_layers(layers))
+    _, stored = load_weights_dir(str(tmp_path / "int8"))
+    assert stored[0]['kernel'].dtype == np.int8 and stored[0]['recurrent_kernel'].dtype == np.int8
+
+    rng = np.random.default_rng(3)
+    X = rng.random((8,) + tuple(input_shape), dtype=np.float32)
+    expected = NumpyLSTMModel(input_shape, layers).predict_on_batch(X)
+    np.testing.assert_allclose(NumpyLSTMModel.load(str(tmp_path / "int8")).predict_on_batch(X), expected, atol=2e-2)
+
+    # Pruning nothing leaves the model unchanged; pruning shrinks every hidden layer
+    np.testing.assert_allclose(NumpyLSTMModel(input_shape, prune_layers(layers, 0.0)).predict_on_batch(X), expected)
+    pruned = prune_layers(layers, 0.5, input_shape, X)
+    assert [layer['units'] for layer in pruned] == [64, 32, 16, 1]
+    assert NumpyLSTMModel(input_shape, pruned).predict_on_batch(X).shape == expected.shape
+
+
+def main():
+    """
+    Latency benchmark: NumPy runtime vs. Keras on a single window and a 50-symbol batch
+    """
+    import tensorflow as tf
+
+    h5_path = os.path.join(project_root, "models", "lstm_trained_model.h5")
+    numpy_model = NumpyLSTMModel.load(h5_path)
+    keras_model = tf.keras.models.load_model(h5_path, compile=False)
+
+    rng = np.random.default_rng(0)
+    for batch in (1, 50):
+        X = rng.random((batch,) + numpy_model.input_shape[1:], dtype=np.float32)
+        keras_model.predict_on_batch(X)
+        for name, model in (("NumPy", numpy_model), ("Keras", keras_model)):
+            start = time.perf_counter()
+            for _ in range(20):
+                model.predict_on_batch(X)
+            print(f"📈 {name} batch {batch}: {(time.perf_counter() - start) / 20 * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
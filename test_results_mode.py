@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Backtest results mode test: summary mode with spilled series reproduces the full results
+"""
+
+import sys
+import os
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from strategies.assignment_strategy import AssignmentTradingStrategy
+from utils.result_store import SeriesSpill
+from utils.synthetic_data import SyntheticDataFetcher, generate_universe
+
+
+def test_summary_mode_matches_full_mode(tmp_path):
+    """
+    Metrics, trades, the latest signal and the reloaded equity/position series are identical
+    """
+    universe = generate_universe(4, "1y", seed=1)
+    # Looser thresholds than the assignment rule so the backtests actually trade
+    strategy = AssignmentTradingStrategy(rsi_buy_threshold=60, rsi_sell_threshold=65,
+                                         data_fetcher=SyntheticDataFetcher(universe))
+    full = strategy.run_strategy_for_symbols(list(universe), "1y", results_mode="full")
+    summary = strategy.run_strategy_for_symbols(list(universe), "1y", results_mode="summary",
+                                                spill=SeriesSpill(str(tmp_path), chunk_symbols=3))
+
+    assert sum(result['backtest']['total_trades'] for result in full.values()) > 0
+    for symbol, result in full.items():
+        compact = summary[symbol]
+        assert 'data' not in compact
+        for key in ['final_value', 'total_return', 'total_pnl', 'win_rate', 'total_trades', 'trades']:
+            assert compact['backtest'][key] == result['backtest'][key]
+        assert compact['latest']['Signal'] == result['data']['Signal'].iloc[-1]
+
+        expected = result['backtest']['portfolio_data']
+        spilled = compact['backtest']['portfolio_data'].load()
+        assert (spilled.index == expected.index).all()
+        np.testing.assert_array_equal(spilled['Portfolio_Value'].values, expected['Portfolio_Value'].values)
+        np.testing.assert_array_equal(spilled['Shares_Held'].values, expected['Shares_Held'].values)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Screener test: panel and strategy-result features agree, and top-k matches a full sort
+"""
+
+import sys
+import os
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from strategies.assignment_strategy import AssignmentTradingStrategy
+from strategies.kernels import signal_codes
+from strategies.panel import PricePanel, add_indicators
+from strategies.screener import FEATURES, Screener, latest_features, top_k
+from utils.result_store import SeriesSpill
+from utils.synthetic_data import SyntheticDataFetcher, generate_universe
+
+
+def test_screener_features_and_ranking(tmp_path):
+    """
+    The panel path reproduces the per-symbol strategy values; rankings equal a full sort
+    """
+    universe = generate_universe(30, "1y", seed=4)
+    panel = add_indicators(PricePanel.from_frames(universe))
+    panel.columns['Signal'], _ = signal_codes(panel.columns['RSI'], panel.columns['SMA_20'], panel.columns['SMA_50'])
+    results = AssignmentTradingStrategy(data_fetcher=SyntheticDataFetcher(universe)).run_strategy_for_symbols(
+        list(universe), "1y", results_mode="summary", spill=SeriesSpill(str(tmp_path)))
+
+    symbols, matrix = latest_features(panel)
+    result_symbols, result_matrix = latest_features(results)
+    assert symbols == result_symbols
+    np.testing.assert_allclose(matrix, result_matrix, rtol=1e-9)
+
+    screener = Screener(filters=["RSI == RSI"], scores={'oversold': "-RSI"})
+    ranked = screener.rank(symbols, matrix, 'oversold', k=5, extra_filters=["Close > 1"])
+    rsi, close = matrix[:, FEATURES.index('RSI')], matrix[:, FEATURES.index('Close')]
+    expected = [symbols[i] for i in np.argsort(np.where(close > 1, rsi, np.inf))[:5]]
+    assert list(ranked.index) == expected
+    assert (np.diff(ranked['Score'].to_numpy()) <= 0).all()
+
+    scores = np.array([3.0, np.nan, 7.0, -np.inf, 5.0])
+    assert list(top_k(scores, 2)) == [2, 4] and list(top_k(scores, 10)) == [2, 4, 0]
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Telegram dispatcher tests against the local Bot API stand-in
+"""
+
+import sys
+import os
+import time
+
+# Add project root to path
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from utils.standins import TelegramStandInServer
+from utils.telegram_alerts import DIGEST_SEPARATOR, RateLimiter, TelegramAlertDispatcher
+
+
+def make_dispatcher(server, **kwargs):
+    options = dict(digest_window=0.2, backoff_base=0.05, rate_limiters=[RateLimiter(rate=100.0, capacity=1)])
+    options.update(kwargs)
+    return TelegramAlertDispatcher("TEST_TOKEN", "12345", api_url=server.url, **options)
+
+
+def test_burst_is_merged_into_one_digest():
+    """
+    Alerts queued within the digest window arrive as one message, in order
+    """
+    with TelegramStandInServer() as server:
+        dispatcher = make_dispatcher(server)
+        for i in range(5):
+            assert dispatcher.send(f"Signal {i}")
+        dispatcher.stop()
+
+    assert len(server.messages) == 1
+    assert server.messages[0]['text'].split(DIGEST_SEPARATOR) == [f"Signal {i}" for i in range(5)]
+    assert server.messages[0]['chat_id'] == "12345"
+    assert dispatcher.stats['sent_messages'] == 1 and dispatcher.stats['sent_alerts'] == 5
+
+
+def test_429_waits_retry_after_instead_of_backoff():
+    """
+    A 429 is retried after Telegram's retry_after, not the (much longer) exponential backoff
+    """
+    with TelegramStandInServer(fail_first=1, fail_status=429, retry_after=1) as server:
+        dispatcher = make_dispatcher(server, digest_window=0.0, backoff_base=30.0)
+        start = time.monotonic()
+        dispatcher.send("Signal")
+        assert dispatcher.flush(timeout=10)
+        elapsed = time.monotonic() - start
+        dispatcher.stop()
+
+    assert 1.0 <= elapsed < 5.0
+    assert server.requests == 2 and len(server.messages) == 1
+    assert dispatcher.stats['retries'] == 1 and dispatcher.stats['failed_messages'] == 0
+
+
+def test_full_queue_drops_alerts():
+    """
+    While the worker is busy posting, sends beyond the queue size are dropped (never block)
+    """
+    with TelegramStandInServer(latency=1.0) as server:
+        dispatcher = make_dispatcher(server, max_queue_size=2, digest_window=0.0)
+        dispatcher.send("first")
+        time.sleep(0.3)  # The worker is now waiting on the slow stand-in
+        start = time.monotonic()
+        accepted = [dispatcher.send(f"Signal {i}") for i in range(3)]
+        assert time.monotonic() - start < 0.1
+        dispatcher.stop()
+
+    assert accepted == [True, True, False]
+    assert dispatcher.stats['dropped'] == 1 and dispatcher.stats['queued'] == 3
+    assert dispatcher.stats['sent_alerts'] == 3
+    assert "Signal 2" not in "".join(message['text'] for message in server.messages)
@@ -0,0 +1,57 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """
+    Wall-clock time and real sleeps (the production clock)
+    """
+
+    def now(self):
+        return datetime.now()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class SimulatedClock:
+    """
+    Virtual clock for replaying schedules faster than real time
+
+    Sleeping is free: it moves the virtual time forward at once. Work done
+    between sleeps still takes time, measured with the CPU's own clock and
+    scaled by `compute_speed`, so a slow scan delays the next one (and can
+    overlap it) exactly as it would in production.
+    """
+
+    def __init__(self, start, compute_speed=1.0):
+        """
+        Args:
+            start (datetime): Initial virtual time (naive, exchange-local)
+            compute_speed (float): Virtual seconds per real second of work (0 freezes time between sleeps)
+        """
+        self.compute_speed = compute_speed
+        self.slept = 0.0
+        self._virtual = start
+        self._anchor = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def now(self):
+        with self._lock:
+            return self._virtual + timedelta(seconds=(time.perf_counter() - self._anchor) * self.compute_speed)
+
+    def sleep(self, seconds):
+        with self._lock:
+            elapsed = (time.perf_counter() - self._anchor) * self.compute_speed
+            self._virtual += timedelta(seconds=elapsed + max(seconds, 0))
+            self._anchor = time.perf_counter()
+            self.slept += max(seconds, 0)
+
+    def set(self, when):
+        """
+        Jump to a virtual time (e.g. the next session's open)
+        """
+        with self._lock:
+            self._virtual = when
+            self._anchor = time.perf_counter()
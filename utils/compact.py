@@ -0,0 +1,166 @@
+import logging
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from strategies.kernels import BUY, HOLD, SELL, SIGNAL_LABELS
+from utils.config import COMPACT_FLOAT64_COLUMNS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Signal codes of compact frames (the array kernels' codes)
+SIGNAL_CODES = {'HOLD': HOLD, 'BUY': BUY, 'SELL': SELL}
+
+
+def is_compact(df):
+    """
+    True for frames produced by compact_frame (int64 epoch index)
+    """
+    return not isinstance(df.index, pd.DatetimeIndex) and df.index.dtype == np.int64
+
+
+def compact_frame(df):
+    """
+    Compact copy of a price/indicator/signal frame
+
+    Float columns become float32, except COMPACT_FLOAT64_COLUMNS (volumes and
+    running sums that float32 cannot hold exactly), a string Signal column
+    becomes int8 codes and the DatetimeIndex becomes int64 nanoseconds since
+    the epoch (UTC), with the time zone kept in df.attrs['tz'].
+
+    Args:
+        df (DataFrame): Frame with a DatetimeIndex
+
+    Returns:
+        DataFrame: Compact frame (already compact frames are returned unchanged)
+    """
+    if is_compact(df):
+        return df
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if column == 'Signal' and values.dtype == object:
+            columns[column] = values.map(SIGNAL_CODES).to_numpy(dtype=np.int8)
+        elif values.dtype == np.float64 and column not in COMPACT_FLOAT64_COLUMNS:
+            columns[column] = values.to_numpy(dtype=np.float32)
+        else:
+            columns[column] = values.to_numpy()
+    epochs, tz = index_epochs(df.index)
+    compact = pd.DataFrame(columns, index=pd.Index(epochs, name=df.index.name))
+    compact.attrs['tz'] = tz
+    return compact
+
+
+def expand_frame(df):
+    """
+    Inverse of compact_frame for reports: float64 columns, Signal labels, tz-aware DatetimeIndex
+    """
+    if not is_compact(df):
+        return df
+    columns = {}
+    for column in df.columns:
+        values = df[column].to_numpy()
+        if column == 'Signal':
+            columns[column] = SIGNAL_LABELS[values]
+        elif values.dtype == np.float32:
+            columns[column] = values.astype(np.float64)
+        else:
+            columns[column] = values
+    return pd.DataFrame(columns, index=epochs_to_index(df.index.to_numpy(), df.attrs.get('tz'), df.index.name))
+
+
+def index_epochs(index):
+    """
+    Nanoseconds since the epoch (UTC) of a DatetimeIndex, plus its time zone name
+
+    Returns:
+        tuple: (np.ndarray of int64, str or None)
+    """
+    tz = str(index.tz) if index.tz is not None else None
+    utc = index.tz_convert("UTC").tz_localize(None) if tz else index
+    return np.asarray(utc, dtype="datetime64[ns]").view(np.int64), tz
+
+
+def epochs_to_index(epochs, tz=None, name=None):
+    """
+    DatetimeIndex from int64 epoch nanoseconds (converted to `tz` when given)
+    """
+    index = pd.DatetimeIndex(np.asarray(epochs, dtype=np.int64).view("datetime64[ns]"), name=name)
+    return index.tz_localize("UTC").tz_convert(tz) if tz else index
+
+
+def bar_timestamp(df, i):
+    """
+    Timestamp of row `i` of a compact or regular frame
+    """
+    if is_compact(df):
+        return epochs_to_index(df.index[i:i + 1].to_numpy(), df.attrs.get('tz'))[0]
+    return df.index[i]
+
+
+def signal_label(signal):
+    """
+    'HOLD'/'BUY'/'SELL' for a label or an int8 code
+    """
+    return signal if isinstance(signal, str) else SIGNAL_LABELS[int(signal)]
+
+
+def frame_bytes(df):
+    """
+    Memory held by a frame, including its index and Python string objects
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m utils.compact [n_symbols] [period] [rsi_buy] [rsi_sell]
+    import time
+    from strategies.assignment_strategy import AssignmentTradingStrategy
+    from strategies.kernels import backtest_arrays, signal_codes
+    from utils.synthetic_data import SyntheticDataFetcher, generate_universe
+
+    n_symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    period = sys.argv[2] if len(sys.argv) > 2 else "2y"
+    # Looser thresholds than the assignment rule make the backtests trade, which exercises the P&L comparison
+    thresholds = [int(t) for t in sys.argv[3:5]] if len(sys.argv) > 4 else [30, 70]
+    logging.getLogger().setLevel(logging.WARNING)
+    fetcher = SyntheticDataFetcher(generate_universe(n_symbols, period))
+    symbols = list(fetcher.universe)
+
+    runs = {}
+    for compact in (False, True):
+        strategy = AssignmentTradingStrategy(*thresholds, data_fetcher=fetcher, compact=compact)
+        start = time.perf_counter()
+        results = strategy.run_strategy_for_symbols(symbols, period, results_mode="full")
+        seconds = time.perf_counter() - start
+        data_bytes = sum(frame_bytes(r['data']) + frame_bytes(r['backtest']['portfolio_data']) for r in results.values())
+        panel = {column: np.stack([r['data'][column].to_numpy() for r in results.values()])
+                 for column in ['Close', 'RSI', 'SMA_20', 'SMA_50']}
+        # Kernel passes over the stacked panel (one row per symbol)
+        kernel_start = time.perf_counter()
+        for _ in range(20):
+            for row in range(len(symbols)):
+                codes, _ = signal_codes(panel['RSI'][row], panel['SMA_20'][row], panel['SMA_50'][row])
+                backtest_arrays(panel['Close'][row], codes)
+        kernel_seconds = (time.perf_counter() - kernel_start) / 20
+        runs[compact] = (results, data_bytes, seconds, kernel_seconds)
+        label = "compact" if compact else "float64"
+        print(f"🧮 {label:>8}: {data_bytes / 1e6:8.2f} MB of frames, strategy {seconds:6.2f} s, "
+              f"kernels {kernel_seconds * 1000:7.2f} ms per pass over {n_symbols} symbols")
+
+    full, compact = runs[False][0], runs[True][0]
+    returns = np.array([[full[s]['backtest']['total_return'], compact[s]['backtest']['total_return']] for s in symbols])
+    trades = sum(full[s]['backtest']['total_trades'] for s in symbols)
+    agree = np.mean([(full[s]['data']['Signal'].map(SIGNAL_CODES).to_numpy() == compact[s]['data']['Signal'].to_numpy()).mean()
+                     for s in symbols])
+    print(f"📉 Memory ratio {runs[True][1] / runs[False][1]:.2f}; signals agree on {agree * 100:.3f}% of bars; "
+          f"max total-return difference {np.abs(returns[:, 0] - returns[:, 1]).max():.2e} percentage points over {trades} trades")
@@ -26,7 +26,146 @@ SMA_LONG = 50
 # 📊 Google Sheets Configuration
 GOOGLE_SHEETS_CREDENTIALS_FILE = "credentials.json"  # Download from Google Cloud Console
 SPREADSHEET_ID = "YOUR_SPREADSHEET_ID"  # Create a Google Sheet and get its ID
+SHEETS_FLUSH_ROWS = 100  # Buffered rows that trigger a batched write
+SHEETS_FLUSH_INTERVAL_SECONDS = 5.0  # Maximum time a row stays buffered
+
+# 📒 Trade Journal (local system of record; Sheets/Telegram tail it)
+JOURNAL_PATH = "data/trade_journal.db"
+JOURNAL_COMMIT_INTERVAL_SECONDS = 0.005  # Group-commit interval (one fsync per commit)
+JOURNAL_SINK_POLL_SECONDS = 1.0  # How often sinks look for new journal events
+ORDER_FILL_TIMEOUT_SECONDS = 30.0  # How long order scripts wait to journal a broker fill
+
+# ⏱️ Instrumentation
+METRICS_ENABLED = True
+METRICS_FILE = "metrics/trading.prom"  # Prometheus text format, rewritten after every scan
+SCAN_SUMMARY_FILE = "metrics/scan_summaries.jsonl"  # One JSON record per scan
+METRICS_HTTP_PORT = None  # e.g. 9108 to serve /metrics locally
+
+# 🔬 On-demand profiling (arm with TRADING_PROFILE_SCANS=N or `kill -USR1 <pid>`)
+PROFILE_DIR = "profiles"
+PROFILE_SAMPLE_INTERVAL = 0.005  # Seconds between CPU stack samples
+PROFILE_SCANS_ON_SIGNAL = 1  # Scans profiled per SIGUSR1
+
+# 🧠 LSTM inference
+INFERENCE_BACKEND = "numpy"  # "numpy" (no TensorFlow import, uses the exported .npz weights) or "keras"
+MODEL_REGISTRY_DIR = "models/registry"  # Versioned weights + fitted scaler + feature schema (relative to project root)
+MODEL_REFRESH_SECONDS = 30  # How often live processes check the registry for a newly promoted version
+
+# 🏋️ Multi-symbol LSTM training (models/train_multi_symbol.py)
+TRAINING_PERIOD = "10y"
+TRAINING_FEATURES = ["Close", "SMA_20", "SMA_50", "RSI", "MACD", "MACD_Signal", "OBV"]
+TRAINING_SEQ_LENGTH = 50
+TRAINING_EPOCHS = 20
+TRAINING_BATCH_SIZE = 256
+TRAINING_EMBEDDING_DIM = 8  # Size of the learned per-symbol embedding
+TRAINING_CHECKPOINT_DIR = "models/checkpoints"  # Per-epoch checkpoints and resume state
+TRAINING_INTRA_OP_THREADS = 0  # 0 = one thread per CPU core
+TRAINING_INTER_OP_THREADS = 0  # 0 = 2 (1 on single-core machines)
+TRAINING_LOADER_WORKERS = 2  # Threads gathering training batches
+TRAINING_PARITY_TOLERANCE = 1e-4  # Max |NumPy export - Keras| prediction difference before registering
+
+# 🔎 Hyperparameter search (models/hyperparam_search.py)
+SEARCH_OUTPUT_DIR = "models/search"  # Leaderboard, trial weights and cached datasets
+SEARCH_TRIALS = 20
+SEARCH_WORKERS = 0  # Parallel trial processes (0 = one per CPU core)
+SEARCH_MAX_EPOCHS = 30
+SEARCH_PRUNE_WARMUP_EPOCHS = 3  # Epochs before a trial can be pruned
+SEARCH_PRUNE_MIN_TRIALS = 3  # Reports needed at an epoch before pruning against their median
+
+# 🗃️ Feature store (utils/feature_store.py)
+FEATURE_STORE_DIR = "data/feature_store"  # Columnar per-symbol feature matrices (relative to project root)
+FEATURE_SET = "daily_indicators"  # Feature-set definition in utils.feature_store.FEATURE_SETS
+# Raw bars each store key is built from on first use. Feeds are kept apart because
+# cumulative indicators (OBV) depend on where a series starts.
+FEATURE_STORE_SOURCES = {
+    "TSLA": "data/TSLA_data.csv",  # yfinance history (lstm_model)
+    "TSLA_IEX": "data/tsla_90_days.csv",  # Alpaca IEX bars (lstm_trained_model, live trading)
+}
+
+# 🧪 Prediction backtests (backtesting/prediction_backtest.py), same risk limits as live_trading.py
+PREDICTION_CACHE_DIR = "data/prediction_cache"  # Model outputs keyed by model version + input window hash
+BACKTEST_STOP_LOSS = 0.03  # 3% below the entry price
+BACKTEST_TAKE_PROFIT = 0.05  # 5% above the entry price
+
+# 🦓 Model zoo (models/model_zoo.py)
+ZOO_DIR = "models/zoo"  # Fitted zoo models, benchmark report and cached feature matrices
+ZOO_LAGS = 5  # Bars of history the scikit-learn classifiers see
+ZOO_MIN_ACCURACY = 0.52  # Directional accuracy a model needs before the live path may pick it
+
+# 🗜️ Model compression (models/compress.py)
+COMPRESSION_MSE_TOLERANCE = 0.05  # Max relative increase of the backtest MSE before a variant is rejected
+COMPRESSION_PRUNE_FRACTIONS = [0.1, 0.25]  # Share of LSTM/Dense units removed per pruned variant
+
+# 🗜️ Backtest results (strategies/assignment_strategy.py run_strategy_for_symbols)
+BACKTEST_RESULTS_MODE = "full"  # "full" keeps every signal/portfolio frame; "summary" keeps metrics + trades and spills series to disk; "sharded" scans a shared-memory panel (SHARDED_SCAN_*)
+BACKTEST_SPILL_DIR = "data/backtest_spill"  # Compressed equity/position chunks of the latest summary-mode run
+BACKTEST_SPILL_CHUNK_SYMBOLS = 64  # Symbols buffered per chunk file (bounds the spill's memory)
+
+# 🪶 Compact frames (utils/compact.py)
+COMPACT_FRAMES = False  # float32 prices/indicators, int8 signal codes and int64 epoch indexes in strategy frames
+COMPACT_FLOAT64_COLUMNS = ["Volume", "OBV", "Portfolio_Value", "Shares_Held"]  # Kept float64: large running sums and P&L
+
+# 🏆 Cross-sectional screener (strategies/screener.py)
+SCREENER_FILTERS = ["Close > 0", "Volume > 0"]  # Every screened symbol must pass these (numpy expressions over screener.FEATURES)
+SCREENER_SCORES = {
+    "oversold": "-RSI",  # Lowest RSI first
+    "crossover": "-abs(SMA_Gap)",  # Closest to a 20/50-DMA crossover (either direction)
+    "golden_cross_setup": "where((SMA_Gap < 0) & (SMA_Gap > Prev_SMA_Gap), SMA_Gap, nan)",  # 20-DMA below but converging
+}  # Score name -> expression; higher ranks first, NaN drops the symbol
+SCREENER_TOP_K = 10  # Symbols kept per score
+
+# 🧩 Sharded scanning (strategies/sharded_scan.py)
+SHARDED_SCAN_WORKERS = 0  # Worker processes for market scans over a shared-memory panel (0 = per-symbol scan in-process)
+SHARDED_SCAN_SHARD_SIZE = 256  # Symbols per worker task
+
+# 🛰️ Distributed sweeps (strategies/distributed.py)
+DISTRIBUTED_HOST = "127.0.0.1"  # Coordinator interface (use 0.0.0.0 to accept workers on other machines)
+DISTRIBUTED_PORT = 8765
+DISTRIBUTED_SHARD_SIZE = 50  # Symbols per job (jobs are symbol shard x parameter set x date range)
+DISTRIBUTED_JOB_TIMEOUT_SECONDS = 300  # A job not returned in time is reassigned to another worker
+DISTRIBUTED_MAX_ATTEMPTS = 3  # Errors, timeouts or lost workers per job before the sweep fails
+DISTRIBUTED_POLL_SECONDS = 1.0  # Idle workers ask for work this often
+DISTRIBUTED_CONNECT_TIMEOUT_SECONDS = 30  # Workers retry an unreachable coordinator this long before exiting
+
+# 🎮 RL trading environment (strategies/trading_env.py)
+RL_SYMBOLS = ["TSLA"]  # Feature-store keys the episodes are drawn from
+RL_FEATURES = ["Close", "SMA_20", "SMA_50", "RSI", "MACD", "MACD_Signal", "BB_High", "BB_Low"]
+RL_NUM_ENVS = 1024  # Episodes stepped in lockstep by one environment object
+RL_EPISODE_LENGTH = 252  # Bars per episode (about one trading year of daily bars)
+RL_OBSERVATION_WINDOW = 10  # Bars of scaled features in each observation
+RL_TRANSACTION_COST = 0.0  # Fraction of the traded value paid per buy/sell (0 = backtest_strategy accounting)
+
+# 🧪 Synthetic market data (utils/synthetic_data.py)
+SYNTHETIC_TIMEZONE = "Asia/Kolkata"  # Exchange time zone of the generated bars (NSE, like the .NS symbols)
+SYNTHETIC_SESSION = ("09:15", "15:30")  # Local session hours for intraday bars
+SYNTHETIC_END_DATE = "2024-12-31"  # Last generated session
+SYNTHETIC_SYMBOL_BLOCK = 256  # Symbols simulated together when streaming
+SYNTHETIC_MAX_CHUNK_VALUES = 2_000_000  # Symbols x bars per generated chunk (bounds memory when streaming)
+
+# ⏩ Simulated-clock replay (live_trading/simulation.py)
+SIMULATION_BAR_FREQ = "5m"  # Intraday bars replayed; each scan sees the bars closed by its simulated start
+SIMULATION_HISTORY_PERIOD = "6mo"  # History before the first replayed session (what scan_market fetches)
+SIMULATION_SCAN_INTERVAL_MINUTES = 30
+SIMULATION_POLL_SECONDS = 60  # Longest simulated sleep of the automation loop (its real-time polling period)
+SIMULATION_OUTPUT_DIR = "metrics/simulation"  # report.json plus the replay's Prometheus/scan-summary files
+
+# ⏱️ Benchmarks (benchmarks/run_benchmarks.py), offline on synthetic universes
+BENCHMARK_SCALES = {
+    "quick": [(1, "6mo"), (50, "6mo"), (1, "10y")],
+    "full": [(1, "6mo"), (50, "6mo"), (500, "6mo"), (1, "10y"), (50, "10y"), (500, "10y")],
+}  # (symbols, history) universes per run
+BENCHMARK_ROUNDS = 3  # Passes over each case's calls; throughput comes from the fastest pass
+BENCHMARK_MAX_SECONDS = 30.0  # Per-case time budget; cases stop early and report throughput so far
+BENCHMARK_MEMORY_CALLS = 3  # Calls re-run under tracemalloc for the peak memory figure
+BENCHMARK_REGRESSION_TOLERANCE = 0.2  # Throughput drop / peak memory growth vs. the baseline that fails the run
+BENCHMARK_RESULTS_DIR = "benchmarks/results"
+BENCHMARK_BASELINE_FILE = "benchmarks/baseline.json"
 
 # 📱 Telegram Configuration
 TELEGRAM_BOT_TOKEN = "YOUR_TELEGRAM_BOT_TOKEN"
 TELEGRAM_CHAT_ID = "YOUR_TELEGRAM_CHAT_ID"
+TELEGRAM_API_URL = "https://api.telegram.org"
+TELEGRAM_QUEUE_SIZE = 1000  # Alerts beyond this are dropped instead of blocking the scan
+TELEGRAM_DIGEST_WINDOW_SECONDS = 2.0  # Alerts arriving within this window are merged into one message
+TELEGRAM_MAX_RETRIES = 5
+TELEGRAM_REQUEST_TIMEOUT = 10  # Seconds
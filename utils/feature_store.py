@@ -0,0 +1,380 @@
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import ta
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.config import FEATURE_SET, FEATURE_STORE_DIR, FEATURE_STORE_SOURCES
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+META_FILE = "meta.json"
+INDEX_FILE = "index.bin"
+
+# Feature set definitions. Changing an indicator means bumping `version`: the
+# new version is built next to the old one, which stays readable.
+# `context_rows` bars before the first new bar are recomputed on append; it
+# must cover the longest window and let every EMA (MACD, RSI) decay to float
+# precision, so appended rows equal a full rebuild. `cumulative` columns
+# (running sums such as OBV) are re-based onto the last stored value.
+FEATURE_SETS = {
+    'daily_indicators': {
+        'version': 1,
+        'context_rows': 400,
+        'indicators': {
+            'SMA_20': lambda df: ta.trend.sma_indicator(df["Close"], window=20),
+            'SMA_50': lambda df: ta.trend.sma_indicator(df["Close"], window=50),
+            'SMA_200': lambda df: ta.trend.sma_indicator(df["Close"], window=200),
+            'RSI': lambda df: ta.momentum.rsi(df["Close"], window=14),
+            'MACD': lambda df: ta.trend.macd(df["Close"]),
+            'MACD_Signal': lambda df: ta.trend.macd_signal(df["Close"]),
+            'BB_High': lambda df: ta.volatility.bollinger_hband(df["Close"], window=20),
+            'BB_Low': lambda df: ta.volatility.bollinger_lband(df["Close"], window=20),
+            'OBV': lambda df: ta.volume.on_balance_volume(df["Close"], df["Volume"]),
+        },
+        'cumulative': ['OBV'],
+    },
+}
+
+
+def normalize_bars(bars):
+    """
+    Bring OHLCV bars from any source (yfinance, Alpaca, CSV) to one layout
+
+    Columns become Open/High/Low/Close/Volume (other columns are dropped),
+    the index becomes a sorted, tz-naive UTC DatetimeIndex without duplicates.
+
+    Returns:
+        pd.DataFrame: float64 OHLCV bars
+    """
+    renamed = {c: c.capitalize() for c in bars.columns if isinstance(c, str) and c.capitalize() in BAR_COLUMNS}
+    bars = bars.rename(columns=renamed)
+    missing = [c for c in BAR_COLUMNS if c not in bars.columns]
+    if missing:
+        raise KeyError(f"Bars are missing columns {missing}")
+    bars = bars[BAR_COLUMNS].apply(pd.to_numeric, errors="coerce").astype(np.float64)
+
+    index = pd.DatetimeIndex(pd.to_datetime(bars.index, utc=True)).tz_convert(None).as_unit("ns")
+    bars.index = index.rename("Date")
+    bars = bars[~bars.index.duplicated(keep="last")]
+    return bars.sort_index()
+
+
+def read_bars_csv(path):
+    """
+    Read a raw OHLCV CSV written by utils/data_loader.py (yfinance) or utils/tsla_fetch.py (Alpaca)
+
+    Returns:
+        pd.DataFrame: Normalized bars (see `normalize_bars`)
+    """
+    df = pd.read_csv(path, index_col=0)
+    # yfinance writes a second header row with the ticker under every column
+    if len(df) and pd.isna(pd.to_datetime(df.index[:1], errors="coerce")[0]):
+        df = df.iloc[1:]
+    return normalize_bars(df)
+
+
+def compute_features(bars, feature_set=FEATURE_SET):
+    """
+    Indicator columns for OHLCV bars (warm-up rows are NaN, nothing is dropped)
+
+    Args:
+        bars (pd.DataFrame): Normalized bars
+        feature_set (str): Name in FEATURE_SETS
+
+    Returns:
+        pd.DataFrame: Bars plus one column per indicator
+    """
+    spec = FEATURE_SETS[feature_set]
+    features = bars.copy()
+    for name, indicator in spec['indicators'].items():
+        features[name] = indicator(bars).astype(np.float64)
+    return features
+
+
+class FeatureStore:
+    """
+    Columnar, append-only store of per-symbol feature matrices
+
+    Layout:
+        <root>/<feature_set>@v<version>/<symbol>/meta.json    columns, row count, last timestamp
+        <root>/<feature_set>@v<version>/<symbol>/index.bin    int64 timestamps (ns, UTC)
+        <root>/<feature_set>@v<version>/<symbol>/<col>.bin    one raw float64 file per column
+
+    Columns are plain binary files, so readers memory-map exactly the
+    columns they need and appends only write the new rows at the end of
+    each file. meta.json is replaced atomically after the data is written,
+    which makes a half-finished append invisible (and it is truncated away
+    by the next append). One writer per symbol; any number of readers.
+    """
+
+    def __init__(self, root=FEATURE_STORE_DIR, feature_set=FEATURE_SET):
+        """
+        Args:
+            root (str): Store directory (relative paths are resolved from the project root)
+            feature_set (str): Name in FEATURE_SETS
+        """
+        if feature_set not in FEATURE_SETS:
+            raise KeyError(f"Unknown feature set: {feature_set}")
+        self.root = root if os.path.isabs(root) else os.path.join(project_root, root)
+        self.feature_set = feature_set
+        self.spec = FEATURE_SETS[feature_set]
+        self.version = f"{feature_set}@v{self.spec['version']}"
+        self.columns = BAR_COLUMNS + list(self.spec['indicators'])
+        self._lock = threading.Lock()
+
+    def _dir(self, symbol):
+        return os.path.join(self.root, self.version, symbol)
+
+    def symbols(self):
+        """
+        Returns:
+            list: Symbols stored for this feature-set version
+        """
+        path = os.path.join(self.root, self.version)
+        if not os.path.isdir(path):
+            return []
+        return sorted(s for s in os.listdir(path) if os.path.exists(os.path.join(path, s, META_FILE)))
+
+    def meta(self, symbol):
+        """
+        Returns:
+            dict: Stored metadata, or None if the symbol is not in the store
+        """
+        path = os.path.join(self._dir(symbol), META_FILE)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def last_timestamp(self, symbol):
+        """
+        Returns:
+            pd.Timestamp: Time of the last stored bar (tz-naive UTC), or None
+        """
+        meta = self.meta(symbol)
+        return pd.Timestamp(meta['last_timestamp']) if meta and meta['n_rows'] else None
+
+    def _write_meta(self, directory, n_rows, last_timestamp):
+        meta = {
+            'feature_set': self.feature_set,
+            'version': self.spec['version'],
+            'columns': self.columns,
+            'dtype': "float64",
+            'n_rows': int(n_rows),
+            'last_timestamp': last_timestamp.isoformat() if last_timestamp is not None else None,
+        }
+        tmp_path = os.path.join(directory, f"{META_FILE}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, os.path.join(directory, META_FILE))
+
+    def write(self, symbol, bars):
+        """
+        Build a symbol's feature matrix from scratch (replaces any stored data)
+
+        Args:
+            symbol (str): Symbol
+            bars (pd.DataFrame): OHLCV bars (any layout `normalize_bars` accepts)
+
+        Returns:
+            int: Rows stored
+        """
+        features = compute_features(normalize_bars(bars), self.feature_set)
+        directory = self._dir(symbol)
+        tmp_dir = f"{directory}.tmp"
+        with self._lock:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            features.index.asi8.astype("<i8").tofile(os.path.join(tmp_dir, INDEX_FILE))
+            for column in self.columns:
+                features[column].to_numpy(dtype="<f8").tofile(os.path.join(tmp_dir, f"{column}.bin"))
+            self._write_meta(tmp_dir, len(features), features.index[-1] if len(features) else None)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.replace(tmp_dir, directory)
+        logger.info(f"💾 Stored {symbol} ({len(features)} rows) in {self.version}")
+        return len(features)
+
+    def append(self, symbol, bars):
+        """
+        Add the bars newer than the last stored one, computing only their features
+
+        Indicators are computed over the new bars plus `context_rows` stored
+        bars before them, so appended rows match a full rebuild.
+
+        Args:
+            symbol (str): Symbol
+            bars (pd.DataFrame): OHLCV bars; bars at or before the last stored time are ignored
+
+        Returns:
+            int: Rows appended
+        """
+        meta = self.meta(symbol)
+        if meta is None or meta['n_rows'] == 0:
+            return self.write(symbol, bars)
+
+        bars = normalize_bars(bars)
+        bars = bars[bars.index > pd.Timestamp(meta['last_timestamp'])]
+        if bars.empty:
+            return 0
+
+        with self._lock:
+            n_rows = meta['n_rows']
+            start = max(0, n_rows - self.spec['context_rows'])
+            context = self.read(symbol, BAR_COLUMNS, rows=slice(start, n_rows))
+            features = compute_features(pd.concat([context, bars]), self.feature_set)
+            new = features.iloc[n_rows - start:].copy()
+            for column in self.spec['cumulative']:
+                # Re-base running sums onto the stored series
+                stored_last = self._column(symbol, column, n_rows)[-1]
+                new[column] = new[column] - features[column].iloc[n_rows - start - 1] + stored_last
+
+            directory = self._dir(symbol)
+            files = [(INDEX_FILE, new.index.asi8.astype("<i8"))]
+            files += [(f"{column}.bin", new[column].to_numpy(dtype="<f8")) for column in self.columns]
+            for name, values in files:
+                with open(os.path.join(directory, name), "r+b") as f:
+                    f.truncate(n_rows * 8)  # Drop the tail of an interrupted append
+                    f.seek(0, os.SEEK_END)
+                    values.tofile(f)
+            self._write_meta(directory, n_rows + len(new), new.index[-1])
+        logger.info(f"➕ Appended {len(new)} rows to {symbol} ({n_rows + len(new)} total)")
+        return len(new)
+
+    def _column(self, symbol, column, n_rows):
+        if n_rows == 0:
+            return np.empty(0, dtype=np.float64)
+        return np.memmap(os.path.join(self._dir(symbol), f"{column}.bin"), dtype="<f8", mode="r", shape=(n_rows,))
+
+    def _resolve(self, columns):
+        # Column lookup is case-insensitive ("close" -> "Close") for models trained on Alpaca data
+        lookup = {c.lower(): c for c in self.columns}
+        resolved = []
+        for column in columns:
+            if column.lower() not in lookup:
+                raise KeyError(f"{self.version} has no column {column}")
+            resolved.append(lookup[column.lower()])
+        return resolved
+
+    def arrays(self, symbol, columns=None):
+        """
+        Zero-copy access: memory-mapped timestamps and columns
+
+        Args:
+            symbol (str): Symbol
+            columns (list): Columns to map (default: all)
+
+        Returns:
+            tuple: (np.ndarray of int64 ns timestamps, dict column -> read-only float64 memmap)
+        """
+        meta = self.meta(symbol)
+        if meta is None:
+            raise KeyError(f"{symbol} is not in the feature store ({self.version})")
+        n_rows = meta['n_rows']
+        names = list(columns) if columns is not None else self.columns
+        index = (np.memmap(os.path.join(self._dir(symbol), INDEX_FILE), dtype="<i8", mode="r", shape=(n_rows,))
+                 if n_rows else np.empty(0, dtype=np.int64))
+        return index, {name: self._column(symbol, column, n_rows) for name, column in zip(names, self._resolve(names))}
+
+    def matrix(self, symbol, columns, dropna=True):
+        """
+        (n_rows, n_columns) float64 feature matrix in the requested column order
+
+        Returns:
+            np.ndarray: Feature rows (warm-up rows with NaNs removed when `dropna`)
+        """
+        _, arrays = self.arrays(symbol, columns)
+        matrix = np.column_stack([arrays[c] for c in columns]) if arrays else np.empty((0, 0))
+        return matrix[~np.isnan(matrix).any(axis=1)] if dropna else matrix
+
+    def read(self, symbol, columns=None, start=None, end=None, rows=None, dropna=False):
+        """
+        Feature matrix as a DataFrame
+
+        Args:
+            symbol (str): Symbol
+            columns (list): Columns in the requested order and spelling (default: all)
+            start, end: Optional time bounds (inclusive)
+            rows (slice): Optional row range (applied before the time bounds)
+            dropna (bool): Drop indicator warm-up rows
+
+        Returns:
+            pd.DataFrame: Date-indexed features
+        """
+        index, arrays = self.arrays(symbol, columns)
+        rows = rows or slice(None)
+        df = pd.DataFrame({name: np.asarray(values[rows]) for name, values in arrays.items()},
+                          index=pd.DatetimeIndex(np.asarray(index[rows]).view("datetime64[ns]"), name="Date"))
+        if start is not None or end is not None:
+            df = df.loc[start:end]
+        return df.dropna() if dropna else df
+
+
+def load_features(symbol, columns=None, dropna=True, store=None):
+    """
+    Read a symbol's features, building the store from FEATURE_STORE_SOURCES on first use
+
+    Args:
+        symbol (str): Symbol
+        columns (list): Columns (default: all)
+        dropna (bool): Drop indicator warm-up rows
+        store (FeatureStore): Store to read (default: FEATURE_STORE_DIR / FEATURE_SET)
+
+    Returns:
+        pd.DataFrame: Date-indexed features
+    """
+    store = store or FeatureStore()
+    if store.meta(symbol) is None:
+        source = FEATURE_STORE_SOURCES.get(symbol)
+        if source is None:
+            raise KeyError(f"{symbol} is not in the feature store and has no configured source")
+        store.write(symbol, read_bars_csv(os.path.join(project_root, source)))
+    return store.read(symbol, columns, dropna=dropna)
+
+
+def read_source(source):
+    """
+    Load the data a model manifest's `source` points to
+
+    Args:
+        source (str): "feature_store:<symbol>" or a CSV path relative to the project root
+
+    Returns:
+        pd.DataFrame: Date-indexed features
+    """
+    if source.startswith("feature_store:"):
+        return load_features(source.split(":", 1)[1])
+    return pd.read_csv(os.path.join(project_root, source), index_col=0, parse_dates=True)
+
+
+if __name__ == "__main__":
+    # Run from the project root:
+    #   python -m utils.feature_store build <symbol> <bars.csv>
+    #   python -m utils.feature_store append <symbol> <bars.csv>
+    #   python -m utils.feature_store list
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    store = FeatureStore()
+    if command == "build":
+        store.write(sys.argv[2], read_bars_csv(sys.argv[3]))
+    elif command == "append":
+        print(f"✅ Appended {store.append(sys.argv[2], read_bars_csv(sys.argv[3]))} rows")
+    elif command == "list":
+        for symbol in store.symbols():
+            meta = store.meta(symbol)
+            print(f"📦 {store.version}/{symbol}: {meta['n_rows']} rows up to {meta['last_timestamp']}")
+    else:
+        print(f"❌ Unknown command: {command}")
+        sys.exit(1)
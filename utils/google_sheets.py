@@ -2,24 +2,69 @@ import gspread
 from google.oauth2.service_account import Credentials
 import pandas as pd
 from datetime import datetime
+import atexit
 import logging
 import os
+import threading
+
+from utils.metrics import METRICS
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Worksheet layouts: name -> (rows, cols, header row)
+SHEET_LAYOUTS = {
+    "Trade Log": (1000, 10, [
+        "Timestamp", "Symbol", "Action", "Price", "Quantity",
+        "Total Value", "Status"
+    ]),
+    "Signals": (1000, 10, [
+        "Timestamp", "Symbol", "Signal", "Price", "Confidence",
+        "RSI", "SMA_20", "SMA_50", "MACD"
+    ]),
+    "P&L Summary": (20, 10, ["Metric", "Value", "Last Updated"]),
+}
+
 class GoogleSheetsLogger:
-    def __init__(self, credentials_file, spreadsheet_id):
+    def __init__(self, credentials_file, spreadsheet_id, buffered=True,
+                 flush_rows=100, flush_interval=5.0, spreadsheet=None):
         """
         Initialize Google Sheets integration for trade logging
         
+        Rows are buffered in memory and written with one `append_rows` call per
+        worksheet when `flush_rows` rows are pending or every `flush_interval`
+        seconds, from a background thread. Worksheet handles are cached, so each
+        worksheet is looked up once per process.
+        
         Args:
             credentials_file (str): Path to Google Service Account credentials JSON
             spreadsheet_id (str): Google Sheets spreadsheet ID
+            buffered (bool): Buffer rows and flush in the background (False writes each row immediately)
+            flush_rows (int): Number of pending rows that triggers a flush
+            flush_interval (float): Maximum seconds a row stays buffered
+            spreadsheet: Already-opened spreadsheet (or a local stand-in); skips authentication
         """
         self.spreadsheet_id = spreadsheet_id
         self.credentials_file = credentials_file
+        self.buffered = buffered
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        
+        self._worksheets = {}
+        self._pending_rows = {}
+        self._pending_pnl = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._flusher = None
+        atexit.register(self.close)
+        
+        if spreadsheet is not None:
+            self.client = None
+            self.spreadsheet = spreadsheet
+            return
         
         # Set up Google Sheets API scope
         scope = [
@@ -64,6 +109,155 @@ class GoogleSheetsLogger:
             self.client = None
             self.spreadsheet = None
     
+    def _get_worksheet(self, name):
+        """
+        Get a worksheet handle, creating the worksheet if needed (cached)
+        
+        Args:
+            name (str): Worksheet name from SHEET_LAYOUTS
+            
+        Returns:
+            Worksheet: gspread worksheet
+        """
+        worksheet = self._worksheets.get(name)
+        if worksheet is not None:
+            return worksheet
+        
+        try:
+            worksheet = self.spreadsheet.worksheet(name)
+        except gspread.WorksheetNotFound:
+            rows, cols, headers = SHEET_LAYOUTS[name]
+            worksheet = self.spreadsheet.add_worksheet(name, rows, cols)
+            if name != "P&L Summary":
+                worksheet.append_row(headers)
+        
+        self._worksheets[name] = worksheet
+        return worksheet
+    
+    def write_rows(self, name, rows):
+        """
+        Append rows to a worksheet immediately with a single API call
+        
+        Args:
+            name (str): Worksheet name
+            rows (list): Rows to append
+            
+        Raises:
+            Exception: Any gspread/API error, so callers can retry
+        """
+        if not rows:
+            return
+        worksheet = self._get_worksheet(name)
+        try:
+            with METRICS.timer("sheets_write"):
+                worksheet.append_rows(rows)
+        except Exception:
+            # Handle may be stale (worksheet deleted/renamed) - look it up again next time
+            self._worksheets.pop(name, None)
+            raise
+    
+    def write_pnl_rows(self, rows):
+        pnl_sheet = self._get_worksheet("P&L Summary")
+        try:
+            with METRICS.timer("sheets_write"):
+                pnl_sheet.update(values=rows, range_name=f"A1:C{len(rows)}")
+        except Exception:
+            self._worksheets.pop("P&L Summary", None)
+            raise
+    
+    def _enqueue(self, name, row):
+        """
+        Buffer a row (or write it straight away when buffering is off)
+        """
+        if not self.buffered:
+            self.write_rows(name, [row])
+            return
+        
+        with self._lock:
+            self._pending_rows.setdefault(name, []).append(row)
+            pending = sum(len(r) for r in self._pending_rows.values())
+        
+        self._start_flusher()
+        if pending >= self.flush_rows:
+            self._flush_event.set()
+    
+    def _start_flusher(self):
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._stop_event.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="sheets-flusher", daemon=True
+            )
+            self._flusher.start()
+    
+    def _flush_loop(self):
+        while not self._stop_event.is_set():
+            self._flush_event.wait(self.flush_interval)
+            self._flush_event.clear()
+            self.flush()
+    
+    def pending_rows(self):
+        """
+        Returns:
+            int: Number of buffered rows not yet written
+        """
+        with self._lock:
+            return sum(len(r) for r in self._pending_rows.values()) + (self._pending_pnl is not None)
+    
+    def flush(self):
+        """
+        Write all buffered rows (one append_rows per worksheet) and the latest P&L summary
+        
+        Rows that fail to write are put back in the buffer for the next flush.
+        
+        Returns:
+            bool: True if everything was written
+        """
+        if not self.spreadsheet:
+            return True
+        
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending_rows = self._pending_rows, {}
+                pnl, self._pending_pnl = self._pending_pnl, None
+            
+            ok = True
+            for name, rows in pending.items():
+                try:
+                    self.write_rows(name, rows)
+                    logger.info(f"✅ Flushed {len(rows)} row(s) to {name}")
+                except Exception as e:
+                    ok = False
+                    logger.error(f"❌ Failed to flush {len(rows)} row(s) to {name}: {e}")
+                    with self._lock:
+                        self._pending_rows[name] = rows + self._pending_rows.get(name, [])
+            
+            if pnl is not None:
+                try:
+                    self.write_pnl_rows(pnl)
+                    logger.info("✅ P&L Summary updated")
+                except Exception as e:
+                    ok = False
+                    logger.error(f"❌ Failed to update P&L summary: {e}")
+                    with self._lock:
+                        if self._pending_pnl is None:
+                            self._pending_pnl = pnl
+            
+            return ok
+    
+    def close(self):
+        """
+        Flush pending rows and stop the background flusher
+        """
+        self._stop_event.set()
+        self._flush_event.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self.flush_interval + 1)
+        self.flush()
+    
     def log_trade(self, symbol, action, price, quantity, timestamp=None):
         """
         Log a trade to the Trade Log sheet
@@ -83,31 +277,7 @@ class GoogleSheetsLogger:
             timestamp = datetime.now()
         
         try:
-            # Get or create Trade Log worksheet
-            try:
-                trade_log_sheet = self.spreadsheet.worksheet("Trade Log")
-            except gspread.WorksheetNotFound:
-                trade_log_sheet = self.spreadsheet.add_worksheet("Trade Log", 1000, 10)
-                # Add headers
-                trade_log_sheet.append_row([
-                    "Timestamp", "Symbol", "Action", "Price", "Quantity", 
-                    "Total Value", "Status"
-                ])
-            
-            # Calculate total value
-            total_value = price * quantity
-            
-            # Append trade data
-            trade_log_sheet.append_row([
-                timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-                symbol,
-                action,
-                f"${price:.2f}",
-                quantity,
-                f"${total_value:.2f}",
-                "EXECUTED"
-            ])
-            
+            self._enqueue("Trade Log", format_trade_row(symbol, action, price, quantity, timestamp))
             logger.info(f"✅ Trade logged: {action} {quantity} {symbol} at ${price:.2f}")
             
         except Exception as e:
@@ -117,6 +287,9 @@ class GoogleSheetsLogger:
         """
         Update P&L summary in a separate sheet
         
+        The whole tab is rewritten with a single range update; when buffered,
+        only the latest summary is kept until the next flush.
+        
         Args:
             total_pnl (float): Total profit/loss
             win_count (int): Number of winning trades
@@ -127,39 +300,22 @@ class GoogleSheetsLogger:
             logger.info(f"📊 P&L Summary (not logged): Total P&L: ${total_pnl:.2f}, Win Rate: {win_rate:.2f}%")
             return
         
+        summary_data = format_pnl_rows(total_pnl, win_count, total_trades, win_rate)
+        
         try:
-            # Get or create P&L Summary worksheet
-            try:
-                pnl_sheet = self.spreadsheet.worksheet("P&L Summary")
-            except gspread.WorksheetNotFound:
-                pnl_sheet = self.spreadsheet.add_worksheet("P&L Summary", 20, 10)
-                # Add headers
-                pnl_sheet.append_row([
-                    "Metric", "Value", "Last Updated"
-                ])
-            
-            # Clear existing data (except headers)
-            pnl_sheet.clear()
-            pnl_sheet.append_row(["Metric", "Value", "Last Updated"])
-            
-            # Add summary data
-            summary_data = [
-                ["Total P&L", f"${total_pnl:.2f}", datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                ["Total Trades", total_trades, ""],
-                ["Winning Trades", win_count, ""],
-                ["Win Rate", f"{win_rate:.2f}%", ""],
-                ["Average P&L per Trade", f"${total_pnl/total_trades:.2f}" if total_trades > 0 else "$0.00", ""]
-            ]
-            
-            for row in summary_data:
-                pnl_sheet.append_row(row)
+            if self.buffered:
+                with self._lock:
+                    self._pending_pnl = summary_data
+                self._start_flusher()
+            else:
+                self.write_pnl_rows(summary_data)
             
             logger.info(f"✅ P&L Summary updated: Total P&L: ${total_pnl:.2f}, Win Rate: {win_rate:.2f}%")
             
         except Exception as e:
             logger.error(f"❌ Failed to update P&L summary: {e}")
     
-    def log_signal(self, symbol, signal_type, price, confidence, indicators):
+    def log_signal(self, symbol, signal_type, price, confidence, indicators, timestamp=None):
         """
         Log trading signals to a separate sheet
         
@@ -169,36 +325,17 @@ class GoogleSheetsLogger:
             price (float): Current price
             confidence (float): Signal confidence (0-1)
             indicators (dict): Technical indicators used
+            timestamp (datetime): Signal timestamp
         """
         if not self.spreadsheet:
             logger.info(f"📊 Signal (not logged): {signal_type} {symbol} at ${price:.2f}")
             return
         
+        if timestamp is None:
+            timestamp = datetime.now()
+        
         try:
-            # Get or create Signals worksheet
-            try:
-                signals_sheet = self.spreadsheet.worksheet("Signals")
-            except gspread.WorksheetNotFound:
-                signals_sheet = self.spreadsheet.add_worksheet("Signals", 1000, 10)
-                # Add headers
-                signals_sheet.append_row([
-                    "Timestamp", "Symbol", "Signal", "Price", "Confidence", 
-                    "RSI", "SMA_20", "SMA_50", "MACD"
-                ])
-            
-            # Append signal data
-            signals_sheet.append_row([
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                symbol,
-                signal_type,
-                f"${price:.2f}",
-                f"{confidence:.2f}",
-                f"{indicators.get('RSI', 0):.2f}",
-                f"${indicators.get('SMA_20', 0):.2f}",
-                f"${indicators.get('SMA_50', 0):.2f}",
-                f"{indicators.get('MACD', 0):.4f}"
-            ])
-            
+            self._enqueue("Signals", format_signal_row(symbol, signal_type, price, confidence, indicators, timestamp))
             logger.info(f"✅ Signal logged: {signal_type} {symbol} at ${price:.2f}")
             
         except Exception as e:
@@ -212,3 +349,69 @@ class GoogleSheetsLogger:
             bool: True if connected, False otherwise
         """
         return self.spreadsheet is not None
+
+
+def format_trade_row(symbol, action, price, quantity, timestamp, status="EXECUTED"):
+    """
+    Build a Trade Log row
+    """
+    total_value = price * quantity
+    return [
+        timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        symbol,
+        action,
+        f"${price:.2f}",
+        quantity,
+        f"${total_value:.2f}",
+        status
+    ]
+
+def format_signal_row(symbol, signal_type, price, confidence, indicators, timestamp):
+    """
+    Build a Signals row
+    """
+    return [
+        timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        symbol,
+        signal_type,
+        f"${price:.2f}",
+        f"{confidence:.2f}",
+        f"{indicators.get('RSI', 0):.2f}",
+        f"${indicators.get('SMA_20', 0):.2f}",
+        f"${indicators.get('SMA_50', 0):.2f}",
+        f"{indicators.get('MACD', 0):.4f}"
+    ]
+
+def format_pnl_rows(total_pnl, win_count, total_trades, win_rate, updated=None):
+    """
+    Build the full P&L Summary tab (header + metrics)
+    """
+    if updated is None:
+        updated = datetime.now()
+    return [
+        ["Metric", "Value", "Last Updated"],
+        ["Total P&L", f"${total_pnl:.2f}", updated.strftime("%Y-%m-%d %H:%M:%S")],
+        ["Total Trades", total_trades, ""],
+        ["Winning Trades", win_count, ""],
+        ["Win Rate", f"{win_rate:.2f}%", ""],
+        ["Average P&L per Trade", f"${total_pnl/total_trades:.2f}" if total_trades > 0 else "$0.00", ""]
+    ]
+
+if __name__ == "__main__":
+    # Run from the project root: python -m utils.google_sheets
+    # Demo against a local gspread stand-in: API calls per scan stay constant
+    from utils.standins import FakeSpreadsheet
+    
+    spreadsheet = FakeSpreadsheet()
+    sheets_logger = GoogleSheetsLogger(None, None, spreadsheet=spreadsheet)
+    
+    for scan in range(3):
+        before = spreadsheet.api_calls
+        for i in range(50):
+            sheets_logger.log_signal(f"SYM{i}.NS", "BUY", 100.0 + i, 0.5,
+                                     {'RSI': 25.0, 'SMA_20': 101.0, 'SMA_50': 100.0, 'MACD': 0.1})
+        sheets_logger.update_pnl_summary(1234.5, 7, 10, 70.0)
+        sheets_logger.flush()
+        print(f"📊 Scan {scan + 1}: 50 signals -> {spreadsheet.api_calls - before} API call(s)")
+    
+    sheets_logger.close()
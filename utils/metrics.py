@@ -0,0 +1,364 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds in seconds (50µs .. 120s, roughly x2.5 per bucket)
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0
+)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (Prometheus-compatible cumulative buckets)
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by linear interpolation inside the matching bucket
+
+        Args:
+            q (float): Quantile in [0, 1]
+
+        Returns:
+            float: Estimated value in seconds (0.0 when empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count > 0:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+class _Timer:
+    __slots__ = ('registry', 'stage', 'symbol', 'start')
+
+    def __init__(self, registry, stage, symbol):
+        self.registry = registry
+        self.stage = stage
+        self.symbol = symbol
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.stage, time.perf_counter() - self.start, self.symbol)
+        if exc_type is not None:
+            self.registry.increment("stage_errors", stage=self.stage)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    """
+    Low-overhead stage timers, counters and latency histograms
+
+    - `timer(stage, symbol)` records the stage duration into a per-stage
+      histogram and adds it to a per-(stage, symbol) seconds counter
+    - `increment(name, **labels)` bumps a counter
+    - `render_prometheus` / `write_prometheus` / `start_http_server` export
+      everything in Prometheus text format
+    - `scan_scope` collects per-stage totals for one scan so a summary
+      record can be written with `write_scan_summary`; only timers of the
+      thread that opened the scope count (not the background dispatcher,
+      Sheets flusher or journal tailers)
+    """
+
+    def __init__(self, enabled=True, prefix="trading"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._stage_seconds = {}
+        self._counters = {}
+        self._local = threading.local()  # Per-thread scan scope
+        self._http_server = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+    def timer(self, stage, symbol=None):
+        """
+        Time a block of code
+
+        Args:
+            stage (str): Pipeline stage name ('fetch', 'indicators', ...)
+            symbol (str): Stock symbol the work belongs to, if any
+
+        Returns:
+            Context manager (a shared no-op when metrics are disabled)
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage, symbol)
+
+    def observe(self, stage, seconds, symbol=None):
+        """
+        Record a stage duration measured elsewhere
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram()
+            histogram.observe(seconds)
+            key = (stage, symbol)
+            self._stage_seconds[key] = self._stage_seconds.get(key, 0.0) + seconds
+            scope = getattr(self._local, 'scope', None)
+            if scope is not None:
+                scope[stage] = scope.get(stage, 0.0) + seconds
+
+    def increment(self, name, value=1, **labels):
+        """
+        Increase a counter
+
+        Args:
+            name (str): Counter name (exported as <prefix>_<name>_total)
+            value (float): Amount to add
+            **labels: Prometheus labels
+        """
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._stage_seconds.clear()
+            self._counters.clear()
+
+    # ------------------------------------------------------------------
+    # Per-scan summaries
+    # ------------------------------------------------------------------
+    def scan_scope(self):
+        """
+        Start collecting per-stage totals for one scan on the calling thread
+
+        Returns:
+            dict: Stage -> seconds, filled in as stages complete
+        """
+        scope = {}
+        self._local.scope = scope
+        return scope
+
+    def end_scan_scope(self):
+        self._local.scope = None
+
+    def write_scan_summary(self, path, record):
+        """
+        Append a per-scan summary record as one JSON line
+
+        Args:
+            path (str): JSON-lines file
+            record (dict): Summary (timestamps, stage totals, counts)
+        """
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def snapshot(self):
+        """
+        Returns:
+            dict: Stage -> {'count', 'sum', 'p50', 'p95', 'p99'}
+        """
+        with self._lock:
+            return {
+                stage: {
+                    'count': h.count,
+                    'sum': h.sum,
+                    'p50': h.quantile(0.5),
+                    'p95': h.quantile(0.95),
+                    'p99': h.quantile(0.99),
+                }
+                for stage, h in self._histograms.items()
+            }
+
+    def render_prometheus(self):
+        """
+        Returns:
+            str: All metrics in Prometheus text exposition format
+        """
+        p = self.prefix
+        lines = []
+        with self._lock:
+            name = f"{p}_stage_duration_seconds"
+            lines.append(f"# HELP {name} Duration of pipeline stages")
+            lines.append(f"# TYPE {name} histogram")
+            for stage, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.sum:.9f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+            name = f"{p}_stage_duration_quantile_seconds"
+            lines.append(f"# HELP {name} Estimated stage duration quantiles")
+            lines.append(f"# TYPE {name} gauge")
+            for stage, h in sorted(self._histograms.items()):
+                for q in QUANTILES:
+                    lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {h.quantile(q):.9f}')
+
+            name = f"{p}_stage_seconds_total"
+            lines.append(f"# HELP {name} Cumulative time spent per stage and symbol")
+            lines.append(f"# TYPE {name} counter")
+            for (stage, symbol), seconds in sorted(self._stage_seconds.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")):
+                labels = f'stage="{stage}"' + (f',symbol="{symbol}"' if symbol else "")
+                lines.append(f"{name}{{{labels}}} {seconds:.9f}")
+
+            current = None
+            for (counter, labels), value in sorted(self._counters.items()):
+                name = f"{p}_{counter}_total"
+                if name != current:
+                    lines.append(f"# TYPE {name} counter")
+                    current = name
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path):
+        """
+        Atomically write the Prometheus text file (e.g. for node_exporter's textfile collector)
+        """
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render_prometheus())
+        os.replace(tmp_path, path)
+
+    def start_http_server(self, port, host="127.0.0.1"):
+        """
+        Serve /metrics on a local port from a background thread
+
+        Returns:
+            int: Bound port
+        """
+        if self._http_server is not None:
+            return self._http_server.server_address[1]
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer((host, port), Handler)
+        self._http_server.daemon_threads = True
+        threading.Thread(target=self._http_server.serve_forever, daemon=True).start()
+        bound = self._http_server.server_address[1]
+        logger.info(f"✅ Metrics endpoint listening on http://{host}:{bound}/metrics")
+        return bound
+
+
+# Process-wide registry used by the strategy and the automated trading system
+METRICS = MetricsRegistry()
+
+
+def scan_summary_record(scope, started_at, duration, **fields):
+    """
+    Build a per-scan summary record
+
+    Args:
+        scope (dict): Stage totals collected by `scan_scope`
+        started_at (datetime): Scan start time
+        duration (float): Scan wall time in seconds
+        **fields: Extra fields (symbols, signals, errors, ...)
+
+    Returns:
+        dict: Summary record
+    """
+    record = {
+        'timestamp': started_at.isoformat() if isinstance(started_at, datetime) else started_at,
+        'duration_seconds': round(duration, 6),
+        'stages': {stage: round(seconds, 6) for stage, seconds in sorted(scope.items())},
+    }
+    record.update(fields)
+    return record
+
+
+if __name__ == "__main__":
+    # Measure instrumentation overhead per timed block
+    registry = MetricsRegistry()
+    n = 200000
+
+    start = time.perf_counter()
+    for _ in range(n):
+        pass
+    baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(n):
+        with registry.timer("bench", "SYM.NS"):
+            pass
+    timed = time.perf_counter() - start
+
+    registry.enabled = False
+    start = time.perf_counter()
+    for i in range(n):
+        with registry.timer("bench", "SYM.NS"):
+            pass
+    disabled = time.perf_counter() - start
+
+    print(f"⏱️ Enabled timer overhead: {(timed - baseline) / n * 1e6:.2f} µs per block")
+    print(f"⏱️ Disabled timer overhead: {(disabled - baseline) / n * 1e6:.3f} µs per block")
+    print(registry.snapshot())
@@ -0,0 +1,253 @@
+import collections
+import functools
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class _NullSession:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SESSION = _NullSession()
+
+
+class ProfileSession:
+    """
+    One profiled run: a sampling CPU profiler thread plus tracemalloc snapshots
+    """
+
+    def __init__(self, profiler, label):
+        self.profiler = profiler
+        self.label = label
+        self.samples = collections.Counter()
+        self._stop_event = threading.Event()
+        self._sampler = None
+        self._started_tracemalloc = False
+        self._snapshot_start = None
+
+    def __enter__(self):
+        self.started_at = datetime.now()
+        self.start_time = time.perf_counter()
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.profiler.traceback_frames)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._snapshot_start = tracemalloc.take_snapshot()
+
+        self._target = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+        self._sampler.start()
+        return self
+
+    def _sample_loop(self):
+        interval = self.profiler.sample_interval
+        own_file = __file__
+        while not self._stop_event.wait(interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                if code.co_filename != own_file:
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop_event.set()
+        self._sampler.join()
+        duration = time.perf_counter() - self.start_time
+
+        snapshot_end = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            self.profiler._write_reports(self, snapshot_end, peak, duration)
+        except Exception as e:
+            logger.error(f"❌ Failed to write profile for {self.label}: {e}")
+        finally:
+            self.profiler._session_finished()
+        return False
+
+
+class ScanProfiler:
+    """
+    On-demand CPU and allocation profiler for scans and backtests
+
+    Arm it for the next N runs with `arm(n)`, the TRADING_PROFILE_SCANS
+    environment variable, or SIGUSR1 (see `install_signal_handler`). Each
+    profiled run writes to `output_dir`:
+    - <label>_<time>.folded: sampled stacks in folded format (flamegraph.pl / speedscope)
+    - <label>_<time>_alloc.txt: top allocations by source line and peak traced memory
+    The profiler disarms itself after N runs. When not armed, `profile`
+    returns a shared no-op context manager and `profiled` calls straight through.
+    """
+
+    def __init__(self, output_dir="profiles", sample_interval=0.005, top_n=25,
+                 traceback_frames=1, signal_scans=1):
+        """
+        Args:
+            output_dir (str): Directory for profile reports
+            sample_interval (float): Seconds between stack samples
+            top_n (int): Number of allocation sites in the report
+            traceback_frames (int): Frames stored per allocation by tracemalloc
+            signal_scans (int): Runs to profile when armed by SIGUSR1
+        """
+        self.output_dir = output_dir
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+        self.traceback_frames = traceback_frames
+        self.signal_scans = signal_scans
+        self.remaining = 0
+        self.active = False
+        # Runs requested by SIGUSR1, picked up by the next `profile` call. The
+        # handler runs on the main thread between bytecodes, possibly while that
+        # thread holds `_lock`, so it only assigns this attribute
+        self._signal_runs = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Build a profiler from utils/config.py, overridden by environment variables:
+        TRADING_PROFILE_SCANS, TRADING_PROFILE_DIR, TRADING_PROFILE_INTERVAL
+        """
+        from utils.config import PROFILE_DIR, PROFILE_SAMPLE_INTERVAL, PROFILE_SCANS_ON_SIGNAL
+
+        profiler = cls(
+            output_dir=os.environ.get("TRADING_PROFILE_DIR", PROFILE_DIR),
+            sample_interval=float(os.environ.get("TRADING_PROFILE_INTERVAL", PROFILE_SAMPLE_INTERVAL)),
+            signal_scans=PROFILE_SCANS_ON_SIGNAL,
+        )
+        try:
+            scans = int(os.environ.get("TRADING_PROFILE_SCANS", "0") or 0)
+        except ValueError:
+            logger.warning(f"⚠️ Ignoring TRADING_PROFILE_SCANS={os.environ['TRADING_PROFILE_SCANS']!r} (not an integer)")
+            scans = 0
+        if scans > 0:
+            profiler.arm(scans)
+        return profiler
+
+    def arm(self, runs):
+        """
+        Profile the next `runs` runs
+        """
+        with self._lock:
+            self.remaining = runs
+        logger.info(f"🔬 Profiler armed for the next {runs} run(s) -> {self.output_dir}/")
+
+    def disarm(self):
+        with self._lock:
+            self.remaining = 0
+            self._signal_runs = 0
+
+    def install_signal_handler(self, signum=None):
+        """
+        Arm the profiler for `signal_scans` runs whenever the process receives SIGUSR1
+
+        Returns:
+            bool: True if the handler was installed (main thread on POSIX only)
+        """
+        if signum is None:
+            signum = getattr(signal, "SIGUSR1", None)
+        if signum is None or threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signum, self._on_signal)
+        return True
+
+    def _on_signal(self, signum, frame):
+        # No locks or logging here: see `_signal_runs`
+        self._signal_runs = self.signal_scans
+
+    def profile(self, label):
+        """
+        Context manager that profiles the enclosed block if the profiler is armed
+
+        Args:
+            label (str): Name used in report file names
+        """
+        if not (self.remaining or self._signal_runs) or self.active:
+            return _NULL_SESSION
+        with self._lock:
+            signal_runs, self._signal_runs = self._signal_runs, 0
+            if signal_runs:
+                self.remaining = signal_runs
+            if not self.remaining or self.active:
+                return _NULL_SESSION
+            self.active = True
+        if signal_runs:
+            logger.info(f"🔬 Profiler armed by signal for the next {signal_runs} run(s) -> {self.output_dir}/")
+        return ProfileSession(self, label)
+
+    def profiled(self, label):
+        """
+        Decorator form of `profile`
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not (self.remaining or self._signal_runs) or self.active:
+                    return func(*args, **kwargs)
+                with self.profile(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _session_finished(self):
+        with self._lock:
+            self.active = False
+            self.remaining = max(self.remaining - 1, 0)
+            remaining = self.remaining
+        if remaining == 0:
+            logger.info("🔬 Profiler finished its runs and disarmed itself")
+
+    def _write_reports(self, session, snapshot_end, peak, duration):
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = session.started_at.strftime("%Y%m%d_%H%M%S_%f")
+        base = os.path.join(self.output_dir, f"{session.label}_{stamp}")
+
+        with open(f"{base}.folded", "w") as f:
+            for stack, count in session.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        snapshot_end = snapshot_end.filter_traces(filters)
+        snapshot_start = session._snapshot_start.filter_traces(filters)
+        growth = snapshot_end.compare_to(snapshot_start, "lineno")
+        current = snapshot_end.statistics("lineno")
+
+        with open(f"{base}_alloc.txt", "w") as f:
+            f.write(f"Profile: {session.label} started {session.started_at.isoformat()}\n")
+            f.write(f"Duration: {duration:.3f}s, CPU samples: {sum(session.samples.values())}\n")
+            f.write(f"Peak traced memory: {peak / 1024 / 1024:.2f} MiB\n\n")
+            f.write(f"Top {self.top_n} allocation growth by line:\n")
+            for stat in growth[:self.top_n]:
+                f.write(f"  {stat}\n")
+            f.write(f"\nTop {self.top_n} live allocations at end by line:\n")
+            for stat in current[:self.top_n]:
+                f.write(f"  {stat}\n")
+
+        logger.info(f"🔬 Profile written: {base}.folded, {base}_alloc.txt ({duration:.2f}s)")
+
+
+# Process-wide profiler used by the strategy and the automated trading system
+PROFILER = ScanProfiler.from_env()
@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.compact import epochs_to_index, index_epochs
+from utils.config import BACKTEST_SPILL_CHUNK_SYMBOLS, BACKTEST_SPILL_DIR
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+
+
+class SpilledFrame:
+    """
+    Lazy handle to one symbol's spilled series; load() reads it back as a DataFrame
+    """
+
+    def __init__(self, spill, symbol):
+        self.spill = spill
+        self.symbol = symbol
+
+    def load(self):
+        return self.spill.load(self.symbol)
+
+    def __repr__(self):
+        return f"SpilledFrame({self.symbol!r} in {self.spill.path})"
+
+
+class SeriesSpill:
+    """
+    Per-symbol time series written to compressed on-disk chunks
+
+    Series are buffered until `chunk_symbols` symbols are pending, then
+    written as one compressed .npz chunk, so memory holds at most one chunk
+    whatever the universe size. Reads open only the symbol's own arrays.
+    Opening a spill directory clears the previous run's chunks.
+    """
+
+    def __init__(self, path=BACKTEST_SPILL_DIR, chunk_symbols=BACKTEST_SPILL_CHUNK_SYMBOLS):
+        """
+        Args:
+            path (str): Spill directory (emptied on open)
+            chunk_symbols (int): Symbols per chunk file
+        """
+        self.path = path
+        self.chunk_symbols = chunk_symbols
+        self.manifest = {}
+        self._pending = {}
+        self._chunks = 0
+        self._lock = threading.Lock()
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+
+    def append(self, symbol, index, columns, tz=None):
+        """
+        Buffer one symbol's series (written with the next full chunk)
+
+        Args:
+            symbol (str): Symbol
+            index (pd.DatetimeIndex or np.ndarray): Bar timestamps, or int64 epoch nanoseconds (compact frames)
+            columns (dict): Column name -> np.ndarray aligned with `index`
+            tz (str): Time zone of epoch-nanosecond timestamps
+
+        Returns:
+            SpilledFrame: Lazy handle to the series
+        """
+        if isinstance(index, pd.DatetimeIndex):
+            epochs, tz = index_epochs(index)
+        else:
+            epochs = np.asarray(index, dtype=np.int64)
+        with self._lock:
+            self._pending[symbol] = {
+                'index': epochs,
+                'tz': tz,
+                'columns': {name: np.asarray(values) for name, values in columns.items()},
+            }
+            if len(self._pending) >= self.chunk_symbols:
+                self._write_chunk()
+        return SpilledFrame(self, symbol)
+
+    def _write_chunk(self):
+        name = f"chunk_{self._chunks:05d}.npz"
+        arrays = {}
+        for slot, (symbol, series) in enumerate(self._pending.items()):
+            arrays[f"{slot}.index"] = series['index']
+            for column, values in series['columns'].items():
+                arrays[f"{slot}.{column}"] = values
+            self.manifest[symbol] = {'chunk': name, 'slot': slot, 'tz': series['tz'],
+                                     'columns': list(series['columns'])}
+        np.savez_compressed(os.path.join(self.path, name), **arrays)
+        self._pending = {}
+        self._chunks += 1
+        with open(os.path.join(self.path, MANIFEST_FILE), "w") as f:
+            json.dump(self.manifest, f)
+
+    def flush(self):
+        """
+        Write the pending (partial) chunk
+        """
+        with self._lock:
+            if self._pending:
+                self._write_chunk()
+
+    def load(self, symbol):
+        """
+        Read one symbol's series back
+
+        Returns:
+            pd.DataFrame: Spilled columns indexed like the appended index
+        """
+        with self._lock:
+            pending = self._pending.get(symbol)
+            entry = self.manifest.get(symbol)
+        if pending is not None:
+            stamps, tz, columns = pending['index'], pending['tz'], dict(pending['columns'])
+        elif entry is not None:
+            slot = entry['slot']
+            with np.load(os.path.join(self.path, entry['chunk'])) as chunk:
+                stamps = chunk[f"{slot}.index"]
+                columns = {column: chunk[f"{slot}.{column}"] for column in entry['columns']}
+            tz = entry['tz']
+        else:
+            raise KeyError(f"{symbol} was not spilled to {self.path}")
+        return pd.DataFrame(columns, index=epochs_to_index(stamps, tz))
+
+    def symbols(self):
+        with self._lock:
+            return list(self.manifest) + list(self._pending)
+
+    def disk_bytes(self):
+        return sum(os.path.getsize(os.path.join(self.path, f)) for f in os.listdir(self.path))
+
+
+def _peak_rss_mb():
+    # VmHWM starts afresh at exec; ru_maxrss would carry over the forking parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure_run(universe_dir, n_symbols, results_mode):
+    """
+    Run the strategy over the first `n_symbols` symbols of a binary universe; returns peak RSS and timings
+    """
+    import time
+    from strategies.assignment_strategy import AssignmentTradingStrategy
+    from utils.synthetic_data import load_binary
+
+    with open(os.path.join(universe_dir, "meta.json")) as f:
+        symbols = json.load(f)['symbols'][:n_symbols]
+    strategy = AssignmentTradingStrategy(data_fetcher=lambda symbol, period: load_binary(universe_dir, symbol))
+    spill = SeriesSpill(os.path.join(universe_dir, f"spill_{n_symbols}")) if results_mode == "summary" else None
+    start = time.perf_counter()
+    results = strategy.run_strategy_for_symbols(symbols, results_mode=results_mode, spill=spill)
+    return {
+        'symbols': len(results),
+        'seconds': time.perf_counter() - start,
+        'peak_rss_mb': _peak_rss_mb(),
+        'spill_mb': spill.disk_bytes() / 1e6 if spill is not None else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m utils.result_store <period> <n_symbols,...> [summary|full]
+    # Each universe size runs in its own process, so peak RSS is measured per size
+    import subprocess
+    import tempfile
+    from utils.synthetic_data import write_universe
+
+    if len(sys.argv) > 1 and sys.argv[1] == "_run":
+        logging.getLogger().setLevel(logging.WARNING)
+        print(json.dumps(_measure_run(sys.argv[2], int(sys.argv[3]), sys.argv[4])))
+        sys.exit(0)
+
+    period = sys.argv[1] if len(sys.argv) > 1 else "10y"
+    sizes = [int(n) for n in (sys.argv[2] if len(sys.argv) > 2 else "50,200,500").split(",")]
+    results_mode = sys.argv[3] if len(sys.argv) > 3 else "summary"
+    with tempfile.TemporaryDirectory() as universe_dir:
+        write_universe(universe_dir, max(sizes), period)
+        print(f"📏 Peak RSS of run_strategy_for_symbols ({results_mode} results, {period} history)")
+        for n_symbols in sizes:
+            output = subprocess.run([sys.executable, "-m", "utils.result_store", "_run", universe_dir, str(n_symbols), results_mode],
+                                    cwd=project_root, check=True, capture_output=True, text=True).stdout
+            run = json.loads(output.strip().splitlines()[-1])
+            print(f"  {n_symbols:>6} symbols: peak RSS {run['peak_rss_mb']:8.1f} MB, {run['seconds']:7.1f} s "
+                  f"({run['symbols'] / run['seconds']:,.1f} symbols/s), spilled {run['spill_mb']:.1f} MB")
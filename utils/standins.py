@@ -0,0 +1,206 @@
+"""
+Local stand-ins for external services (Telegram Bot API, gspread)
+Used by demos, benchmarks and simulations so they run offline
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import gspread
+
+
+class TelegramStandInServer:
+    """
+    Minimal local HTTP server that mimics Telegram's sendMessage endpoint
+
+    Every accepted message is recorded in `messages`. The first `fail_first`
+    requests are answered with `fail_status` so retry logic can be exercised.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, fail_first=0, fail_status=429,
+                 retry_after=0, latency=0.0):
+        """
+        Args:
+            host (str): Interface to bind
+            port (int): Port to bind (0 picks a free port)
+            fail_first (int): Number of initial requests to fail
+            fail_status (int): HTTP status returned for failed requests
+            retry_after (int): retry_after value reported with 429 responses
+            latency (float): Artificial delay in seconds added to every response
+        """
+        self.messages = []
+        self.requests = 0
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.retry_after = retry_after
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without this every keep-alive
+            # response waits for the client's delayed ACK (~40 ms)
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                body = self.rfile.read(length).decode('utf-8')
+                params = {k: v[0] for k, v in parse_qs(body).items()}
+                self._respond(params)
+
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                self._respond(params)
+
+            def _respond(self, params):
+                if standin.latency:
+                    threading.Event().wait(standin.latency)
+
+                with standin._lock:
+                    standin.requests += 1
+                    failing = standin.requests <= standin.fail_first
+                    if not failing:
+                        standin.messages.append(params)
+
+                if failing:
+                    status = standin.fail_status
+                    payload = {'ok': False, 'error_code': status, 'description': 'stand-in failure'}
+                    if status == 429:
+                        payload['parameters'] = {'retry_after': standin.retry_after}
+                else:
+                    status = 200
+                    payload = {'ok': True, 'result': {'message_id': len(standin.messages)}}
+
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class FakeWorksheet:
+    """
+    In-memory gspread Worksheet stand-in; every method counts as one API call
+    """
+
+    def __init__(self, spreadsheet, title, rows=1000, cols=26):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.row_count = rows
+        self.col_count = cols
+        self.values = []
+
+    def _call(self, name):
+        self.spreadsheet._record(f"{self.title}.{name}")
+
+    def append_row(self, values, **kwargs):
+        self._call("append_row")
+        self.values.append(list(values))
+
+    def append_rows(self, values, **kwargs):
+        self._call("append_rows")
+        self.values.extend(list(row) for row in values)
+
+    def _write(self, values, range_name):
+        start_row = 0
+        if range_name:
+            start = range_name.split(":")[0]
+            digits = "".join(c for c in start if c.isdigit())
+            start_row = int(digits) - 1 if digits else 0
+        while len(self.values) < start_row + len(values):
+            self.values.append([])
+        for offset, row in enumerate(values):
+            self.values[start_row + offset] = list(row)
+
+    def update(self, values=None, range_name=None, **kwargs):
+        self._call("update")
+        self._write(values, range_name)
+
+    def batch_update(self, data, **kwargs):
+        self._call("batch_update")
+        for item in data:
+            self._write(item['values'], item['range'])
+
+    def clear(self):
+        self._call("clear")
+        self.values = []
+
+    def get_all_values(self):
+        self._call("get_all_values")
+        return [list(row) for row in self.values]
+
+
+class FakeSpreadsheet:
+    """
+    In-memory gspread Spreadsheet stand-in that counts API calls
+
+    Args:
+        latency (float): Artificial delay in seconds added to every API call
+        fail_calls (int): Number of upcoming API calls that raise ConnectionError
+    """
+
+    def __init__(self, latency=0.0, fail_calls=0):
+        self.latency = latency
+        self.fail_calls = fail_calls
+        self.api_calls = 0
+        self.call_log = []
+        self.worksheets = {}
+        self._lock = threading.Lock()
+
+    def _record(self, name):
+        with self._lock:
+            self.api_calls += 1
+            self.call_log.append(name)
+            failing = self.fail_calls > 0
+            if failing:
+                self.fail_calls -= 1
+        if self.latency:
+            time.sleep(self.latency)
+        if failing:
+            raise ConnectionError(f"stand-in failure on {name}")
+
+    def worksheet(self, title):
+        self._record("worksheet")
+        if title not in self.worksheets:
+            raise gspread.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title, rows, cols, **kwargs):
+        self._record("add_worksheet")
+        self.worksheets[title] = FakeWorksheet(self, title, rows, cols)
+        return self.worksheets[title]
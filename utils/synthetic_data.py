@@ -0,0 +1,538 @@
+import json
+import logging
+import os
+import re
+import sys
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.config import (
+    SYNTHETIC_END_DATE, SYNTHETIC_MAX_CHUNK_VALUES, SYNTHETIC_SESSION, SYNTHETIC_SYMBOL_BLOCK, SYNTHETIC_TIMEZONE
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+# Bars per unit of a yfinance-style period string ("5d", "6mo", "10y")
+_PERIOD_BARS = {'d': 1, 'wk': 5, 'mo': 21, 'y': TRADING_DAYS_PER_YEAR}
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+# On-disk dtypes of the binary format (prices need ~7 significant digits)
+BINARY_DTYPES = {'Open': np.float32, 'High': np.float32, 'Low': np.float32, 'Close': np.float32, 'Volume': np.uint32}
+FORMATS = ("binary", "yfinance_csv", "alpaca_csv")
+# Sessions per intraday random stream (chunk boundaries fall on multiples of this)
+STREAM_SESSIONS = 21
+
+# Market model. Each symbol gets its own volatility, start price and base
+# volume; regimes, GARCH volatility clustering, fat tails, overnight gaps
+# and the volume response to moves are shared dynamics.
+DEFAULT_MARKET = {
+    'start_price': (20.0, 2000.0),  # Log-uniform range
+    'volatility': (0.15, 0.6),  # Annualized long-run volatility, uniform range
+    'drift': (0.15, -0.25),  # Annualized drift in the (bull, bear) regime
+    'bear_volatility': 1.8,  # Long-run volatility multiplier in the bear regime
+    'regime_persistence': (0.995, 0.98),  # Daily probability of staying in (bull, bear)
+    'garch': (0.08, 0.9),  # (alpha, beta) of the daily GARCH(1,1) variance
+    't_dof': 5,  # Student-t degrees of freedom of the return shocks
+    'overnight_share': 0.2,  # Share of the daily variance realized between sessions
+    'gap_probability': 0.02,  # Daily probability of an overnight jump
+    'gap_size': 3.0,  # Jump standard deviation, in daily volatilities
+    'base_volume': (2e5, 2e7),  # Log-uniform range of the typical daily volume
+    'volume_sensitivity': 0.8,  # Extra volume per daily volatility of absolute return
+    'volume_noise': 0.25,  # Log-normal volume noise
+}
+
+
+def period_to_bars(period):
+    """
+    Number of daily bars in a yfinance period string
+
+    Args:
+        period (str): e.g. "5d", "6mo", "1y", "10y"
+
+    Returns:
+        int: Trading days in the period
+    """
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period)
+    if match is None:
+        raise ValueError(f"Unsupported period: {period}")
+    return int(match.group(1)) * _PERIOD_BARS[match.group(2)]
+
+
+def freq_minutes(freq):
+    """
+    Bar length of a frequency string in minutes ("1d" -> None for one bar per session)
+    """
+    match = re.fullmatch(r"(\d+)(m|h|d)", freq)
+    if match is None:
+        raise ValueError(f"Unsupported frequency: {freq}")
+    if match.group(2) == "d":
+        return None
+    return int(match.group(1)) * (60 if match.group(2) == "h" else 1)
+
+
+def synthetic_symbols(n_symbols):
+    """
+    Symbol names for a synthetic universe (NSE-style suffix like NIFTY_50_STOCKS)
+    """
+    return [f"SYN{i:04d}.NS" for i in range(n_symbols)]
+
+
+def symbol_parameters(n_symbols, seed=0, market=DEFAULT_MARKET):
+    """
+    Per-symbol model parameters
+
+    Every parameter has its own random stream, so the first k symbols get
+    the same parameters whatever the universe size.
+
+    Returns:
+        dict: Name -> (n_symbols,) array
+    """
+    def draw(stream, low, high, log=False):
+        rng = np.random.default_rng([seed, 0, stream])
+        values = rng.uniform(np.log(low), np.log(high), n_symbols) if log else rng.uniform(low, high, n_symbols)
+        return np.exp(values) if log else values
+
+    return {
+        'start_price': draw(0, *market['start_price'], log=True),
+        'volatility': draw(1, *market['volatility']),
+        'base_volume': draw(2, *market['base_volume'], log=True),
+    }
+
+
+def session_days(n_days, end=SYNTHETIC_END_DATE):
+    """
+    The last `n_days` weekday sessions up to `end` (no holiday calendar)
+    """
+    return pd.bdate_range(end=end, periods=n_days)
+
+
+def _t_shocks(rng, size, dof):
+    # Student-t shocks scaled to unit variance
+    return rng.standard_t(dof, size) * np.sqrt((dof - 2) / dof)
+
+
+def simulate_days(symbol_ids, n_days, seed=0, market=DEFAULT_MARKET, params=None):
+    """
+    Daily dynamics of a block of symbols: regimes, GARCH volatility, gaps and volume
+
+    Random draws come from one stream per symbol, so a symbol's path does
+    not depend on which block it is simulated in. The GARCH and regime
+    recursions loop over days, vectorized across the block.
+
+    Args:
+        symbol_ids (np.ndarray): Universe indices of the symbols
+        n_days (int): Sessions to simulate
+        seed (int): Universe seed
+        market (dict): Model parameters (see DEFAULT_MARKET)
+        params (dict): symbol_parameters() of the whole universe (computed when None)
+
+    Returns:
+        dict: (n_symbols, n_days) arrays: open, close, overnight / intraday log returns,
+            intraday volatility, volume, regime; plus u_high / u_low for daily ranges
+    """
+    symbol_ids = np.asarray(symbol_ids)
+    params = params or symbol_parameters(int(symbol_ids.max()) + 1, seed, market)
+    n = len(symbol_ids)
+    dof = market['t_dof']
+    draws = np.empty((7, n, n_days))
+    for row, symbol in enumerate(symbol_ids):
+        rng = np.random.default_rng([seed, 1, int(symbol)])
+        draws[0, row] = _t_shocks(rng, n_days, dof)  # overnight shock
+        draws[1, row] = _t_shocks(rng, n_days, dof)  # intraday shock
+        draws[2, row] = rng.random(n_days)  # regime switch
+        draws[3, row] = rng.random(n_days)  # gap occurrence
+        draws[4, row] = rng.standard_normal(n_days)  # gap size
+        draws[5, row] = rng.standard_normal(n_days)  # volume noise
+        draws[6, row] = rng.random(n_days)  # initial regime (first column only)
+    u_range = np.empty((2, n, n_days))
+    for row, symbol in enumerate(symbol_ids):
+        u_range[:, row] = np.random.default_rng([seed, 3, int(symbol)]).random((2, n_days))
+
+    dt = 1.0 / TRADING_DAYS_PER_YEAR
+    alpha, beta = market['garch']
+    stay = np.array(market['regime_persistence'])
+    drift = np.array(market['drift']) * dt
+    long_run_var = (params['volatility'][symbol_ids] ** 2) * dt
+    regime_var = np.stack([long_run_var, long_run_var * market['bear_volatility'] ** 2])
+    share = market['overnight_share']
+
+    # Start in the stationary regime distribution with long-run variance
+    p_bear = (1 - stay[0]) / (2 - stay[0] - stay[1])
+    regime = (draws[6, :, 0] < p_bear).astype(np.int64)
+    var = regime_var[regime, np.arange(n)]
+    last_shock = np.zeros(n)
+
+    regimes = np.empty((n, n_days), dtype=np.int8)
+    sigma = np.empty((n, n_days))
+    columns = np.arange(n)
+    for d in range(n_days):
+        switch = draws[2, :, d] >= stay[regime]
+        regime = np.where(switch, 1 - regime, regime)
+        target = regime_var[regime, columns]
+        var = (1 - alpha - beta) * target + alpha * last_shock ** 2 + beta * var
+        day_sigma = np.sqrt(var)
+        jump = (draws[3, :, d] < market['gap_probability']) * market['gap_size'] * day_sigma * draws[4, :, d]
+        last_shock = day_sigma * (np.sqrt(share) * draws[0, :, d] + np.sqrt(1 - share) * draws[1, :, d]) + jump
+        regimes[:, d] = regime
+        sigma[:, d] = day_sigma
+
+    jump = (draws[3] < market['gap_probability']) * market['gap_size'] * sigma * draws[4]
+    mu = drift[regimes] - 0.5 * sigma ** 2
+    overnight = share * mu + np.sqrt(share) * sigma * draws[0] + jump
+    intraday = (1 - share) * mu + np.sqrt(1 - share) * sigma * draws[1]
+
+    start = params['start_price'][symbol_ids][:, None]
+    close = start * np.exp(np.cumsum(overnight + intraday, axis=1))
+    open_ = close * np.exp(-intraday)
+    move = np.abs(overnight + intraday) / np.sqrt(long_run_var)[:, None]
+    volume = (params['base_volume'][symbol_ids][:, None] * np.exp(market['volume_noise'] * draws[5])
+              * (1 + market['volume_sensitivity'] * move) / (1 + market['volume_sensitivity']))
+    return {
+        'open': open_, 'close': close, 'overnight': overnight, 'intraday': intraday,
+        'intraday_sigma': np.sqrt(1 - share) * sigma, 'volume': volume, 'regime': regimes,
+        'u_high': u_range[0], 'u_low': u_range[1],
+    }
+
+
+def _bridge_extremes(move, sigma, u_high, u_low):
+    # Exact max / min of a Brownian bridge from 0 to `move` with volatility `sigma`
+    variance = 2 * sigma ** 2
+    high = (move + np.sqrt(move ** 2 - variance * np.log(u_high))) / 2
+    low = (move - np.sqrt(move ** 2 - variance * np.log(u_low))) / 2
+    return high, low
+
+
+def daily_bars(days):
+    """
+    Daily OHLCV from simulate_days() output
+
+    Returns:
+        dict: Column -> (n_symbols, n_days) array
+    """
+    high, low = _bridge_extremes(days['intraday'], days['intraday_sigma'], days['u_high'], days['u_low'])
+    return {
+        'Open': days['open'], 'High': days['open'] * np.exp(high), 'Low': days['open'] * np.exp(low),
+        'Close': days['close'], 'Volume': np.round(days['volume']),
+    }
+
+
+def intraday_profile(bars_per_day):
+    """
+    U-shaped intraday weights (busy open and close), summing to 1
+    """
+    x = np.linspace(-1, 1, bars_per_day)
+    weights = 1 + 1.5 * x ** 2
+    return weights / weights.sum()
+
+
+def intraday_bars(days, day_slice, bars_per_day, symbol_ids, seed=0, market=DEFAULT_MARKET):
+    """
+    Intraday OHLCV bars for a range of sessions, consistent with the daily path
+
+    Each session's log path is a Brownian bridge from its open to its close
+    with a U-shaped volatility and volume profile, so the bars aggregate to
+    the simulated daily open, close and volume.
+
+    Args:
+        days (dict): simulate_days() output for the block
+        day_slice (slice): Sessions to expand
+        bars_per_day (int): Bars per session
+        symbol_ids (np.ndarray): Universe indices of the block's symbols
+        seed (int): Universe seed
+        market (dict): Model parameters
+
+    Returns:
+        dict: Column -> (n_symbols, n_sessions * bars_per_day) array
+    """
+    first, last, _ = day_slice.indices(days['open'].shape[1])
+    n_days = last - first
+    n = len(symbol_ids)
+    weights = intraday_profile(bars_per_day)
+    # One stream per symbol and block of STREAM_SESSIONS sessions, whatever the chunking
+    segments = range(first // STREAM_SESSIONS, (last - 1) // STREAM_SESSIONS + 1)
+    skip = first - segments[0] * STREAM_SESSIONS
+    draws = np.empty((4, n, n_days, bars_per_day))
+    for row, symbol in enumerate(symbol_ids):
+        segment_draws = []
+        for segment in segments:
+            rng = np.random.default_rng([seed, 2, int(symbol), segment])
+            shape = (STREAM_SESSIONS, bars_per_day)
+            segment_draws.append(np.stack([_t_shocks(rng, shape, market['t_dof']), *rng.random((3,) + shape)]))
+        draws[:, row] = np.concatenate(segment_draws, axis=1)[:, skip:skip + n_days]
+    draws[1:] = np.maximum(draws[1:], 1e-12)
+
+    sigma = days['intraday_sigma'][:, day_slice, None]
+    bar_sigma = sigma * np.sqrt(weights)
+    steps = bar_sigma * draws[0]
+    # Pin every session to its simulated intraday return
+    steps += weights * (days['intraday'][:, day_slice, None] - steps.sum(axis=2, keepdims=True))
+    path = np.cumsum(steps, axis=2)
+    open_day = days['open'][:, day_slice, None]
+    close = open_day * np.exp(path)
+    open_ = np.concatenate([open_day, close[:, :, :-1]], axis=2)
+    high, low = _bridge_extremes(steps, bar_sigma, draws[1], draws[2])
+
+    move = np.abs(steps) / bar_sigma
+    volume = weights * (1 + market['volume_sensitivity'] * move) * np.exp(market['volume_noise'] * (draws[3] - 0.5))
+    volume *= days['volume'][:, day_slice, None] / volume.sum(axis=2, keepdims=True)
+    shape = (n, n_days * bars_per_day)
+    return {
+        'Open': open_.reshape(shape), 'High': (open_ * np.exp(high)).reshape(shape),
+        'Low': (open_ * np.exp(low)).reshape(shape), 'Close': close.reshape(shape),
+        'Volume': np.round(volume).reshape(shape),
+    }
+
+
+def bar_timestamps(days, freq="1d", tz=SYNTHETIC_TIMEZONE, session=SYNTHETIC_SESSION):
+    """
+    Bar timestamps for a set of sessions
+
+    Daily bars are stamped at local midnight (like yfinance daily history),
+    intraday bars at their start time within the session.
+
+    Returns:
+        pd.DatetimeIndex: tz-aware timestamps
+    """
+    minutes = freq_minutes(freq)
+    if minutes is None:
+        return pd.DatetimeIndex(days).tz_localize(tz)
+    offsets = pd.to_timedelta(np.arange(bars_per_session(freq, session)) * minutes, unit="min")
+    opening = pd.Timedelta(f"{session[0]}:00")
+    stamps = (np.asarray(days.normalize(), dtype="datetime64[ns]")[:, None]
+              + np.asarray(opening + offsets, dtype="timedelta64[ns]")[None, :]).ravel()
+    return pd.DatetimeIndex(stamps).tz_localize(tz)
+
+
+def bars_per_session(freq, session=SYNTHETIC_SESSION):
+    """
+    Bars in one session at `freq` (1 for daily bars)
+    """
+    minutes = freq_minutes(freq)
+    if minutes is None:
+        return 1
+    open_, close = (pd.Timedelta(f"{t}:00") for t in session)
+    return int((close - open_) / pd.Timedelta(minutes=minutes))
+
+
+def stream_bars(n_symbols, n_days, freq="1d", seed=0, end=SYNTHETIC_END_DATE, market=DEFAULT_MARKET,
+                symbol_block=SYNTHETIC_SYMBOL_BLOCK, max_chunk_values=SYNTHETIC_MAX_CHUNK_VALUES):
+    """
+    Generate a universe chunk by chunk (symbol blocks x session ranges)
+
+    Memory stays bounded by `max_chunk_values` (symbols x bars per chunk),
+    so arbitrarily large universes can be streamed to disk. The output only
+    depends on the seed, the frequency and the session count: block and
+    chunk sizes change how it is cut, not what it contains.
+
+    Args:
+        n_symbols (int): Universe size
+        n_days (int): Sessions
+        freq (str): "1d" or an intraday bar size such as "1m", "5m", "1h"
+        seed (int): Universe seed
+        end (str): Last session date
+        market (dict): Model parameters (see DEFAULT_MARKET)
+        symbol_block (int): Symbols simulated together
+        max_chunk_values (int): Upper bound on symbols x bars per yielded chunk
+
+    Yields:
+        tuple: (symbol indices, bar offset, pd.DatetimeIndex, dict column -> (n_block, n_bars) array)
+    """
+    params = symbol_parameters(n_symbols, seed, market)
+    sessions = session_days(n_days, end)
+    per_day = bars_per_session(freq)
+    # Chunks follow the STREAM_SESSIONS grid so no random stream is drawn twice
+    days_per_chunk = max(1, max_chunk_values // (min(symbol_block, n_symbols) * per_day * STREAM_SESSIONS))
+    days_per_chunk *= STREAM_SESSIONS
+    for block_start in range(0, n_symbols, symbol_block):
+        symbol_ids = np.arange(block_start, min(block_start + symbol_block, n_symbols))
+        days = simulate_days(symbol_ids, n_days, seed, market, params)
+        if per_day == 1:
+            yield symbol_ids, 0, bar_timestamps(sessions, freq), daily_bars(days)
+            continue
+        for day_start in range(0, n_days, days_per_chunk):
+            day_slice = slice(day_start, min(day_start + days_per_chunk, n_days))
+            yield (symbol_ids, day_start * per_day, bar_timestamps(sessions[day_slice], freq),
+                   intraday_bars(days, day_slice, per_day, symbol_ids, seed, market))
+
+
+def to_yfinance_frame(timestamps, bars, row, freq="1d"):
+    """
+    One symbol's bars in the yfinance Ticker.history() layout (as fetch_nifty_data returns them)
+    """
+    df = pd.DataFrame({column: bars[column][row] for column in BAR_COLUMNS}, index=timestamps)
+    df['Dividends'] = 0.0
+    df['Stock Splits'] = 0.0
+    df.index.name = "Date" if freq_minutes(freq) is None else "Datetime"
+    return df
+
+
+def generate_universe(n_symbols, period="6mo", seed=0, freq="1d", end=SYNTHETIC_END_DATE, market=DEFAULT_MARKET):
+    """
+    Synthetic histories for `n_symbols` symbols, in memory
+
+    Args:
+        n_symbols (int): Universe size
+        period (str): yfinance-style history length
+        seed (int): Universe seed
+        freq (str): Bar size ("1d", "1m", "5m", ...)
+        end (str): Last session date
+        market (dict): Model parameters (see DEFAULT_MARKET)
+
+    Returns:
+        dict: Symbol -> DataFrame, like AssignmentTradingStrategy.fetch_nifty_data before indicators
+    """
+    symbols = synthetic_symbols(n_symbols)
+    chunks = {symbol: [] for symbol in symbols}
+    for symbol_ids, _, timestamps, bars in stream_bars(n_symbols, period_to_bars(period), freq, seed, end, market):
+        for row, symbol_id in enumerate(symbol_ids):
+            chunks[symbols[symbol_id]].append(to_yfinance_frame(timestamps, bars, row, freq))
+    return {symbol: pd.concat(frames) if len(frames) > 1 else frames[0] for symbol, frames in chunks.items()}
+
+
+def _write_csv_chunk(path, df, fmt, symbol, first):
+    if fmt == "yfinance_csv":
+        # utils/data_loader.py layout: Date,Close,High,Low,Open,Volume plus yfinance's ticker row
+        out = df[["Close", "High", "Low", "Open", "Volume"]]
+        if first:
+            with open(path, "w") as f:
+                f.write("Date,Close,High,Low,Open,Volume\n")
+                f.write("," + ",".join([symbol] * 5) + "\n")
+        out.to_csv(path, mode="a", header=False)
+    else:
+        # utils/tsla_fetch.py (Alpaca) layout, UTC timestamps
+        out = pd.DataFrame({
+            'close': df['Close'], 'high': df['High'], 'low': df['Low'],
+            'trade_count': np.maximum(1, np.round(df['Volume'] / 100)).astype(np.int64),
+            'open': df['Open'], 'volume': df['Volume'].astype(np.int64),
+            'vwap': (df['High'] + df['Low'] + df['Close']) / 3,
+        }, index=df.index.tz_convert("UTC").rename("timestamp"))
+        out.to_csv(path, mode="w" if first else "a", header=first)
+
+
+def write_universe(path, n_symbols, period="10y", freq="1d", fmt="binary", seed=0, end=SYNTHETIC_END_DATE,
+                   market=DEFAULT_MARKET):
+    """
+    Stream a synthetic universe to disk without holding it in memory
+
+    Formats:
+        binary: one (n_symbols, n_bars) memory-mapped file per column plus
+            UTC timestamps and meta.json (read back with load_binary)
+        yfinance_csv: <symbol>_data.csv per symbol, as utils/data_loader.py writes
+        alpaca_csv: <symbol>.csv per symbol, as utils/tsla_fetch.py writes
+        (both CSV layouts load with utils.feature_store.read_bars_csv)
+
+    Returns:
+        dict: Summary (symbols, bars, seconds, bytes)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt}, expected one of {FORMATS}")
+    os.makedirs(path, exist_ok=True)
+    n_days = period_to_bars(period)
+    n_bars = n_days * bars_per_session(freq)
+    symbols = synthetic_symbols(n_symbols)
+    start = time.perf_counter()
+
+    columns = {}
+    if fmt == "binary":
+        stamps = np.memmap(os.path.join(path, "timestamps.i8"), dtype=np.int64, mode="w+", shape=(n_bars,))
+        columns = {c: np.memmap(os.path.join(path, f"{c}.bin"), dtype=dtype, mode="w+", shape=(n_symbols, n_bars))
+                   for c, dtype in BINARY_DTYPES.items()}
+
+    for symbol_ids, offset, timestamps, bars in stream_bars(n_symbols, n_days, freq, seed, end, market):
+        rows = slice(symbol_ids[0], symbol_ids[-1] + 1)
+        if fmt == "binary":
+            stamps[offset:offset + len(timestamps)] = timestamps.tz_convert("UTC").tz_localize(None).asi8
+            for column, values in columns.items():
+                values[rows, offset:offset + len(timestamps)] = bars[column]
+            continue
+        for row, symbol_id in enumerate(symbol_ids):
+            symbol = symbols[symbol_id]
+            name = f"{symbol}_data.csv" if fmt == "yfinance_csv" else f"{symbol}.csv"
+            _write_csv_chunk(os.path.join(path, name), to_yfinance_frame(timestamps, bars, row, freq),
+                             fmt, symbol, offset == 0)
+
+    if fmt == "binary":
+        stamps.flush()
+        for values in columns.values():
+            values.flush()
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({
+                'symbols': symbols, 'n_bars': n_bars, 'freq': freq, 'tz': SYNTHETIC_TIMEZONE, 'seed': seed,
+                'columns': {c: np.dtype(d).name for c, d in BINARY_DTYPES.items()}, 'market': market,
+            }, f, indent=2)
+
+    seconds = time.perf_counter() - start
+    size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+    return {'symbols': n_symbols, 'bars': n_symbols * n_bars, 'seconds': seconds, 'bytes': size}
+
+
+def load_binary(path, symbol):
+    """
+    One symbol's bars from a binary universe (see write_universe), in the yfinance layout
+
+    Returns:
+        pd.DataFrame: Bars with a tz-aware index
+    """
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    row = meta['symbols'].index(symbol)
+    shape = (len(meta['symbols']), meta['n_bars'])
+    stamps = np.memmap(os.path.join(path, "timestamps.i8"), dtype=np.int64, mode="r", shape=(meta['n_bars'],))
+    bars = {column: np.memmap(os.path.join(path, f"{column}.bin"), dtype=dtype, mode="r", shape=shape)[row:row + 1]
+            for column, dtype in meta['columns'].items()}
+    timestamps = pd.DatetimeIndex(stamps.astype("datetime64[ns]")).tz_localize("UTC").tz_convert(meta['tz'])
+    return to_yfinance_frame(timestamps, {c: v.astype(np.float64) for c, v in bars.items()}, 0, meta['freq'])
+
+
+class SyntheticDataFetcher:
+    """
+    Offline drop-in for yfinance in AssignmentTradingStrategy(data_fetcher=...)
+
+    Serves pre-generated histories, trimmed to the requested period; unknown
+    symbols are generated on first request (seeded by their name).
+    """
+
+    def __init__(self, universe=None, seed=0, freq="1d"):
+        """
+        Args:
+            universe (dict): Symbol -> DataFrame to serve (default: generate on demand)
+            seed (int): Seed for symbols generated on demand
+            freq (str): Bar size of symbols generated on demand
+        """
+        self.universe = dict(universe or {})
+        self.seed = seed
+        self.freq = freq
+
+    def __call__(self, symbol, period):
+        n_days = period_to_bars(period)
+        df = self.universe.get(symbol)
+        sessions = df.index.normalize().unique() if df is not None else []
+        if len(sessions) < n_days:
+            df = next(iter(generate_universe(1, period, self.seed + zlib.crc32(symbol.encode()), self.freq).values()))
+            self.universe[symbol] = df
+            sessions = df.index.normalize().unique()
+        # Callers add indicator columns in place, so hand out a copy
+        return df[df.index >= sessions[-n_days]].copy()
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m utils.synthetic_data <format> <out_dir> <n_symbols> <period> [freq] [seed]
+    if len(sys.argv) < 5:
+        print(f"Usage: python -m utils.synthetic_data {{{'|'.join(FORMATS)}}} <out_dir> <n_symbols> <period> [freq] [seed]")
+        sys.exit(1)
+    fmt, out_dir, n_symbols, period = sys.argv[1], sys.argv[2], int(sys.argv[3]), sys.argv[4]
+    freq = sys.argv[5] if len(sys.argv) > 5 else "1d"
+    seed = int(sys.argv[6]) if len(sys.argv) > 6 else 0
+    summary = write_universe(out_dir, n_symbols, period, freq, fmt, seed)
+    print(f"✅ {summary['bars']:,} {freq} bars for {summary['symbols']} symbols in {summary['seconds']:.1f} s "
+          f"({summary['bars'] / summary['seconds']:,.0f} bars/s, {summary['bytes'] / 1e6:,.1f} MB) -> {out_dir}")
@@ -0,0 +1,382 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+
+import requests
+
+from utils.metrics import METRICS
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Telegram rejects messages longer than this
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+DIGEST_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`.
+    `acquire` blocks until a token is available.
+    """
+
+    def __init__(self, rate, capacity, clock=time.monotonic, sleep=time.sleep):
+        """
+        Args:
+            rate (float): Tokens added per second
+            capacity (int): Maximum burst size
+            clock (callable): Monotonic clock returning seconds
+            sleep (callable): Sleep function used while waiting for a token
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(capacity)
+        self.last_refill = clock()
+        # The dispatcher's worker and synchronous `deliver` callers share limiters
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def delay(self):
+        """
+        Returns:
+            float: Seconds until a token is available (0 if one is available now)
+        """
+        self._refill()
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def acquire(self):
+        """
+        Block until a token is available and consume it
+        """
+        with self._lock:
+            wait = self.delay()
+            while wait > 0:
+                self.sleep(wait)
+                wait = self.delay()
+            self.tokens -= 1
+
+
+class TelegramAlertDispatcher:
+    """
+    Non-blocking Telegram alert dispatcher
+    - Bounded in-memory queue drained by a background worker thread
+    - One keep-alive HTTP session reused for every request
+    - Per-chat rate limiting (1 message/second, 20 messages/minute)
+    - Bursts of alerts merged into digest messages
+    - Retries with exponential backoff, honouring Telegram's retry_after
+    """
+
+    def __init__(self, bot_token, chat_id, api_url="https://api.telegram.org",
+                 max_queue_size=1000, digest_window=2.0, max_retries=5,
+                 backoff_base=1.0, request_timeout=10, session=None,
+                 rate_limiters=None):
+        """
+        Initialize the dispatcher (call `start` or just `send` to run it)
+
+        Args:
+            bot_token (str): Telegram bot token
+            chat_id (str): Target chat ID
+            api_url (str): Bot API base URL (point at a local stand-in for testing)
+            max_queue_size (int): Maximum number of pending alerts
+            digest_window (float): Seconds to wait for more alerts before sending a digest
+            max_retries (int): Maximum retries per message on transient failures
+            backoff_base (float): Base delay in seconds for exponential backoff
+            request_timeout (float): HTTP timeout in seconds
+            session (requests.Session): Optional pre-configured HTTP session
+            rate_limiters (list): Optional list of RateLimiter objects applied to every send
+        """
+        self.chat_id = chat_id
+        self.url = f"{api_url.rstrip('/')}/bot{bot_token}/sendMessage"
+        self.digest_window = digest_window
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.request_timeout = request_timeout
+        self.session = session or requests.Session()
+
+        if rate_limiters is None:
+            rate_limiters = [
+                RateLimiter(rate=1.0, capacity=1),          # 1 message/second per chat
+                RateLimiter(rate=20 / 60.0, capacity=20),   # 20 messages/minute per group
+            ]
+        self.rate_limiters = rate_limiters
+
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._worker = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        # `send` callers and the worker thread both update stats
+        self._stats_lock = threading.Lock()
+
+        self.stats = {
+            'queued': 0,
+            'dropped': 0,
+            'sent_messages': 0,
+            'sent_alerts': 0,
+            'failed_messages': 0,
+            'retries': 0,
+        }
+
+    def _count(self, name, value=1):
+        with self._stats_lock:
+            self.stats[name] += value
+
+    def start(self):
+        """
+        Start the background worker thread (idempotent)
+        """
+        with self._lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._stop_event.clear()
+            self._worker = threading.Thread(
+                target=self._run, name="telegram-alert-dispatcher", daemon=True
+            )
+            self._worker.start()
+
+    def send(self, message):
+        """
+        Queue an alert without blocking the caller
+
+        Args:
+            message (str): Alert text
+
+        Returns:
+            bool: True if queued, False if the queue is full and the alert was dropped
+        """
+        self.start()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self._count('dropped')
+            logger.warning("⚠️ Telegram alert queue full, dropping alert")
+            return False
+        self._count('queued')
+        return True
+
+    def deliver(self, messages):
+        """
+        Send alerts from the calling thread, merged into digests, without queueing
+
+        Returns once Telegram accepted every digest or one of them failed, so
+        callers that track delivery (e.g. journal sinks) know which alerts went out.
+
+        Args:
+            messages (list): Alert texts in order
+
+        Returns:
+            int: Number of leading alerts delivered (stops at the first failed digest)
+        """
+        delivered = 0
+        for digest, count in build_digests(messages):
+            if not self._post(digest):
+                self._count('failed_messages')
+                break
+            self._count('sent_messages')
+            self._count('sent_alerts', count)
+            delivered += count
+        return delivered
+
+    def flush(self, timeout=None):
+        """
+        Wait until every queued alert has been sent or given up on
+
+        Args:
+            timeout (float): Maximum seconds to wait (None waits forever)
+
+        Returns:
+            bool: True if the queue drained within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout=10):
+        """
+        Flush pending alerts and stop the worker thread
+
+        Args:
+            timeout (float): Maximum seconds to wait for pending alerts
+        """
+        self.flush(timeout)
+        self._stop_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout=1)
+        self.session.close()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            deadline = time.monotonic() + self.digest_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                for digest, count in build_digests(batch):
+                    if self._post(digest):
+                        self._count('sent_messages')
+                        self._count('sent_alerts', count)
+                    else:
+                        self._count('failed_messages')
+            except Exception as e:
+                logger.error(f"❌ Telegram dispatcher error: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _post(self, text):
+        """
+        Send one message with rate limiting and retries
+
+        Returns:
+            bool: True if Telegram accepted the message
+        """
+        for attempt in range(self.max_retries + 1):
+            for limiter in self.rate_limiters:
+                limiter.acquire()
+
+            delay = self.backoff_base * (2 ** attempt)
+            try:
+                with METRICS.timer("telegram_post"):
+                    response = self.session.post(
+                        self.url,
+                        data={'chat_id': self.chat_id, 'text': text},
+                        timeout=self.request_timeout,
+                    )
+                if response.status_code == 200:
+                    return True
+                if response.status_code == 429:
+                    try:
+                        delay = float(response.json()['parameters']['retry_after'])
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                elif response.status_code < 500:
+                    logger.error(f"❌ Telegram rejected alert ({response.status_code}): {response.text[:200]}")
+                    return False
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ Telegram request failed: {e}")
+
+            if attempt < self.max_retries:
+                self._count('retries')
+                time.sleep(delay)
+
+        logger.error(f"❌ Giving up on Telegram alert after {self.max_retries} retries")
+        return False
+
+
+def build_digests(messages, max_length=TELEGRAM_MAX_MESSAGE_LENGTH):
+    """
+    Merge alerts into as few messages as Telegram's length limit allows
+
+    Args:
+        messages (list): Alert texts in arrival order
+        max_length (int): Maximum characters per message
+
+    Returns:
+        list: (digest_text, alert_count) tuples; an alert counts towards the
+        digest holding its last part, so counts add up to len(messages)
+    """
+    digests = []
+    current = []
+    current_length = 0
+
+    for message in messages:
+        message = message.strip()
+        # Oversized alerts are split into their own messages
+        while len(message) > max_length:
+            digests.append((message[:max_length], 0))
+            message = message[max_length:]
+
+        extra = len(message) + (len(DIGEST_SEPARATOR) if current else 0)
+        if current and current_length + extra > max_length:
+            digests.append((DIGEST_SEPARATOR.join(current), len(current)))
+            current, current_length = [], 0
+            extra = len(message)
+        current.append(message)
+        current_length += extra
+
+    if current:
+        digests.append((DIGEST_SEPARATOR.join(current), len(current)))
+    return digests
+
+
+_default_dispatcher = None
+_default_lock = threading.Lock()
+
+
+def get_default_dispatcher():
+    """
+    Get the process-wide dispatcher configured from utils/config.py
+
+    Returns:
+        TelegramAlertDispatcher: Shared dispatcher, or None if Telegram is not configured
+    """
+    global _default_dispatcher
+
+    from utils import config
+
+    if config.TELEGRAM_BOT_TOKEN == "YOUR_TELEGRAM_BOT_TOKEN":
+        return None
+
+    with _default_lock:
+        if _default_dispatcher is None:
+            _default_dispatcher = TelegramAlertDispatcher(
+                config.TELEGRAM_BOT_TOKEN,
+                config.TELEGRAM_CHAT_ID,
+                api_url=config.TELEGRAM_API_URL,
+                max_queue_size=config.TELEGRAM_QUEUE_SIZE,
+                digest_window=config.TELEGRAM_DIGEST_WINDOW_SECONDS,
+                max_retries=config.TELEGRAM_MAX_RETRIES,
+                request_timeout=config.TELEGRAM_REQUEST_TIMEOUT,
+            )
+            # Give queued alerts a chance to go out before the interpreter exits
+            atexit.register(_default_dispatcher.stop)
+        return _default_dispatcher
+
+
+if __name__ == "__main__":
+    # Run from the project root: python -m utils.telegram_alerts
+    # Demo against a local Telegram stand-in
+    from utils.standins import TelegramStandInServer
+
+    with TelegramStandInServer(fail_first=2) as server:
+        dispatcher = TelegramAlertDispatcher(
+            "TEST_TOKEN", "12345", api_url=server.url,
+            digest_window=0.2, backoff_base=0.05,
+            rate_limiters=[RateLimiter(rate=50.0, capacity=1)],
+        )
+        start = time.perf_counter()
+        for i in range(25):
+            dispatcher.send(f"📊 Signal {i}: BUY TEST.NS")
+        enqueue_ms = (time.perf_counter() - start) * 1000
+        dispatcher.stop()
+
+        print(f"✅ Queued 25 alerts in {enqueue_ms:.2f} ms")
+        print(f"📱 Stand-in received {len(server.messages)} message(s)")
+        print(f"📊 Dispatcher stats: {dispatcher.stats}")